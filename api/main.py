@@ -30,7 +30,10 @@ from pydantic import BaseModel, Field
 
 # Ajout du chemin src pour importer house_prices
 sys.path.append(str(Path(__file__).parent.parent / "src"))
-from house_prices.data.preprocessing import get_feature_lists
+from house_prices.data.load_data import read_csv_cached
+from house_prices.data.preprocessing import DataQualityMonitor, get_feature_lists
+from house_prices.models.compiled_model import compile_pipeline
+from house_prices.models.onnx_model import OnnxPipeline
 from house_prices.models.predict_model import load_trained_model
 from house_prices.models.predict_model import predict as predict_price
 
@@ -204,12 +207,18 @@ class HealthResponse(BaseModel):
 
 # Chargement du modèle au démarrage
 model_pipeline = None
+compiled_pipeline = None
+onnx_pipeline = None
 MODEL_PATH = Path(__file__).parent.parent / "models" / "house_prices_model.pkl"
+ONNX_MODEL_PATH = Path(__file__).parent.parent / "models" / "house_prices_model.onnx"
 
 
 def load_model():
-    """Charge le pipeline complet."""
-    global model_pipeline
+    """
+    Charge le pipeline complet et, si possible, sa version compilée pour les prédictions unitaires
+    et son export ONNX (scripts/export_onnx.py) servi par onnxruntime.
+    """
+    global model_pipeline, compiled_pipeline, onnx_pipeline
     try:
         if MODEL_PATH.exists():
             model_pipeline = load_trained_model(str(MODEL_PATH))
@@ -221,6 +230,31 @@ def load_model():
         logger.error(f"Erreur lors du chargement du modèle: {e}")
         model_pipeline = None
 
+    compiled_pipeline = None
+    if model_pipeline is not None:
+        try:
+            compiled_pipeline = compile_pipeline(model_pipeline)
+        except Exception as e:
+            logger.warning(f"Pipeline non compilable, utilisation du pipeline scikit-learn: {e}")
+
+    onnx_pipeline = load_onnx_model() if model_pipeline is not None else None
+
+
+def load_onnx_model():
+    """Charge l'export ONNX s'il existe et n'est pas antérieur au modèle (None sinon)."""
+    if not ONNX_MODEL_PATH.exists():
+        return None
+    if ONNX_MODEL_PATH.stat().st_mtime < MODEL_PATH.stat().st_mtime:
+        logger.warning(f"Export ONNX antérieur au modèle, ignoré (relancer scripts/export_onnx.py): {ONNX_MODEL_PATH}")
+        return None
+    try:
+        onnx = OnnxPipeline(ONNX_MODEL_PATH)
+        logger.info("Modèle ONNX chargé (onnxruntime)")
+        return onnx
+    except Exception as e:
+        logger.warning(f"Modèle ONNX non chargé, utilisation du noyau compilé: {e}")
+        return None
+
 
 # Chemin des données
 DATA_PATH = Path(__file__).parent.parent / "data" / "raw" / "train.csv"
@@ -246,7 +280,7 @@ def get_train_data():
     global _train_data_cache
     if _train_data_cache is None:
         if DATA_PATH.exists():
-            _train_data_cache = pd.read_csv(DATA_PATH)
+            _train_data_cache = read_csv_cached(DATA_PATH)
         else:
             logger.warning(f"Fichier de données brutes non trouvé: {DATA_PATH}")
     return _train_data_cache
@@ -303,6 +337,18 @@ async def predict(house_features: HouseFeatures):
         # Conversion en dictionnaire
         features_dict = house_features.dict(by_alias=True)
 
+        # Export ONNX servi par onnxruntime; le noyau compilé reste alimenté pour la surveillance
+        if onnx_pipeline is not None:
+            if compiled_pipeline is not None:
+                compiled_pipeline.observe(features_dict)
+            predicted_price = predict_price(onnx_pipeline, features_dict, use_log=True)[0]
+            return PredictionResponse(predicted_price=float(predicted_price), model_version="2.0.0", confidence_score=0.90)
+
+        # Chemin rapide: le noyau compilé travaille directement sur le dictionnaire
+        if compiled_pipeline is not None:
+            predicted_price = predict_price(compiled_pipeline, features_dict, use_log=True)[0]
+            return PredictionResponse(predicted_price=float(predicted_price), model_version="2.0.0", confidence_score=0.90)
+
         # Création du DataFrame (1 seule ligne)
         df = pd.DataFrame([features_dict])
         
@@ -448,7 +494,12 @@ async def predict_batch(houses: List[HouseFeatures]):
         df = pd.DataFrame(features_list)
 
         # Prédictions
-        predicted_prices = make_prediction(model_pipeline, df, use_log=True)
+        if onnx_pipeline is not None:
+            if compiled_pipeline is not None:
+                compiled_pipeline.observe(df)
+            predicted_prices = predict_price(onnx_pipeline, df, use_log=True)
+        else:
+            predicted_prices = predict_price(model_pipeline, df, use_log=True)
 
         return {"predictions": [{"predicted_price": float(price), "model_version": "2.0.0"} for price in predicted_prices]}
 
@@ -544,6 +595,17 @@ async def model_comparison():
     return comparison
 
 
+@app.get("/api/monitoring/data-quality")
+async def get_data_quality():
+    """Compteurs de qualité des données (batches échantillonnés par DataQualityMonitor)."""
+    monitor = DataQualityMonitor.find(model_pipeline) if model_pipeline is not None else None
+    if monitor is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Surveillance non disponible pour ce modèle")
+    report = monitor.report()
+    issues = report[["nan", "out_of_range", "unseen"]].sum(axis=1) > 0
+    return {**monitor.summary(), "columns": report[issues].reset_index().to_dict(orient="records")}
+
+
 from datetime import datetime
 
 
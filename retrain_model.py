@@ -14,6 +14,7 @@ from sklearn.linear_model import HuberRegressor
 from sklearn.pipeline import Pipeline
 import numpy as np
 
+from house_prices.data.load_data import load_data
 from house_prices.data.preprocessing import create_full_pipeline
 
 print("=" * 60)
@@ -22,7 +23,7 @@ print("=" * 60)
 
 # 1. Charger les données
 print("\n1. Chargement des données...")
-train_df = pd.read_csv("data/raw/train.csv")
+train_df, _ = load_data("data/raw")
 print(f"   ✓ {len(train_df)} observations chargées")
 
 # 2. Séparer X et y
@@ -0,0 +1,106 @@
+"""
+Benchmark de l'encodage des variables nominales: bloc one-hot vs encodage cible + fréquence.
+
+Pour chaque mode de create_full_pipeline(nominal_encoding=...), le pipeline complet
+(prétraitement + HuberRegressor de train_model) est évalué par validation croisée sur
+data/raw/train.csv: largeur de la matrice de features, temps d'entraînement, latence de
+prédiction (batch du fold de test et requête unitaire, pipeline scikit-learn et noyau
+compilé) et RMSE sur log(SalePrice).
+
+Usage:
+    python scripts/benchmark_encoding.py
+    python scripts/benchmark_encoding.py --folds 10 --repeat 200
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from sklearn.linear_model import HuberRegressor  # noqa: E402
+from sklearn.metrics import mean_squared_error  # noqa: E402
+from sklearn.model_selection import KFold  # noqa: E402
+from sklearn.pipeline import Pipeline  # noqa: E402
+
+from house_prices.data.preprocessing import create_full_pipeline  # noqa: E402
+from house_prices.models.compiled_model import compile_pipeline  # noqa: E402
+
+MODES = ("onehot", "target")
+
+
+def _latency_ms(predict, X, repeat):
+    """Médiane de `repeat` appels, en millisecondes."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        predict(X)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings)) * 1000
+
+
+def run_mode(mode, X, y, folds, repeat):
+    """Moyennes par fold d'un mode: largeur, entraînement (s), latences (ms), RMSE (log)."""
+    rows = []
+    for train, test in KFold(folds, shuffle=True, random_state=42).split(X):
+        pipeline = Pipeline(
+            [
+                ("preprocessing", create_full_pipeline(nominal_encoding=mode, monitor_sample_rate=0.0)),
+                ("model", HuberRegressor(epsilon=1.35, alpha=10.0, max_iter=1000)),
+            ]
+        )
+        start = time.perf_counter()
+        pipeline.fit(X.iloc[train], y[train])
+        fit_seconds = time.perf_counter() - start
+        compiled = compile_pipeline(pipeline)
+
+        X_test, record = X.iloc[test], X.iloc[test[:1]]
+        y_pred = pipeline.predict(X_test)
+        rows.append(
+            {
+                "features": pipeline.named_steps["model"].coef_.shape[0],
+                "fit_s": fit_seconds,
+                "huber_iter": pipeline.named_steps["model"].n_iter_,
+                "batch_ms": _latency_ms(pipeline.predict, X_test, max(repeat // 10, 1)),
+                "record_ms": _latency_ms(pipeline.predict, record, repeat),
+                "compiled_ms": _latency_ms(compiled.predict, record.iloc[0].to_dict(), repeat),
+                "rmse": float(np.sqrt(mean_squared_error(y[test], y_pred))),
+            }
+        )
+    return pd.DataFrame(rows).mean()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", type=Path, default=ROOT / "data" / "raw" / "train.csv", help="Données d'entraînement")
+    parser.add_argument("--folds", type=int, default=5, help="Nombre de folds")
+    parser.add_argument("--repeat", type=int, default=100, help="Répétitions des mesures de latence")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    train = pd.read_csv(args.data)
+    X = train.drop(columns=["SalePrice", "Id"])
+    y = np.log1p(train["SalePrice"].to_numpy())
+
+    results = {mode: run_mode(mode, X, y, args.folds, args.repeat) for mode in MODES}
+
+    print(f"\n=== ENCODAGE NOMINAL ({len(X):,} lignes, {args.folds} folds) ===")
+    print(
+        f"{'mode':<10}{'features':>10}{'fit (s)':>10}{'itér. Huber':>13}{'batch (ms)':>12}"
+        f"{'requête (ms)':>14}{'compilé (ms)':>14}{'RMSE log':>10}"
+    )
+    for mode, r in results.items():
+        print(
+            f"{mode:<10}{r['features']:>10.0f}{r['fit_s']:>10.3f}{r['huber_iter']:>13.0f}{r['batch_ms']:>12.2f}"
+            f"{r['record_ms']:>14.2f}{r['compiled_ms']:>14.3f}{r['rmse']:>10.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Benchmark mémoire du pipeline de prétraitement: copie à chaque étape vs mode propriétaire.
+Avec --full, les modes "sparse" et "float32" mesurent en plus la sortie CSR et la
+politique de précision float32 du ColumnTransformer final. Le mode "categorical" convertit
+les colonnes texte en catégories à vocabulaire figé avant les étapes du pipeline.
+
+Chaque mode est mesuré dans un sous-processus séparé pour que le pic de RSS de l'un
+ne pollue pas l'autre. Le pipeline est entraîné sur data/raw/train.csv puis appliqué
+au même fichier répliqué jusqu'à --rows lignes.
+
+Usage:
+    python scripts/benchmark_memory.py --rows 1000000
+    python scripts/benchmark_memory.py --rows 1000000 --full
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+# mode -> arguments de create_full_pipeline
+MODES = {
+    "copy": {},
+    "inplace": {"inplace": True},
+    "sparse": {"inplace": True, "sparse": True},
+    "float32": {"inplace": True, "dtype": "float32"},
+    "categorical": {"inplace": True, "categorical": True},
+}
+FULL_ONLY_MODES = {"sparse", "float32"}  # Proches de "inplace" sans le ColumnTransformer final
+
+
+def _rss_mb():
+    """(RSS courant, pic de RSS) du processus en Mo, lus dans /proc/self/status."""
+    values = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if key in ("VmRSS", "VmHWM"):
+                values[key] = int(value.split()[0]) / 1024
+    if not values:  # Hors Linux: seul le pic est disponible
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        return peak, peak
+    return values["VmRSS"], values["VmHWM"]
+
+
+def _reset_peak_rss():
+    """Remet VmHWM au RSS courant (Linux >= 4.0); sans effet ailleurs."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def run_mode(mode, rows, full):
+    """Mesure un mode dans le processus courant et renvoie un dict de résultats."""
+    import numpy as np
+    import pandas as pd
+
+    from house_prices.data.preprocessing import create_full_pipeline
+
+    train = pd.read_csv(ROOT / "data" / "raw" / "train.csv")
+    X_train = train.drop(columns=["SalePrice", "Id"])
+
+    pipeline = create_full_pipeline(**MODES[mode])
+    pipeline.fit(X_train)
+
+    X = pd.concat([X_train] * (rows // len(X_train) + 1), ignore_index=True).iloc[:rows].copy()
+    input_mb = X.memory_usage(deep=False).sum() / 1024**2
+
+    steps = pipeline.steps if full else pipeline.steps[:-1]
+    baseline_mb, _ = _rss_mb()
+    peak_reset = _reset_peak_rss()
+
+    start = time.perf_counter()
+    Xt = X
+    for _, step in steps:
+        Xt = step.transform(Xt)
+    elapsed = time.perf_counter() - start
+
+    _, peak_mb = _rss_mb()
+    if hasattr(Xt, "nnz"):
+        output_bytes = Xt.data.nbytes + Xt.indices.nbytes + Xt.indptr.nbytes
+    else:
+        output_bytes = Xt.nbytes if isinstance(Xt, np.ndarray) else Xt.memory_usage(deep=False).sum()
+    return {
+        "mode": mode,
+        "rows": rows,
+        "stages": [name for name, _ in steps],
+        "input_mb": round(input_mb, 1),
+        "output_mb": round(output_bytes / 1024**2, 1),
+        "baseline_rss_mb": round(baseline_mb, 1),
+        "peak_rss_mb": round(peak_mb, 1),
+        "peak_over_baseline_mb": round(peak_mb - baseline_mb, 1),
+        "peak_reset": peak_reset,
+        "seconds": round(elapsed, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Nombre de lignes après réplication")
+    parser.add_argument(
+        "--full", action="store_true", help="Inclure le ColumnTransformer final (et les modes sparse, float32)"
+    )
+    parser.add_argument("--mode", choices=sorted(MODES), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        # Sous-processus: une seule mesure, résultat en JSON sur la dernière ligne
+        result = run_mode(args.mode, args.rows, args.full)
+        print(json.dumps(result))
+        return
+
+    results = []
+    for mode in MODES:
+        if mode in FULL_ONLY_MODES and not args.full:
+            continue
+        cmd = [sys.executable, __file__, "--mode", mode, "--rows", str(args.rows)]
+        if args.full:
+            cmd.append("--full")
+        completed = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    print(f"\n=== PIC MÉMOIRE ({args.rows:,} lignes, entrée {results[0]['input_mb']:,.0f} Mo) ===")
+    print(
+        f"{'mode':<10}{'RSS base (Mo)':>16}{'pic RSS (Mo)':>16}{'pic - base':>14}{'x entrée':>10}"
+        f"{'sortie (Mo)':>14}{'temps (s)':>12}"
+    )
+    for r in results:
+        ratio = r["peak_over_baseline_mb"] / r["input_mb"]
+        print(
+            f"{r['mode']:<10}{r['baseline_rss_mb']:>16,.0f}{r['peak_rss_mb']:>16,.0f}"
+            f"{r['peak_over_baseline_mb']:>14,.0f}{ratio:>10.2f}{r['output_mb']:>14,.0f}{r['seconds']:>12.2f}"
+        )
+    if not all(r["peak_reset"] for r in results):
+        print("Note: pic non réinitialisable sur ce système, 'pic RSS' inclut la construction des données.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Export ONNX du modèle entraîné, servi par l'API via onnxruntime.
+
+Le pipeline complet (prétraitement + modèle linéaire) est converti en un seul graphe,
+puis les prédictions ONNX sont comparées à celles du pipeline scikit-learn sur
+data/raw/train.csv avant d'annoncer l'export.
+
+Usage:
+    python scripts/export_onnx.py
+    python scripts/export_onnx.py --model models/house_prices_model.pkl --output models/house_prices_model.onnx
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from house_prices.models.onnx_model import OnnxPipeline, export_onnx  # noqa: E402
+from house_prices.models.predict_model import load_trained_model  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", type=Path, default=ROOT / "models" / "house_prices_model.pkl", help="Pipeline entraîné")
+    parser.add_argument("--output", type=Path, default=ROOT / "models" / "house_prices_model.onnx", help="Fichier .onnx")
+    parser.add_argument("--data", type=Path, default=ROOT / "data" / "raw" / "train.csv", help="Données de vérification")
+    args = parser.parse_args()
+
+    pipeline = load_trained_model(str(args.model))
+    model = export_onnx(pipeline, args.output)
+    print(f"Export: {args.output} ({len(model.graph.node)} nœuds, {args.output.stat().st_size / 1024:.0f} Ko)")
+
+    if args.data.exists():
+        X = pd.read_csv(args.data).drop(columns=["SalePrice"], errors="ignore")
+        expected = pipeline.predict(X)
+        session = OnnxPipeline(args.output)
+        start = time.perf_counter()
+        actual = session.predict(X)
+        elapsed = time.perf_counter() - start
+        error = float(np.max(np.abs(actual - expected)))
+        print(f"Vérification sur {len(X)} lignes: écart max {error:.2e} (log), inférence ONNX {elapsed * 1000:.1f} ms")
+        if not np.allclose(actual, expected, rtol=1e-9, atol=1e-9):
+            sys.exit("Prédictions ONNX différentes du pipeline scikit-learn")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,8 +8,10 @@ __version__ = "1.0.0"
 __author__ = "Laplace Immo Data Science Team"
 __email__ = "data@laplace-immo.fr"
 
+from .data.instrumentation import profile_pipeline
 from .data.load_data import load_config, load_data
 from .data.preprocessing import create_full_pipeline, get_feature_lists
+from .models.compiled_model import compile_pipeline
 from .models.predict_model import load_trained_model, predict
 from .models.train_model import evaluate_model, train_model
 
@@ -22,4 +24,6 @@ __all__ = [
     "evaluate_model",
     "predict",
     "load_trained_model",
+    "compile_pipeline",
+    "profile_pipeline",
 ]
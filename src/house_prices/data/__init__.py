@@ -1,24 +1,66 @@
 """Data loading and preprocessing utilities."""
 
-from .load_data import load_config, load_data
+from .feature_store import FeatureSet, FeatureStore
+from .features import FeatureExpressions
+from .incremental import ColumnTransformerAccumulator, fit_out_of_core
+from .ingest import IngestReport, ingest_partitions
+from .instrumentation import PipelineProfile, profile_pipeline
+from .load_data import iter_data, load_config, load_data, read_csv_cached
+from .polars_backend import PolarsPipeline
 from .preprocessing import (
     AnomalyCorrector,
+    CategoricalCaster,
+    DataQualityMonitor,
     DebugTransformer,
     FeatureEngineer,
+    FeatureSelector,
+    MedianSketch,
     MissingValuesHandler,
+    ModeSketch,
+    NeighborIndex,
+    NumericCaster,
     OrdinalEncoderCustom,
+    TargetFrequencyEncoder,
     create_full_pipeline,
     get_feature_lists,
 )
+from .profiling import DatasetProfile, DistinctSketch, profile_data
+from .schema import ColumnSchema, FrozenColumnTransformer, SchemaDriftError
 
 __all__ = [
     "load_data",
     "load_config",
+    "read_csv_cached",
+    "iter_data",
+    "ingest_partitions",
+    "IngestReport",
     "MissingValuesHandler",
     "AnomalyCorrector",
     "FeatureEngineer",
+    "FeatureSelector",
+    "TargetFrequencyEncoder",
     "OrdinalEncoderCustom",
     "DebugTransformer",
+    "DataQualityMonitor",
+    "NumericCaster",
+    "CategoricalCaster",
     "get_feature_lists",
     "create_full_pipeline",
+    "profile_pipeline",
+    "PipelineProfile",
+    "ModeSketch",
+    "MedianSketch",
+    "NeighborIndex",
+    "fit_out_of_core",
+    "ColumnTransformerAccumulator",
+    "FeatureExpressions",
+    "ColumnSchema",
+    "SchemaDriftError",
+    "FrozenColumnTransformer",
+    "PolarsPipeline",
+    "FeatureStore",
+    "FeatureSet",
+    "DatasetProfile",
+    "DistinctSketch",
+    "profile_data",
 ]
@@ -0,0 +1,293 @@
+"""
+Feature store local: prétraitement entraîné et matrices de features adressés par contenu.
+
+La clé d'une entrée est une empreinte des données d'entrée (lignes, colonnes, dtypes,
+cible), des paramètres du pipeline de prétraitement non entraîné et du code des
+transformers. Une entrée contient le pipeline entraîné (joblib) et les matrices
+transformées train/test en .npy (CSR: data, indices et indptr), relues en mémoire
+partagée (np.load(mmap_mode="r")): comparer N modèles coûte un seul prétraitement.
+
+Les entrées sont écrites dans un répertoire temporaire renommé à la fin (pas d'entrée
+partielle visible), et évincées par âge puis par taille (les moins récemment lues d'abord).
+
+Usage:
+    store = FeatureStore.from_config()
+    features = store.fit_transform(create_full_pipeline(), X_train, np.log1p(y_train), X_test)
+    model.fit(features.train, np.log1p(y_train))
+    model.predict(features.test)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Union
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from scipy import sparse
+from sklearn.base import clone
+
+from . import features as _features_module
+from . import preprocessing as _preprocessing_module
+from . import schema as _schema_module
+from .load_data import load_config
+
+logger = logging.getLogger(__name__)
+
+# Valeurs par défaut (section feature_store de config.yaml)
+FEATURE_STORE_PATH = "data/features"
+FEATURE_STORE_MAX_SIZE_MB = 2048
+FEATURE_STORE_MAX_AGE_DAYS = 30
+
+# Le code des transformers fait partie de la clé: une modification invalide les entrées
+_CODE_MODULES = (_preprocessing_module, _features_module, _schema_module)
+_META_FILE = "meta.json"
+_PIPELINE_FILE = "pipeline.joblib"
+
+
+@dataclass
+class FeatureSet:
+    """Entrée du feature store: prétraitement entraîné et matrices transformées."""
+
+    key: str
+    pipeline: Any  # Pipeline de prétraitement entraîné
+    train: Any  # np.ndarray (mémoire partagée) ou scipy.sparse.csr_matrix
+    test: Any = None
+    feature_names: List[str] = field(default_factory=list)
+    hit: bool = False  # True: entrée relue, sans prétraitement
+
+
+def _code_fingerprint() -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for module in _CODE_MODULES:
+        digest.update(Path(module.__file__).read_bytes())
+    digest.update(f"numpy={np.__version__};pandas={pd.__version__};sklearn={sklearn.__version__}".encode())
+    return digest.hexdigest()
+
+
+def _update_frame(digest: Any, X: Optional[Union[pd.DataFrame, pd.Series]]) -> None:
+    """Empreinte d'un DataFrame: hachage vectorisé des lignes (index compris), colonnes et dtypes."""
+    if X is None:
+        digest.update(b"none")
+        return
+    X = X if isinstance(X, (pd.DataFrame, pd.Series)) else pd.Series(np.asarray(X))
+    digest.update(pd.util.hash_pandas_object(X, index=True).to_numpy().tobytes())
+    if isinstance(X, pd.DataFrame):
+        digest.update(json.dumps([[str(col), str(dtype)] for col, dtype in X.dtypes.items()]).encode())
+    else:
+        digest.update(str(X.dtype).encode())
+
+
+def _directory_bytes(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.iterdir() if f.is_file())
+
+
+class FeatureStore:
+    """
+    Feature store sur disque, adressé par contenu.
+
+    Args:
+        path: Répertoire des entrées
+        max_size_mb: Taille totale maximale; au-delà, les entrées les moins récemment lues sont évincées
+        max_age_days: Âge maximal d'une entrée depuis sa dernière lecture (None: sans limite)
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = FEATURE_STORE_PATH,
+        max_size_mb: Optional[float] = FEATURE_STORE_MAX_SIZE_MB,
+        max_age_days: Optional[float] = FEATURE_STORE_MAX_AGE_DAYS,
+    ):
+        self.path = Path(path)
+        self.max_size_mb = max_size_mb
+        self.max_age_days = max_age_days
+
+    @classmethod
+    def from_config(cls, config: Optional[Mapping[str, Any]] = None) -> "FeatureStore":
+        """Feature store configuré par la section feature_store de config.yaml (valeurs par défaut si absente)."""
+        section = (load_config() if config is None else config).get("feature_store") or {}
+        return cls(
+            path=section.get("path", FEATURE_STORE_PATH),
+            max_size_mb=section.get("max_size_mb", FEATURE_STORE_MAX_SIZE_MB),
+            max_age_days=section.get("max_age_days", FEATURE_STORE_MAX_AGE_DAYS),
+        )
+
+    # ------------------------------------------------------------------
+    # Clés
+    # ------------------------------------------------------------------
+
+    def key(self, pipeline: Any, X_train: pd.DataFrame, y_train: Any = None, X_test: Optional[pd.DataFrame] = None) -> str:
+        """Empreinte (données, cible, paramètres du pipeline non entraîné, code des transformers)."""
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(_code_fingerprint().encode())
+        digest.update(joblib.hash(clone(pipeline)).encode())
+        for data in (X_train, y_train, X_test):
+            _update_frame(digest, data)
+        return digest.hexdigest()
+
+    # ------------------------------------------------------------------
+    # Lecture et écriture
+    # ------------------------------------------------------------------
+
+    def get(self, key: str) -> Optional[FeatureSet]:
+        """Entrée `key` relue en mémoire partagée, ou None; la lecture compte comme un accès (éviction)."""
+        entry = self.path / key
+        meta_file = entry / _META_FILE
+        if not meta_file.exists():
+            return None
+        try:
+            meta = json.loads(meta_file.read_text())
+            features = FeatureSet(
+                key=key,
+                pipeline=joblib.load(entry / _PIPELINE_FILE),
+                train=self._load_matrix(entry, "train", meta["matrices"]["train"]),
+                test=self._load_matrix(entry, "test", meta["matrices"].get("test")),
+                feature_names=meta.get("feature_names", []),
+                hit=True,
+            )
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"FeatureStore: entrée {key} illisible, ignorée ({e})")
+            return None
+        os.utime(meta_file)  # Dernier accès
+        return features
+
+    def fit_transform(
+        self, pipeline: Any, X_train: pd.DataFrame, y_train: Any = None, X_test: Optional[pd.DataFrame] = None
+    ) -> FeatureSet:
+        """
+        Prétraitement entraîné et matrices transformées, relus si l'entrée existe, sinon calculés et enregistrés.
+
+        Args:
+            pipeline: Pipeline de prétraitement (non entraîné, ex: create_full_pipeline()); il n'est pas modifié
+            X_train: Données d'entraînement
+            y_train: Cible passée à fit (étapes supervisées, ex: FeatureSelector)
+            X_test: Données transformées par le pipeline entraîné (optionnel)
+
+        Returns:
+            FeatureSet (hit=True si l'entrée existait)
+        """
+        key = self.key(pipeline, X_train, y_train, X_test)
+        features = self.get(key)
+        if features is not None:
+            logger.info(f"FeatureStore: entrée {key[:12]} relue ({self.path})")
+            return features
+
+        start = time.perf_counter()
+        fitted = clone(pipeline)
+        train = fitted.fit_transform(X_train, y_train)
+        test = fitted.transform(X_test) if X_test is not None else None
+        logger.info(f"FeatureStore: prétraitement calculé en {time.perf_counter() - start:.2f}s, entrée {key[:12]}")
+        try:
+            self._write(key, fitted, train, test)
+        except OSError as e:  # Disque plein, droits: le résultat reste utilisable en mémoire
+            logger.warning(f"FeatureStore: entrée {key[:12]} non enregistrée ({e})")
+            return FeatureSet(key=key, pipeline=fitted, train=train, test=test)
+        self.evict(keep=key)
+        features = self.get(key) or FeatureSet(key=key, pipeline=fitted, train=train, test=test)
+        features.hit = False
+        return features
+
+    def _write(self, key: str, pipeline: Any, train: Any, test: Any) -> None:
+        """Écriture dans un répertoire temporaire renommé à la fin: une entrée visible est complète."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        tmp = self.path / f".tmp-{key}-{os.getpid()}"
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir()
+        try:
+            joblib.dump(pipeline, tmp / _PIPELINE_FILE)
+            matrices = {"train": self._save_matrix(tmp, "train", train)}
+            if test is not None:
+                matrices["test"] = self._save_matrix(tmp, "test", test)
+            try:
+                feature_names = [str(name) for name in pipeline[-1].get_feature_names_out()]
+            except Exception:  # Étapes sans noms de sortie
+                feature_names = []
+            meta = {"key": key, "created": time.time(), "matrices": matrices, "feature_names": feature_names}
+            (tmp / _META_FILE).write_text(json.dumps(meta))
+            try:
+                tmp.rename(self.path / key)
+            except OSError:  # Entrée écrite entre-temps par un autre processus
+                shutil.rmtree(tmp, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+    @staticmethod
+    def _save_matrix(directory: Path, name: str, matrix: Any) -> Dict[str, Any]:
+        if sparse.issparse(matrix):
+            matrix = sparse.csr_matrix(matrix)
+            for part in ("data", "indices", "indptr"):
+                np.save(directory / f"{name}.{part}.npy", getattr(matrix, part))
+            return {"format": "csr", "shape": list(matrix.shape)}
+        np.save(directory / f"{name}.npy", np.ascontiguousarray(matrix))
+        return {"format": "dense"}
+
+    @staticmethod
+    def _load_matrix(directory: Path, name: str, meta: Optional[Dict[str, Any]]) -> Any:
+        if meta is None:
+            return None
+        if meta["format"] == "csr":
+            parts = [np.load(directory / f"{name}.{part}.npy", mmap_mode="r") for part in ("data", "indices", "indptr")]
+            return sparse.csr_matrix(tuple(parts), shape=tuple(meta["shape"]), copy=False)
+        return np.load(directory / f"{name}.npy", mmap_mode="r")
+
+    # ------------------------------------------------------------------
+    # Entretien
+    # ------------------------------------------------------------------
+
+    def entries(self) -> pd.DataFrame:
+        """Une ligne par entrée: clé, taille (octets), création et dernier accès (timestamps)."""
+        rows = []
+        if self.path.exists():
+            for entry in self.path.iterdir():
+                meta_file = entry / _META_FILE
+                if entry.is_dir() and meta_file.exists():
+                    rows.append(
+                        {
+                            "key": entry.name,
+                            "bytes": _directory_bytes(entry),
+                            "created": json.loads(meta_file.read_text()).get("created"),
+                            "last_access": meta_file.stat().st_mtime,
+                        }
+                    )
+        frame = pd.DataFrame(rows, columns=["key", "bytes", "created", "last_access"])
+        return frame.sort_values("last_access", ascending=False, ignore_index=True)
+
+    def evict(self, keep: Optional[str] = None) -> List[str]:
+        """
+        Supprime les entrées non lues depuis max_age_days, puis les moins récemment lues
+        tant que la taille totale dépasse max_size_mb. L'entrée `keep` est conservée.
+
+        Returns:
+            Clés supprimées
+        """
+        entries = self.entries()
+        removed = []
+        if self.max_age_days is not None:
+            expired = entries["last_access"] < time.time() - self.max_age_days * 86400
+            removed += [key for key in entries.loc[expired, "key"] if key != keep]
+        if self.max_size_mb is not None:
+            remaining = entries[~entries["key"].isin(removed)]
+            total = remaining["bytes"].sum()
+            for key, nbytes in zip(remaining["key"][::-1], remaining["bytes"][::-1]):  # Moins récemment lues d'abord
+                if total <= self.max_size_mb * 1024**2:
+                    break
+                if key != keep:
+                    removed.append(key)
+                    total -= nbytes
+        for key in removed:
+            shutil.rmtree(self.path / key, ignore_errors=True)
+        if removed:
+            logger.info(f"FeatureStore: {len(removed)} entrée(s) évincée(s)")
+        return removed
+
+    def clear(self) -> None:
+        """Supprime toutes les entrées."""
+        shutil.rmtree(self.path, ignore_errors=True)
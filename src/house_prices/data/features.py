@@ -0,0 +1,443 @@
+"""
+Moteur d'expressions pour les features dérivées (section `feature_engineering` de config.yaml).
+
+Les formules sont analysées une seule fois en un graphe d'opérations: les
+sous-expressions communes (ex: `YrSold - YearBuilt` dans HouseAge et HouseAgeBin)
+ne sont calculées qu'une fois, puis toutes les features sont évaluées en une seule
+passe vectorisée sur des tableaux NumPy.
+
+Syntaxe:
+    - colonnes et features déjà définies: `GrLivArea`, `1stFlrSF`, `TotalPorchSF`
+    - nombres, `+ - * /`, comparaisons `> >= < <= == !=` (résultat 0/1), parenthèses
+    - fonctions: max(a, b), min(a, b), abs(a), lookup(col, TABLE[, défaut]), cut(a, BINS, LABELS)
+    - TABLE, BINS, LABELS: noms de constantes fournies au moteur (ex: QUALITY_MAPPING)
+
+Usage:
+    expressions = FeatureExpressions({"HouseAge": "YrSold - YearBuilt", "IsNew": "YrSold == YearBuilt"})
+    values = expressions.evaluate({"YrSold": yr_sold, "YearBuilt": year_built})
+"""
+
+import bisect
+import math
+import re
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+_TOKEN = re.compile(
+    r"\s*(?:"
+    r"(?P<number>(?:\d+\.\d*|\.\d+|\d+)(?:[eE][+-]?\d+)?)(?![A-Za-z0-9_])"
+    r"|(?P<name>[A-Za-z0-9_]+)"
+    r"|(?P<op>==|!=|>=|<=|[-+*/()<>,])"
+    r")"
+)
+
+# Opérateur binaire -> (priorité, nom du nœud)
+_BINARY = {
+    "==": (1, "eq"),
+    "!=": (1, "ne"),
+    ">": (1, "gt"),
+    ">=": (1, "ge"),
+    "<": (1, "lt"),
+    "<=": (1, "le"),
+    "+": (2, "add"),
+    "-": (2, "sub"),
+    "*": (3, "mul"),
+    "/": (3, "div"),
+}
+# Opérations dont les opérandes peuvent être triés (a + b et b + a partagent le même nœud)
+_COMMUTATIVE = {"eq", "ne", "add", "mul", "max", "min"}
+_COMPARISONS = {"eq", "ne", "gt", "ge", "lt", "le"}
+# Fonction -> nombre d'arguments accepté (min, max)
+_FUNCTIONS = {"max": (2, 2), "min": (2, 2), "abs": (1, 1), "lookup": (2, 3), "cut": (3, 3)}
+
+
+class FeatureExpressionError(ValueError):
+    """Formule de feature invalide."""
+
+
+def _divide(a, b):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = np.true_divide(a, b)
+    return result if isinstance(result, np.ndarray) else float(result)
+
+
+def _maximum(a, b):
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        return np.maximum(a, b)
+    return math.nan if a != a or b != b else max(a, b)
+
+
+def _minimum(a, b):
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        return np.minimum(a, b)
+    return math.nan if a != a or b != b else min(a, b)
+
+
+def _lookup(values, table, default=0.0):
+    """Correspondance catégorie -> valeur; catégories inconnues et NA -> default."""
+    if values is None or isinstance(values, (str, float, int)):
+        return float(table.get(values, default)) if values == values else float(default)
+    lut = np.array(list(table.values()) + [default], dtype=np.float64)
+    if isinstance(values, pd.Categorical):
+        # Table des seules catégories, puis indexation par les codes (-1 pour NA -> default)
+        return np.append(lut[pd.Index(list(table)).get_indexer(values.categories)], default)[values.codes]
+    return lut[pd.Index(list(table)).get_indexer(values)]
+
+
+def _cut_codes(values, bins):
+    """Index de tranche comme pd.cut(..., right=True, include_lowest=True); -1 hors des bornes et pour NA."""
+    n_bins = len(bins) - 1
+    if not isinstance(values, np.ndarray):
+        if values != values or values < bins[0] or values > bins[-1]:
+            return -1
+        return 0 if values == bins[0] else bisect.bisect_left(bins, values) - 1
+    codes = np.searchsorted(bins, values, side="left") - 1
+    codes[values == bins[0]] = 0
+    codes[(codes < 0) | (codes >= n_bins) | np.isnan(values)] = -1
+    return codes
+
+
+def _cut(values, bins, labels, encoded):
+    codes = _cut_codes(values, bins)
+    if not isinstance(codes, np.ndarray):
+        return math.nan if codes < 0 else float(codes)
+    if encoded:
+        return np.where(codes < 0, np.nan, codes.astype(np.float64))
+    return pd.Categorical.from_codes(codes, categories=labels, ordered=True)
+
+
+def _copy(value):
+    return value.copy() if hasattr(value, "copy") else value
+
+
+def _as_float(flag):
+    return flag.astype(np.float64) if isinstance(flag, np.ndarray) else float(flag)
+
+
+def _as_int(flag):
+    return flag.astype(np.int64) if isinstance(flag, np.ndarray) else int(flag)
+
+
+# Opérations écrites avec l'opérateur Python natif dans la fonction compilée
+_INFIX = {
+    "add": "+",
+    "sub": "-",
+    "mul": "*",
+    "eq": "==",
+    "ne": "!=",
+    "gt": ">",
+    "ge": ">=",
+    "lt": "<",
+    "le": "<=",
+}
+_OPERATIONS = {"div": _divide, "max": _maximum, "min": _minimum, "abs": abs, "lookup": _lookup}
+
+
+class _Parser:
+    """Analyse descendante d'une formule; les nœuds sont créés via FeatureExpressions._node."""
+
+    def __init__(self, formula: str, expressions: "FeatureExpressions"):
+        self.formula = formula
+        self.expressions = expressions
+        self.tokens = self._tokenize(formula)
+        self.position = 0
+
+    def _tokenize(self, formula):
+        tokens, position = [], 0
+        formula = formula.rstrip()
+        while position < len(formula):
+            match = _TOKEN.match(formula, position)
+            if match is None or match.end() == position:
+                raise FeatureExpressionError(f"Caractère inattendu dans '{formula}' (position {position})")
+            kind = match.lastgroup
+            tokens.append((kind, match.group(kind)))
+            position = match.end()
+        return tokens
+
+    def _peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def _take(self, expected=None):
+        kind, value = self._peek()
+        if kind is None or (expected is not None and value != expected):
+            raise FeatureExpressionError(f"'{expected or 'expression'}' attendu dans '{self.formula}'")
+        self.position += 1
+        return kind, value
+
+    def parse(self):
+        node = self._binary(1)
+        if self.position != len(self.tokens):
+            raise FeatureExpressionError(f"Élément inattendu '{self._peek()[1]}' dans '{self.formula}'")
+        return node
+
+    def _binary(self, min_priority):
+        left = self._unary()
+        while True:
+            kind, value = self._peek()
+            if kind != "op" or value not in _BINARY or _BINARY[value][0] < min_priority:
+                return left
+            priority, op = _BINARY[value]
+            self._take()
+            left = self.expressions._node(op, left, self._binary(priority + 1))
+
+    def _unary(self):
+        kind, value = self._peek()
+        if (kind, value) == ("op", "-"):
+            self._take()
+            return self.expressions._node("neg", self._unary())
+        if (kind, value) == ("op", "+"):
+            self._take()
+            return self._unary()
+        return self._primary()
+
+    def _primary(self):
+        kind, value = self._take()
+        if kind == "number":
+            number = float(value) if any(c in value for c in ".eE") else int(value)
+            return self.expressions._node("const", number)
+        if (kind, value) == ("op", "("):
+            node = self._binary(1)
+            self._take(")")
+            return node
+        if kind != "name":
+            raise FeatureExpressionError(f"Élément inattendu '{value}' dans '{self.formula}'")
+        if self._peek() == ("op", "("):
+            return self._call(value)
+        return self.expressions._reference(value)
+
+    def _call(self, function):
+        if function not in _FUNCTIONS:
+            raise FeatureExpressionError(f"Fonction inconnue '{function}' dans '{self.formula}'")
+        self._take("(")
+        arguments = [self._binary(1)]
+        while self._peek() == ("op", ","):
+            self._take()
+            arguments.append(self._binary(1))
+        self._take(")")
+        low, high = _FUNCTIONS[function]
+        if not low <= len(arguments) <= high:
+            raise FeatureExpressionError(f"{function}() attend {low} à {high} arguments dans '{self.formula}'")
+        return self.expressions._node(function, *arguments)
+
+
+class FeatureExpressions:
+    """
+    Ensemble de features dérivées compilé en un graphe d'opérations sans doublons.
+
+    Args:
+        formulas: Nom de feature -> formule, dans l'ordre de création des colonnes.
+            Une formule peut référencer une feature définie avant elle.
+        constants: Constantes utilisables dans les formules (tables de lookup, bornes de cut)
+    """
+
+    def __init__(self, formulas: Mapping[str, str], constants: Optional[Mapping[str, Any]] = None):
+        self.formulas = dict(formulas)
+        self.constants = dict(constants or {})
+        self.nodes: List[Tuple] = []  # (opération, *arguments), en ordre topologique
+        self.outputs: Dict[str, int] = {}  # feature -> index du nœud
+        self.n_operations_raw = 0  # Opérations écrites dans les formules, avant élimination des doublons
+        self._index: Dict[Tuple, int] = {}
+        self._functions: Dict[Tuple, Callable] = {}  # (features, encoded) -> fonction compilée
+        for name, formula in self.formulas.items():
+            self.outputs[name] = _Parser(str(formula), self).parse()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_functions"] = {}
+        return state
+
+    @property
+    def names(self) -> List[str]:
+        return list(self.outputs)
+
+    @property
+    def n_operations(self) -> int:
+        """Opérations réellement évaluées pour toutes les features (hors lectures de colonnes et constantes)."""
+        return sum(1 for node in self.nodes if node[0] not in ("column", "const", "constant"))
+
+    # ------------------------------------------------------------------
+    # Construction du graphe
+    # ------------------------------------------------------------------
+
+    def _node(self, op, *arguments):
+        if op not in ("column", "const", "constant"):
+            self.n_operations_raw += 1
+        if op in _COMMUTATIVE:
+            arguments = tuple(sorted(arguments))
+        key = (op, *arguments) if op != "const" else (op, type(arguments[0]).__name__, arguments[0])
+        if key not in self._index:
+            self._index[key] = len(self.nodes)
+            self.nodes.append((op, *arguments))
+        return self._index[key]
+
+    def _reference(self, name):
+        if name in self.outputs:
+            self.n_operations_raw += self._size(self.outputs[name])  # Réécrite en entier sans le moteur
+            return self.outputs[name]
+        if name in self.constants:
+            return self._node("constant", name)
+        return self._node("column", name)
+
+    def _size(self, index):
+        op, *arguments = self.nodes[index]
+        if op in ("column", "const", "constant"):
+            return 0
+        return 1 + sum(self._size(argument) for argument in arguments)
+
+    def _dependencies(self, index, seen):
+        if index in seen:
+            return
+        seen.add(index)
+        op, *arguments = self.nodes[index]
+        if op not in ("column", "const", "constant"):
+            for argument in arguments:
+                self._dependencies(argument, seen)
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+
+    def columns(self, name: str) -> List[str]:
+        """Colonnes d'entrée nécessaires au calcul d'une feature."""
+        seen: set = set()
+        self._dependencies(self.outputs[name], seen)
+        return [self.nodes[i][1] for i in sorted(seen) if self.nodes[i][0] == "column"]
+
+    def categorical_columns(self, name: str) -> List[str]:
+        """Colonnes catégorielles (premier argument de lookup) nécessaires au calcul d'une feature."""
+        seen: set = set()
+        self._dependencies(self.outputs[name], seen)
+        lookups = {self.nodes[i][1] for i in seen if self.nodes[i][0] == "lookup"}
+        return [self.nodes[i][1] for i in sorted(lookups) if self.nodes[i][0] == "column"]
+
+    def lookup_categories(self) -> Dict[str, List[Any]]:
+        """Modalités connues des tables de lookup, par colonne catégorielle (lookup(colonne, TABLE))."""
+        categories: Dict[str, List[Any]] = {}
+        for op, *arguments in self.nodes:
+            if op != "lookup":
+                continue
+            column, table = self.nodes[arguments[0]], self.nodes[arguments[1]]
+            if column[0] == "column" and table[0] == "constant":
+                known = categories.setdefault(column[1], [])
+                known.extend(category for category in self.constants[table[1]] if category not in known)
+        return categories
+
+    def labels(self, name: str) -> Optional[List[Any]]:
+        """Modalités d'une feature catégorielle (cut), None pour une feature numérique."""
+        op, *arguments = self.nodes[self.outputs[name]]
+        return list(self.constants[self.nodes[arguments[2]][1]]) if op == "cut" else None
+
+    def available(self, columns) -> List[str]:
+        """Features calculables à partir des colonnes fournies."""
+        columns = set(columns)
+        return [name for name in self.outputs if all(col in columns for col in self.columns(name))]
+
+    # ------------------------------------------------------------------
+    # Évaluation
+    # ------------------------------------------------------------------
+
+    def _compile(self, names, encoded):
+        """
+        Fonction Python en ligne droite qui évalue les features demandées: un nœud du
+        graphe par ligne, opérateurs natifs (valables pour des tableaux comme pour des scalaires).
+        """
+        key = (tuple(names), encoded)
+        if key in self._functions:
+            return self._functions[key]
+
+        seen: set = set()
+        for name in names:
+            self._dependencies(self.outputs[name], seen)
+        lines = ["def evaluate(inputs):"]
+        for index in sorted(seen):
+            lines.append(f"    v{index} = {self._source(index, encoded)}")
+
+        outputs = []
+        for name in names:
+            index = self.outputs[name]
+            op = self.nodes[index][0]
+            if op == "column":  # Feature alias d'une colonne: jamais de mémoire partagée avec l'entrée
+                outputs.append(f"{name!r}: copy(v{index})")
+            elif op in _COMPARISONS:  # Indicateurs 0/1
+                outputs.append(f"{name!r}: {'as_float' if encoded else 'as_int'}(v{index})")
+            else:
+                outputs.append(f"{name!r}: v{index}")
+        lines.append(f"    return {{{', '.join(outputs)}}}")
+
+        namespace = {
+            "constants": self.constants,
+            "operations": _OPERATIONS,
+            "cut": _cut,
+            "copy": _copy,
+            "as_float": _as_float,
+            "as_int": _as_int,
+        }
+        exec(compile("\n".join(lines), "<feature_expressions>", "exec"), namespace)
+        self._functions[key] = namespace["evaluate"]
+        return self._functions[key]
+
+    def _source(self, index, encoded):
+        """Code Python d'un nœud (ses opérandes sont les variables v<index>)."""
+        op, *arguments = self.nodes[index]
+        operands = [f"v{argument}" for argument in arguments]
+        if op == "column":
+            return f"inputs[{arguments[0]!r}]"
+        if op == "const":
+            return repr(arguments[0])
+        if op == "constant":
+            return f"constants[{arguments[0]!r}]"
+        if op in _INFIX:
+            return f"{operands[0]} {_INFIX[op]} {operands[1]}"
+        if op == "neg":
+            return f"-{operands[0]}"
+        if op == "cut":
+            return f"cut({', '.join(operands)}, {encoded})"
+        return f"operations[{op!r}]({', '.join(operands)})"
+
+    def evaluate(
+        self, inputs: Mapping[str, Any], names: Optional[Sequence[str]] = None, encoded: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Évalue les features en une passe: chaque nœud du graphe est calculé une seule fois.
+
+        Args:
+            inputs: Colonne -> tableau NumPy (ou scalaire pour une seule observation)
+            names: Features à calculer (défaut: toutes)
+            encoded: False: sortie comme un DataFrame pandas (indicateurs int64, cut -> Categorical).
+                True: sortie numérique pour le noyau compilé (indicateurs float, cut -> index de tranche, NaN hors bornes)
+
+        Returns:
+            Dictionnaire feature -> valeurs
+        """
+        names = self.names if names is None else names
+        return self._compile(names, encoded)(inputs)
+
+
+def parse_feature_config(section: Optional[Mapping[str, Any]]) -> Tuple[Optional[Dict[str, str]], Optional[List[str]]]:
+    """
+    Lit la section `feature_engineering` de config.yaml.
+
+    Format:
+        feature_engineering:
+          create_features: [HouseAge, ...]   # ordre de création des colonnes
+          HouseAge:
+            formula: "YrSold - YearBuilt"
+          drop_columns: [YearBuilt, ...]      # colonnes sources supprimées après calcul
+
+    Returns:
+        Tuple (formules, colonnes à supprimer); None pour un élément absent de la section
+    """
+    if not section:
+        return None, None
+    formulas = None
+    if "create_features" in section:
+        formulas = {}
+        for name in section["create_features"]:
+            entry = section.get(name)
+            if not isinstance(entry, Mapping) or "formula" not in entry:
+                raise FeatureExpressionError(f"feature_engineering: formule manquante pour '{name}'")
+            formulas[name] = str(entry["formula"])
+    drop_columns = list(section["drop_columns"]) if "drop_columns" in section else None
+    return formulas, drop_columns
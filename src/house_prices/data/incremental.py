@@ -0,0 +1,251 @@
+"""
+Entraînement hors mémoire (out-of-core) des pipelines de prétraitement.
+
+Chaque étape statistique du pipeline est entraînée par partial_fit sur des morceaux
+du jeu de données (ex: pd.read_csv(..., chunksize=...)), avec des résumés fusionnables
+à mémoire bornée: le jeu complet n'est jamais chargé.
+
+Usage:
+    pipeline = create_full_pipeline()
+    fit_out_of_core(pipeline, lambda: pd.read_csv("train.csv", chunksize=100_000), target="SalePrice")
+"""
+
+import logging
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder
+
+from .preprocessing import (
+    AnomalyCorrector,
+    DataQualityMonitor,
+    DebugTransformer,
+    FeatureEngineer,
+    NumericCaster,
+    OrdinalEncoderCustom,
+)
+
+logger = logging.getLogger(__name__)
+
+# Étapes dont transform est définitif dès le premier morceau: elles sont entraînées
+# dans la même passe que l'étape statistique qui les suit
+STREAMABLE_STEPS = (
+    AnomalyCorrector,
+    FeatureEngineer,
+    OrdinalEncoderCustom,
+    NumericCaster,
+    DataQualityMonitor,
+    DebugTransformer,
+)
+
+
+def _partial_fit(estimator, X, y=None):
+    """
+    partial_fit d'un estimateur; les Pipeline sont parcourus étape par étape.
+
+    Dans un Pipeline imbriqué, chaque étape transforme le morceau avec ses paramètres
+    courants: le résultat n'est exact que si seule la dernière étape est statistique
+    (ex: Pipeline([("scaler", StandardScaler())]) du ColumnTransformer).
+    """
+    if isinstance(estimator, Pipeline):
+        steps = [step for _, step in estimator.steps if step is not None and step != "passthrough"]
+        for step in steps[:-1]:
+            X = _partial_fit(step, X, y).transform(X)
+        if steps:
+            _partial_fit(steps[-1], X, y)
+        return estimator
+    if isinstance(estimator, ColumnTransformer):
+        raise TypeError("ColumnTransformer: utiliser ColumnTransformerAccumulator")
+    if not hasattr(estimator, "partial_fit"):
+        raise TypeError(f"{type(estimator).__name__} ne supporte pas l'entraînement par morceaux (partial_fit)")
+    if y is None:
+        return estimator.partial_fit(X)
+    return estimator.partial_fit(X, y)
+
+
+def _finalize(estimator):
+    """finalize() des étapes qui diffèrent leurs calculs coûteux au-delà du dernier partial_fit."""
+    if isinstance(estimator, Pipeline):
+        for _, step in estimator.steps:
+            if step is not None and step != "passthrough":
+                _finalize(step)
+    elif hasattr(estimator, "finalize"):
+        estimator.finalize()
+    return estimator
+
+
+class ColumnTransformerAccumulator:
+    """
+    Entraîne un ColumnTransformer par morceaux.
+
+    Les colonnes sont résolues sur le premier morceau. Les OneHotEncoder cumulent
+    l'union des catégories vues; les autres transformers sont des clones entraînés
+    par partial_fit. finalize() entraîne le ColumnTransformer sur un petit DataFrame
+    synthétique (toutes les catégories, schéma du premier morceau) puis y substitue
+    les clones entraînés par morceaux.
+    """
+
+    def __init__(self, column_transformer: ColumnTransformer):
+        self.column_transformer = column_transformer
+        self.template_ = None  # Première ligne vue: schéma (colonnes, dtypes)
+        self.columns_ = {}  # nom -> colonnes sélectionnées
+        self.categories_ = {}  # nom -> colonne -> catégories vues
+        self.streamed_ = {}  # nom -> clone entraîné par partial_fit
+
+    def partial_fit(self, X, y=None):
+        if self.template_ is None:
+            self.template_ = X.iloc[:1].copy()
+            for name, transformer, columns in self.column_transformer.transformers:
+                self.columns_[name] = list(columns(X) if callable(columns) else columns)
+                if isinstance(transformer, OneHotEncoder):
+                    self.categories_[name] = {col: set() for col in self.columns_[name]}
+                elif transformer not in ("drop", "passthrough"):
+                    self.streamed_[name] = clone(transformer)
+
+        for name, columns in self.columns_.items():
+            if not columns:
+                continue
+            if name in self.categories_:
+                for col in columns:
+                    self.categories_[name][col].update(X[col].unique().tolist())
+            elif name in self.streamed_:
+                _partial_fit(self.streamed_[name], X[columns], y)
+        return self
+
+    def finalize(self):
+        """Entraîne le ColumnTransformer d'origine à partir des statistiques cumulées."""
+        if self.template_ is None:
+            raise ValueError("ColumnTransformerAccumulator: aucun morceau vu")
+
+        # Autant de lignes que de catégories pour la variable nominale la plus riche
+        categories = {
+            col: sorted((c for c in values if not pd.isna(c)), key=str) + [np.nan] * any(pd.isna(c) for c in values)
+            for per_column in self.categories_.values()
+            for col, values in per_column.items()
+        }
+        n_rows = max([len(values) for values in categories.values()] + [2])
+        synthetic = self.template_.loc[self.template_.index.repeat(n_rows)].reset_index(drop=True)
+        for col, values in categories.items():
+            if values:
+                cycled = [values[i % len(values)] for i in range(n_rows)]
+                synthetic[col] = pd.Series(cycled, dtype=self.template_[col].dtype)
+
+        for streamed in self.streamed_.values():
+            _finalize(streamed)
+        ct = self.column_transformer
+        ct.fit(synthetic)
+        for i, (name, _, columns) in enumerate(ct.transformers_):
+            if name in self.streamed_ and self.columns_.get(name):
+                ct.transformers_[i] = (name, self.streamed_[name], columns)
+        return ct
+
+
+def _leaves(estimator):
+    """Étapes feuilles d'un pipeline (les ColumnTransformer ne sont pas parcourus)."""
+    if isinstance(estimator, Pipeline):
+        for _, step in estimator.steps:
+            if step is not None and step != "passthrough":
+                yield from _leaves(step)
+    else:
+        yield estimator
+
+
+def _iter_chunks(make_chunks, target, target_transform):
+    """(X, y) pour chaque morceau; y est None sans colonne cible."""
+    for chunk in make_chunks():
+        if target is None:
+            yield chunk, None
+            continue
+        y = chunk[target].to_numpy()
+        yield chunk.drop(columns=[target]), target_transform(y) if target_transform is not None else y
+
+
+def _transform(steps, X):
+    """X transformé par des étapes déjà entraînées."""
+    for step in steps:
+        X = step.transform(X)
+    return X
+
+
+def _fit_pass(fitted, current, chunks, n_pass):
+    """
+    Une passe sur les morceaux: les étapes déjà entraînées transforment chaque morceau,
+    puis les étapes de `current` sont entraînées (la dernière, statistique, est finalisée).
+    """
+    accumulator = ColumnTransformerAccumulator(current[-1]) if isinstance(current[-1], ColumnTransformer) else None
+    logger.info(f"Passe {n_pass}: entraînement par morceaux de {[type(step).__name__ for step in current]}")
+
+    for X, y in chunks:
+        X = _transform(fitted, X)
+        for step in current[:-1]:
+            X = _partial_fit(step, X, y).transform(X)
+        if accumulator is not None:
+            accumulator.partial_fit(X, y)
+        else:
+            _partial_fit(current[-1], X, y)
+
+    if accumulator is not None:
+        accumulator.finalize()
+    else:
+        _finalize(current[-1])
+
+
+def fit_out_of_core(
+    pipeline: Pipeline,
+    make_chunks: Callable[[], Iterable[pd.DataFrame]],
+    target: Optional[str] = None,
+    target_transform: Optional[Callable] = None,
+    epochs: int = 1,
+) -> Pipeline:
+    """
+    Entraîne un pipeline sur un flux de morceaux sans charger le jeu complet en mémoire.
+
+    Une passe sur les données par étape statistique (imputation, skewness,
+    ColumnTransformer): chaque morceau traverse les étapes déjà entraînées, puis
+    alimente les résumés de l'étape courante. Les étapes à transform définitif
+    (STREAMABLE_STEPS) sont entraînées au passage. Un éventuel modèle final
+    (étape sans transform) est entraîné par partial_fit pendant `epochs` passes.
+
+    Args:
+        pipeline: Pipeline à entraîner (ex: create_full_pipeline(), ou preprocessing + modèle)
+        make_chunks: Fonction renvoyant un nouvel itérateur de DataFrames à chaque appel
+            (ex: lambda: pd.read_csv(path, chunksize=100_000))
+        target: Colonne cible, retirée de chaque morceau et passée au modèle final
+        target_transform: Transformation de la cible (ex: np.log1p)
+        epochs: Nombre de passes pour le modèle final
+
+    Returns:
+        Le pipeline entraîné
+    """
+    leaves = list(_leaves(pipeline))
+    head = leaves[-1] if leaves and not hasattr(leaves[-1], "transform") else None
+    stages = leaves[:-1] if head is not None else leaves
+
+    fitted = 0  # Nombre d'étapes déjà entraînées
+    n_pass = 0
+    while fitted < len(stages):
+        # Étapes de la passe: les étapes à transform définitif, puis une étape statistique
+        end = fitted
+        while end < len(stages) - 1 and isinstance(stages[end], STREAMABLE_STEPS):
+            end += 1
+        n_pass += 1
+        _fit_pass(stages[:fitted], stages[fitted : end + 1], _iter_chunks(make_chunks, target, target_transform), n_pass)
+        fitted = end + 1
+
+    if head is not None:
+        if target is None:
+            raise ValueError("fit_out_of_core: `target` est requis pour entraîner le modèle final")
+        for epoch in range(epochs):
+            logger.info(f"Passe {n_pass + epoch + 1}: {type(head).__name__}, époque {epoch + 1}/{epochs}")
+            for X, y in _iter_chunks(make_chunks, target, target_transform):
+                _partial_fit(head, _transform(stages, X), y)
+
+    for step in stages:
+        if isinstance(step, DataQualityMonitor):
+            step.reset_counters()  # Les morceaux d'entraînement ne sont pas comptés
+    logger.info("Entraînement par morceaux terminé")
+    return pipeline
@@ -0,0 +1,172 @@
+"""
+Ingestion des partitions de ventes (dépôts CSV mensuels) en un seul jeu colonnaire.
+
+Les partitions trouvées sous un dossier (data/external par défaut, récursivement) sont
+analysées en parallèle par un pool de processus (joblib, une tâche par partition), puis
+leurs schémas sont unifiés: union des colonnes dans l'ordre d'apparition, colonnes
+numériques en int64 (float64 si une partition contient des NA ou des décimaux, ou n'a pas
+la colonne), chaînes dès qu'une partition en contient. Les ventes présentes dans plusieurs
+partitions (même Id) ne sont gardées qu'une fois, dans la version de la partition la plus
+récente (dernière dans l'ordre des chemins: data/external/2024-01.csv < 2024-02.csv).
+Le résultat est écrit en Parquet compressé par save_data (écriture atomique).
+
+Usage:
+    report = ingest_partitions("data/external", "data/processed/sales.parquet", n_jobs=-1)
+    sales = pd.read_parquet(report.path)
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+
+from .load_data import _is_string_dtype, _parquet_engine, load_config, save_data
+
+logger = logging.getLogger(__name__)
+
+# Valeurs par défaut (section data de config.yaml)
+EXTERNAL_DATA_PATH = "data/external"
+PROCESSED_DATA_PATH = "data/processed"
+CONSOLIDATED_FILE = "sales.parquet"
+PARTITION_PATTERN = "**/*.csv"
+
+
+@dataclass
+class IngestReport:
+    """Résumé d'une ingestion."""
+
+    path: Path  # Jeu consolidé (Parquet)
+    partitions: List[Path] = field(default_factory=list)
+    rows_read: int = 0
+    rows: int = 0
+    duplicates: int = 0  # Lignes retirées (Id déjà vu dans une partition plus récente)
+    schema: Dict[str, str] = field(default_factory=dict)  # Colonne -> dtype unifié
+    seconds: float = 0.0
+
+
+def discover_partitions(source: Union[str, Path], pattern: str = PARTITION_PATTERN) -> List[Path]:
+    """Partitions CSV sous `source`, triées par chemin (ordre chronologique des dépôts datés)."""
+    return sorted(path for path in Path(source).glob(pattern) if path.is_file())
+
+
+def _read_partition(path: Path, dtypes: Optional[Mapping[str, Any]]) -> pd.DataFrame:
+    """Tâche d'un worker: analyse d'une partition."""
+    return pd.read_csv(path, dtype=dict(dtypes) if dtypes else None)
+
+
+def _unified_dtype(dtypes: List[Any], complete: bool) -> Any:
+    """dtype commun d'une colonne (dtypes des partitions qui l'ont; `complete`: présente partout)."""
+    strings = [dtype for dtype in dtypes if _is_string_dtype(dtype)]
+    if strings:
+        return strings[0]
+    if all(dtype == dtypes[0] for dtype in dtypes) and (complete or not pd.api.types.is_integer_dtype(dtypes[0])):
+        return dtypes[0]  # Y compris Categorical, bool et dtypes explicites
+    if all(pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype) for dtype in dtypes):
+        if complete and all(pd.api.types.is_integer_dtype(dtype) for dtype in dtypes):
+            return np.dtype(np.int64)
+        return np.dtype(np.float64)  # NA introduits par les partitions sans la colonne
+    return np.dtype(object)
+
+
+def unify_schemas(frames: Sequence[pd.DataFrame]) -> Dict[str, Any]:
+    """Schéma commun de plusieurs partitions: union des colonnes dans l'ordre d'apparition."""
+    seen: Dict[str, List[Any]] = {}
+    for frame in frames:
+        for col, dtype in frame.dtypes.items():
+            seen.setdefault(col, []).append(dtype)
+    return {col: _unified_dtype(dtypes, complete=len(dtypes) == len(frames)) for col, dtypes in seen.items()}
+
+
+def _conform(frame: pd.DataFrame, schema: Mapping[str, Any]) -> pd.DataFrame:
+    """Partition aux colonnes et dtypes du schéma commun (colonnes absentes: NA)."""
+    frame = frame.reindex(columns=list(schema))
+    casts = {col: dtype for col, dtype in schema.items() if frame[col].dtype != dtype}
+    for col, dtype in casts.items():
+        if _is_string_dtype(dtype) and not _is_string_dtype(frame[col].dtype):
+            # Valeurs numériques d'une colonne texte (ex: MSSubClass lu comme entier): 60 -> "60", NA conservés
+            frame[col] = frame[col].astype(object).where(frame[col].notna(), None).map(_as_text, na_action="ignore")
+    return frame.astype(casts) if casts else frame
+
+
+def _as_text(value: Any) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def ingest_partitions(
+    source: Optional[Union[str, Path]] = None,
+    output_path: Optional[Union[str, Path]] = None,
+    pattern: str = PARTITION_PATTERN,
+    id_column: Optional[str] = "Id",
+    dtypes: Optional[Mapping[str, Any]] = None,
+    n_jobs: Optional[int] = -1,
+) -> IngestReport:
+    """
+    Consolide les partitions CSV d'un dossier en un seul fichier Parquet.
+
+    Args:
+        source: Dossier des partitions (défaut: data.external_data_path de config.yaml)
+        output_path: Fichier Parquet produit (défaut: data.processed_data_path / data.consolidated_file)
+        pattern: Motif glob des partitions sous `source` (récursif par défaut)
+        id_column: Identifiant des ventes pour le dédoublonnage (None: pas de dédoublonnage)
+        dtypes: Schéma explicite colonne -> dtype imposé à l'analyse de chaque partition
+        n_jobs: Processus joblib (-1: tous les cœurs)
+
+    Returns:
+        IngestReport
+    """
+    if _parquet_engine() is None:  # Vérifié avant l'analyse des partitions
+        raise ImportError("Moteur Parquet requis pour l'ingestion: pip install pyarrow")
+    if source is None or output_path is None:
+        section = load_config().get("data") or {}
+        if source is None:
+            source = section.get("external_data_path", EXTERNAL_DATA_PATH)
+        if output_path is None:
+            processed = Path(section.get("processed_data_path", PROCESSED_DATA_PATH))
+            output_path = processed / section.get("consolidated_file", CONSOLIDATED_FILE)
+    output_path = Path(output_path)
+
+    start = time.perf_counter()
+    partitions = discover_partitions(source, pattern)
+    if not partitions:
+        raise FileNotFoundError(f"Aucune partition {pattern} sous {source}")
+    logger.info(f"Ingestion de {len(partitions)} partitions depuis {source}")
+
+    # Une tâche par partition; joblib regroupe les petites tâches pour amortir les échanges entre processus
+    frames = Parallel(n_jobs=n_jobs)(delayed(_read_partition)(path, dtypes) for path in partitions)
+    rows_read = sum(len(frame) for frame in frames)
+    schema = unify_schemas(frames)
+    data = pd.concat([_conform(frame, schema) for frame in frames], ignore_index=True)
+    del frames
+
+    duplicates = 0
+    if id_column is not None:
+        if id_column not in data.columns:
+            raise KeyError(f"Colonne d'identifiant absente des partitions: {id_column}")
+        duplicated = data.duplicated(subset=[id_column], keep="last")  # Partition la plus récente conservée
+        duplicates = int(duplicated.sum())
+        if duplicates:
+            data = data.loc[~duplicated].reset_index(drop=True)
+
+    save_data(data, output_path.parent, output_path.name, format="parquet")
+
+    report = IngestReport(
+        path=output_path,
+        partitions=partitions,
+        rows_read=rows_read,
+        rows=len(data),
+        duplicates=duplicates,
+        schema={col: str(dtype) for col, dtype in data.dtypes.items()},
+        seconds=time.perf_counter() - start,
+    )
+    logger.info(
+        f"Ingestion terminée en {report.seconds:.2f}s: {report.rows} lignes ({duplicates} doublons retirés), "
+        f"{len(schema)} colonnes -> {output_path}"
+    )
+    return report
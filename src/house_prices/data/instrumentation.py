@@ -0,0 +1,237 @@
+"""
+Instrumentation des pipelines scikit-learn: temps, dimensions et mémoire par étape.
+
+Usage:
+    with profile_pipeline(pipeline) as profile:
+        pipeline.predict(X)
+    profile.summary()
+    profile.to_json("reports/profile.json")
+
+Hors du bloc `with`, le pipeline n'est pas modifié: aucun coût quand le profilage est désactivé.
+"""
+
+import json
+import logging
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.pipeline import Pipeline
+
+logger = logging.getLogger(__name__)
+
+PROFILED_METHODS = ("fit", "transform", "fit_transform", "predict")
+
+
+@dataclass
+class StageRecord:
+    """Mesure d'un appel fit / transform / fit_transform / predict sur une étape."""
+
+    step: str  # Nom hiérarchique, ex: "preprocessing.features"
+    method: str
+    seconds: float
+    rows: Optional[int]
+    columns: Optional[int]
+    output_bytes: Optional[int]  # Taille de la sortie (ou de l'entrée pour fit)
+    dtypes: Dict[str, int] = field(default_factory=dict)  # dtype -> nombre de colonnes
+    allocated_bytes: Optional[int] = None  # Pic d'allocation (track_memory=True uniquement)
+    depth: int = 0  # 0 = pipeline racine
+
+
+class PipelineProfile:
+    """Rapport structuré des mesures collectées par profile_pipeline."""
+
+    def __init__(self):
+        self.records: List[StageRecord] = []
+
+    def __len__(self):
+        return len(self.records)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Une ligne par appel mesuré."""
+        columns = list(StageRecord.__dataclass_fields__)
+        return pd.DataFrame([asdict(record) for record in self.records], columns=columns)
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Agrégat par (étape, méthode): nombre d'appels, temps total et moyen, part du temps
+        de la racine, pic d'allocation maximal.
+        """
+        frame = self.to_frame()
+        if frame.empty:
+            return frame
+        summary = frame.groupby(["step", "method"], sort=False).agg(
+            calls=("seconds", "size"),
+            total_seconds=("seconds", "sum"),
+            mean_seconds=("seconds", "mean"),
+            rows=("rows", "last"),
+            columns=("columns", "last"),
+            output_bytes=("output_bytes", "last"),
+            allocated_bytes=("allocated_bytes", "max"),
+            depth=("depth", "first"),
+        )
+        root_seconds = frame.loc[frame["depth"] == 0, "seconds"].sum()
+        summary["share"] = summary["total_seconds"] / root_seconds if root_seconds > 0 else np.nan
+        return summary.reset_index()
+
+    def slowest(self, n: int = 5) -> pd.DataFrame:
+        """Les n étapes feuilles les plus coûteuses (hors pipelines imbriqués)."""
+        summary = self.summary()
+        if summary.empty:
+            return summary
+        leaves = summary[~summary["step"].isin(self._container_steps())]
+        return leaves.nlargest(n, "total_seconds").reset_index(drop=True)
+
+    def to_dict(self) -> Dict:
+        return {"records": [asdict(record) for record in self.records]}
+
+    def to_json(self, path: Optional[str] = None, indent: int = 2) -> str:
+        """Sérialise le rapport en JSON; l'écrit aussi dans `path` si fourni."""
+        payload = json.dumps(self.to_dict(), indent=indent)
+        if path is not None:
+            output_file = Path(path)
+            output_file.parent.mkdir(parents=True, exist_ok=True)
+            output_file.write_text(payload)
+            logger.info(f"Profil du pipeline sauvegardé dans {path}")
+        return payload
+
+    def log(self):
+        """Affiche le résumé dans les logs."""
+        summary = self.summary()
+        if summary.empty:
+            logger.info("Profil du pipeline: aucune mesure")
+            return
+        logger.info("Profil du pipeline:\n" + summary.to_string(index=False))
+
+    def _container_steps(self):
+        steps = {record.step for record in self.records}
+        return {step for step in steps if any(other.startswith(step + ".") for other in steps)}
+
+
+def _describe_output(data):
+    """(lignes, colonnes, octets, dtypes) d'un DataFrame, d'un tableau ou d'une matrice creuse."""
+    if isinstance(data, pd.DataFrame):
+        dtypes = data.dtypes.astype(str).value_counts().to_dict()
+        return data.shape[0], data.shape[1], int(data.memory_usage(index=False, deep=False).sum()), dtypes
+    if isinstance(data, pd.Series):
+        return len(data), 1, int(data.memory_usage(index=False, deep=False)), {str(data.dtype): 1}
+    if sparse.issparse(data):
+        nbytes = data.data.nbytes + getattr(data, "indices", np.empty(0)).nbytes + getattr(data, "indptr", np.empty(0)).nbytes
+        return data.shape[0], data.shape[1], int(nbytes), {f"sparse[{data.dtype}]": data.shape[1]}
+    if isinstance(data, np.ndarray):
+        columns = data.shape[1] if data.ndim > 1 else 1
+        return data.shape[0], columns, int(data.nbytes), {str(data.dtype): columns}
+    return None, None, None, {}
+
+
+def _iter_steps(estimator, prefix, depth):
+    """(nom, estimateur, profondeur) pour le pipeline et ses sous-pipelines, récursivement."""
+    yield prefix, estimator, depth
+    if isinstance(estimator, Pipeline):
+        for name, step in estimator.steps:
+            if step is None or step == "passthrough":
+                continue
+            yield from _iter_steps(step, f"{prefix}.{name}" if depth > 0 else name, depth + 1)
+
+
+class _Recorder:
+    """Enregistre les appels et suit le pic d'allocation des appels imbriqués."""
+
+    def __init__(self, profile, track_memory):
+        self.profile = profile
+        self.track_memory = track_memory
+        self.active = set()  # id des estimateurs en cours d'appel (fit_transform -> fit + transform)
+        self.memory_frames = []
+
+    def wrap(self, estimator, method, step, depth):
+        original = getattr(estimator, method)
+
+        def profiled(X, *args, **kwargs):
+            # Appel interne (ex: fit depuis fit_transform): seul l'appel externe est mesuré
+            if id(estimator) in self.active:
+                return original(X, *args, **kwargs)
+
+            self.active.add(id(estimator))
+            frame = self._enter_memory() if self.track_memory else None
+            start = time.perf_counter()
+            try:
+                result = original(X, *args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                allocated = self._exit_memory(frame) if self.track_memory else None
+                self.active.discard(id(estimator))
+
+            rows, columns, nbytes, dtypes = _describe_output(X if method == "fit" else result)
+            self.profile.records.append(StageRecord(step, method, elapsed, rows, columns, nbytes, dtypes, allocated, depth))
+            return result
+
+        return profiled
+
+    def _enter_memory(self):
+        current, peak = tracemalloc.get_traced_memory()
+        for frame in self.memory_frames:
+            frame["peak"] = max(frame["peak"], peak)
+        tracemalloc.reset_peak()
+        frame = {"start": current, "peak": current}
+        self.memory_frames.append(frame)
+        return frame
+
+    def _exit_memory(self, frame):
+        _, peak = tracemalloc.get_traced_memory()
+        for other in self.memory_frames:
+            other["peak"] = max(other["peak"], peak)
+        self.memory_frames.remove(frame)
+        tracemalloc.reset_peak()
+        return frame["peak"] - frame["start"]
+
+
+@contextmanager
+def profile_pipeline(pipeline, track_memory: bool = False, profile: Optional[PipelineProfile] = None, name: str = "pipeline"):
+    """
+    Profile chaque étape d'un pipeline (et de ses sous-pipelines) pendant le bloc `with`.
+
+    Les méthodes fit / transform / fit_transform / predict de chaque étape sont
+    temporairement enveloppées sur l'instance, puis restaurées à la sortie du bloc.
+    Seuls les Pipeline imbriqués sont parcourus: le ColumnTransformer final est
+    mesuré comme une seule étape.
+
+    Args:
+        pipeline: Pipeline scikit-learn (ex: create_full_pipeline() ou le pipeline entraîné complet)
+        track_memory: Mesure aussi le pic d'allocation par étape avec tracemalloc (plus lent)
+        profile: Rapport existant à compléter (pour cumuler plusieurs blocs)
+        name: Nom de la racine dans le rapport
+
+    Yields:
+        PipelineProfile rempli au fur et à mesure des appels
+
+    Note:
+        Ne pas sérialiser le pipeline (joblib.dump) à l'intérieur du bloc.
+    """
+    profile = profile if profile is not None else PipelineProfile()
+    recorder = _Recorder(profile, track_memory)
+
+    started_tracing = False
+    if track_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        started_tracing = True
+
+    patched = []
+    try:
+        for step, estimator, depth in _iter_steps(pipeline, name, 0):
+            for method in PROFILED_METHODS:
+                if method in vars(estimator) or not hasattr(estimator, method):
+                    continue
+                setattr(estimator, method, recorder.wrap(estimator, method, step, depth))
+                patched.append((estimator, method))
+        yield profile
+    finally:
+        for estimator, method in patched:
+            vars(estimator).pop(method, None)
+        if started_tracing:
+            tracemalloc.stop()
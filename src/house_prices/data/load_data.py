@@ -1,10 +1,31 @@
 """
 Module de chargement des données pour le projet House Prices.
+
+Les CSV sont relus depuis un cache Parquet compressé écrit à côté du fichier source
+(`train.csv` -> `train.csv.parquet` et ses métadonnées `train.csv.parquet.json`): le
+premier chargement analyse le texte et enregistre toutes les colonnes avec les dtypes
+inférés par pd.read_csv (sauf les dtypes non numériques demandés, appliqués à l'analyse et
+enregistrés dans les métadonnées), les suivants sont des lectures colonnaires des seules
+colonnes demandées. Le cache est invalidé quand le CSV change: taille, puis date de modification,
+puis empreinte blake2b du contenu (un CSV touché mais identique ne réécrit pas le cache).
+Sans moteur Parquet (pyarrow ou fastparquet), le CSV est lu directement.
+
+iter_data lit un ou plusieurs CSV par morceaux typés (mémoire bornée), avec projection
+de colonnes et filtre de lignes appliqués à chaque morceau.
+
+save_data écrit en CSV, Parquet ou Feather compressés, éventuellement partitionné par
+colonnes, par un fichier temporaire renommé à la fin.
 """
 
+import hashlib
+import importlib.util
+import json
 import logging
+import os
+import shutil
+import time
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -14,9 +35,26 @@ import yaml
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Cache colonnaire des CSV (voir read_csv_cached)
+CACHE_SUFFIX = ".parquet"
+_CACHE_META_SUFFIX = ".parquet.json"
+_CACHE_VERSION = 2
+_CACHE_COMPRESSION = {"pyarrow": "zstd", "fastparquet": "snappy"}
+_HASH_BLOCK_BYTES = 1 << 20
+
+# Formats de save_data
+SAVE_FORMATS = ("csv", "parquet", "feather")
+_SAVE_SUFFIXES = {".csv": "csv", ".parquet": "parquet", ".pq": "parquet", ".feather": "feather", ".arrow": "feather"}
+
 
 def load_data(
-    data_path: str, train_file: str = "train.csv", test_file: Optional[str] = None
+    data_path: str,
+    train_file: str = "train.csv",
+    test_file: Optional[str] = None,
+    categorical: bool = False,
+    columns: Optional[Sequence[str]] = None,
+    dtypes: Optional[Mapping[str, Any]] = None,
+    cache: bool = True,
 ) -> Tuple[pd.DataFrame, Optional[pd.DataFrame]]:
     """
     Charge les données d'entraînement et de test.
@@ -25,6 +63,14 @@ def load_data(
         data_path: Chemin vers le dossier contenant les données
         train_file: Nom du fichier d'entraînement
         test_file: Nom du fichier de test (optionnel)
+        categorical: Colonnes de chaînes converties en pandas Categorical (une fois par
+            fichier): mémoire réduite, et le pipeline create_full_pipeline(categorical=True)
+            les recode par leurs seules catégories au lieu de hacher chaque valeur
+        columns: Colonnes lues (toutes par défaut); celles absentes d'un fichier sont
+            ignorées (ex: SalePrice dans test.csv)
+        dtypes: Schéma explicite colonne -> dtype (ex: {"MSSubClass": "category", "LotArea": "float64"}),
+            prioritaire sur les dtypes inférés et sur `categorical`
+        cache: Lecture et écriture du cache Parquet à côté des CSV (voir read_csv_cached)
 
     Returns:
         Tuple contenant les DataFrames d'entraînement et de test
@@ -34,7 +80,7 @@ def load_data(
     try:
         # Chargement des données d'entraînement
         train_path = data_dir / train_file
-        train_df = pd.read_csv(train_path)
+        train_df = read_csv_cached(train_path, columns, dtypes, categorical, cache)
         logger.info(f"Données d'entraînement chargées: {train_df.shape}")
 
         # Chargement des données de test si disponible
@@ -42,7 +88,7 @@ def load_data(
         if test_file:
             test_path = data_dir / test_file
             if test_path.exists():
-                test_df = pd.read_csv(test_path)
+                test_df = read_csv_cached(test_path, columns, dtypes, categorical, cache)
                 logger.info(f"Données de test chargées: {test_df.shape}")
 
         return train_df, test_df
@@ -55,6 +101,240 @@ def load_data(
         raise
 
 
+def read_csv_cached(
+    path: Any,
+    columns: Optional[Sequence[str]] = None,
+    dtypes: Optional[Mapping[str, Any]] = None,
+    categorical: bool = False,
+    cache: bool = True,
+) -> pd.DataFrame:
+    """
+    Lit un CSV, depuis son cache Parquet s'il est à jour (sinon le CSV est analysé et le cache réécrit).
+
+    Args:
+        path: Fichier CSV
+        columns: Colonnes lues, dans cet ordre (toutes par défaut; absentes du fichier ignorées)
+        dtypes: Schéma explicite colonne -> dtype, appliqué aux colonnes lues; les dtypes non
+            numériques (str, category...) sont appliqués à l'analyse du texte ("00501" reste
+            "00501") et font partie de la clé du cache
+        categorical: Colonnes de chaînes restantes converties en pandas Categorical
+        cache: Utiliser le cache Parquet (False: lecture directe du CSV)
+
+    Returns:
+        DataFrame identique à pd.read_csv(path, usecols=columns, dtype=dtypes), colonnes dans l'ordre de `columns`
+    """
+    path = Path(path)
+    engine = _parquet_engine() if cache else None
+    parse_dtypes = _parse_dtypes(dtypes)
+    df = _read_cache(path, columns, engine, parse_dtypes) if engine is not None else None
+    if df is None and engine is not None:
+        # Cache complet: toutes les colonnes, dtypes inférés sauf ceux à fixer dès l'analyse du texte
+        stamp = _file_stamp(path)  # Avant l'analyse: un CSV remplacé pendant la lecture n'est pas mis en cache
+        df = pd.read_csv(path, dtype=_present(parse_dtypes, _csv_header(path)) or None)
+        _write_cache(path, df, engine, parse_dtypes, stamp)
+        if columns is not None:
+            df = df[[col for col in columns if col in df.columns]]
+    elif df is None:
+        usecols = None if columns is None else [col for col in columns if col in _csv_header(path)]
+        df = pd.read_csv(path, usecols=usecols, dtype=_present(dtypes, usecols))
+        if usecols is not None:
+            df = df[usecols]  # Ordre demandé (usecols suit l'ordre du fichier)
+    return _apply_schema(df, dtypes, categorical)
+
+
+def iter_data(
+    paths: Union[str, Path, Sequence[Union[str, Path]]],
+    chunksize: int = 100_000,
+    columns: Optional[Sequence[str]] = None,
+    dtypes: Optional[Mapping[str, Any]] = None,
+    categorical: bool = False,
+    row_filter: Optional[Callable[[pd.DataFrame], Any]] = None,
+    filter_columns: Sequence[str] = (),
+) -> Iterator[pd.DataFrame]:
+    """
+    Lit des CSV par morceaux de `chunksize` lignes, à mémoire bornée.
+
+    Une colonne lue comme chaînes dans un morceau l'est dans tous les suivants (un morceau où
+    elle ne contient que des NA ne devient pas float64); les colonnes numériques suivent la
+    règle de pd.read_csv (int64, float64 en présence de NA). Une colonne entièrement NA dans
+    les premiers morceaux y reste float64: `dtypes` fixe le type de toute colonne (ex: str, ou
+    pd.CategoricalDtype(...) pour des catégories identiques d'un morceau à l'autre).
+    Les morceaux vides après filtrage ne sont pas produits.
+
+    Args:
+        paths: Fichier CSV, dossier (ses *.csv, par ordre alphabétique) ou liste de fichiers
+        chunksize: Nombre de lignes lues par morceau
+        columns: Colonnes produites, dans cet ordre (absentes d'un fichier ignorées)
+        dtypes: Schéma explicite colonne -> dtype
+        categorical: Colonnes de chaînes converties en Categorical (catégories propres à chaque morceau)
+        row_filter: Fonction morceau -> masque booléen des lignes conservées
+        filter_columns: Colonnes lues pour row_filter seulement (retirées ensuite si absentes de `columns`)
+
+    Yields:
+        DataFrames typés, index continu d'un morceau à l'autre au sein d'un fichier
+    """
+    schema = dict(dtypes or {})
+    for path in _csv_files(paths):
+        header = _csv_header(path)
+        wanted = header if columns is None else [col for col in columns if col in header]
+        usecols = list(dict.fromkeys(wanted + [col for col in filter_columns if col in header]))
+        reader = pd.read_csv(path, usecols=usecols, dtype=_present(schema, usecols), chunksize=chunksize)
+        with reader:
+            for chunk in reader:
+                for col, dtype in chunk.dtypes.items():
+                    if col not in schema and _is_string_dtype(dtype) and chunk[col].notna().any():
+                        schema[col] = dtype  # Fixé pour les morceaux et fichiers suivants
+                drifted = {col: schema[col] for col, dtype in chunk.dtypes.items() if col in schema and dtype != schema[col]}
+                if drifted:  # Colonnes de chaînes entièrement NA dans ce morceau
+                    chunk = chunk.astype(drifted)
+                if row_filter is not None:
+                    chunk = chunk[np.asarray(row_filter(chunk), dtype=bool)]
+                    if chunk.empty:
+                        continue
+                yield _apply_schema(chunk[wanted], dtypes, categorical)
+
+
+def _csv_files(paths: Union[str, Path, Sequence[Union[str, Path]]]) -> list:
+    if isinstance(paths, (str, Path)):
+        paths = [paths]
+    files = []
+    for path in map(Path, paths):
+        files.extend(sorted(path.glob("*.csv")) if path.is_dir() else [path])
+    return files
+
+
+def _is_string_dtype(dtype: Any) -> bool:
+    return pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype)
+
+
+def _apply_schema(df: pd.DataFrame, dtypes: Optional[Mapping[str, Any]], categorical: bool) -> pd.DataFrame:
+    """Schéma explicite, puis colonnes de chaînes restantes en Categorical si `categorical`."""
+    dtypes = _present(dtypes, df.columns)
+    if dtypes:
+        df = df.astype(dtypes)
+    if categorical:
+        strings = [col for col in df.select_dtypes(include=["object", "string"]).columns if col not in (dtypes or {})]
+        df[strings] = df[strings].astype("category")
+    return df
+
+
+def _present(dtypes: Optional[Mapping[str, Any]], columns: Optional[Sequence[str]]) -> Optional[Dict[str, Any]]:
+    if dtypes is None or columns is None:
+        return dict(dtypes) if dtypes is not None else None
+    return {col: dtype for col, dtype in dtypes.items() if col in set(columns)}
+
+
+def _csv_header(path: Path) -> list:
+    return pd.read_csv(path, nrows=0).columns.tolist()
+
+
+def _parquet_engine() -> Optional[str]:
+    """Moteur Parquet installé (dépendance optionnelle), ou None."""
+    for engine in ("pyarrow", "fastparquet"):
+        if importlib.util.find_spec(engine) is not None:
+            return engine
+    return None
+
+
+def _parse_dtypes(dtypes: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+    """dtypes à appliquer à l'analyse du CSV: un cast après coup ne rendrait pas le texte d'origine."""
+    return {
+        col: dtype
+        for col, dtype in (dtypes or {}).items()
+        if not pd.api.types.is_numeric_dtype(pd.api.types.pandas_dtype(dtype))
+    }
+
+
+def _dtypes_key(dtypes: Mapping[str, Any]) -> Dict[str, str]:
+    return {str(col): str(pd.api.types.pandas_dtype(dtype)) for col, dtype in dtypes.items()}
+
+
+def _cache_paths(path: Path) -> Tuple[Path, Path]:
+    return path.with_name(path.name + CACHE_SUFFIX), path.with_name(path.name + _CACHE_META_SUFFIX)
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _file_stamp(path: Path) -> Dict[str, Any]:
+    """Taille, date de modification et empreinte du contenu d'un fichier."""
+    stat = path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "blake2b": _file_digest(path)}
+
+
+def _unchanged(path: Path, stamp: Mapping[str, Any]) -> bool:
+    """Le fichier correspond-il toujours à `stamp` (contenu comparé seulement si la date a changé)?"""
+    try:
+        stat = path.stat()
+    except OSError:
+        return False
+    if stat.st_size != stamp["size"]:
+        return False
+    return stat.st_mtime_ns == stamp["mtime_ns"] or _file_digest(path) == stamp["blake2b"]
+
+
+def _read_cache(
+    path: Path, columns: Optional[Sequence[str]], engine: str, parse_dtypes: Mapping[str, Any]
+) -> Optional[pd.DataFrame]:
+    """Colonnes demandées lues dans le cache s'il correspond au CSV et aux dtypes d'analyse, sinon None."""
+    cache_file, meta_file = _cache_paths(path)
+    stat = path.stat()  # FileNotFoundError si le CSV est absent, même avec un cache
+    try:
+        meta = json.loads(meta_file.read_text())
+        if meta.get("version") != _CACHE_VERSION or meta.get("pandas") != pd.__version__ or meta["size"] != stat.st_size:
+            return None
+        if meta.get("dtypes") != _dtypes_key(parse_dtypes):
+            return None  # Cache analysé avec un autre schéma: réécrit
+        if meta["mtime_ns"] != stat.st_mtime_ns:
+            if meta["blake2b"] != _file_digest(path):
+                return None
+            meta["mtime_ns"] = stat.st_mtime_ns  # CSV touché mais identique: cache conservé
+            meta_file.write_text(json.dumps(meta))
+        selected = None if columns is None else [col for col in columns if col in meta["columns"]]
+        df = pd.read_parquet(cache_file, columns=selected, engine=engine)
+    except (OSError, ValueError, KeyError) as e:
+        logger.debug(f"Cache {cache_file} inutilisable ({e})")
+        return None
+    logger.debug(f"Données relues depuis le cache {cache_file}")
+    return df
+
+
+def _write_cache(path: Path, df: pd.DataFrame, engine: str, parse_dtypes: Mapping[str, Any], stamp: Mapping[str, Any]) -> None:
+    """
+    Écrit le cache (fichier temporaire renommé à la fin); un échec n'empêche pas le chargement.
+
+    `stamp` est l'état du CSV relevé avant son analyse: si le fichier a changé depuis, `df`
+    ne correspond plus à son contenu et le cache n'est pas écrit.
+    """
+    cache_file, meta_file = _cache_paths(path)
+    tmp = cache_file.with_name(f".{cache_file.name}.{os.getpid()}.tmp")
+    try:
+        df.to_parquet(tmp, engine=engine, compression=_CACHE_COMPRESSION[engine], index=False)
+        meta = {
+            "version": _CACHE_VERSION,
+            "pandas": pd.__version__,
+            **stamp,
+            "columns": df.columns.tolist(),
+            "dtypes": _dtypes_key(parse_dtypes),
+        }
+        if not _unchanged(path, stamp):
+            logger.warning(f"Cache Parquet non écrit pour {path}: fichier modifié pendant sa lecture")
+            tmp.unlink(missing_ok=True)
+            return
+        meta_file.unlink(missing_ok=True)  # Pas de métadonnées valides pendant le remplacement du cache
+        os.replace(tmp, cache_file)
+        meta_file.write_text(json.dumps(meta))
+        logger.info(f"Cache Parquet écrit: {cache_file}")
+    except Exception as e:  # Droits, disque plein, types non sérialisables
+        logger.warning(f"Cache Parquet non écrit pour {path} ({e})")
+        tmp.unlink(missing_ok=True)
+
+
 def load_config(config_path: str = "config.yaml") -> Dict[str, Any]:
     """
     Charge le fichier de configuration.
@@ -80,7 +360,7 @@ def load_config(config_path: str = "config.yaml") -> Dict[str, Any]:
 
 def display_data_info(df: pd.DataFrame, name: str = "Dataset") -> None:
     """
-    Affiche des informations de base sur le dataset.
+    Affiche des informations de base sur le dataset (profil complet: profiling.profile_data).
 
     Args:
         df: DataFrame à analyser
@@ -92,17 +372,16 @@ def display_data_info(df: pd.DataFrame, name: str = "Dataset") -> None:
     print(f"\nTypes de données:")
     print(df.dtypes.value_counts())
     print(f"\nValeurs manquantes:")
-    missing_values = df.isnull().sum()
-    missing_pct = (missing_values / len(df)) * 100
-    missing_df = pd.DataFrame({"Missing Count": missing_values, "Missing Percentage": missing_pct}).sort_values(
-        "Missing Percentage", ascending=False
-    )
+    missing_values = df.isna().sum()  # Un seul balayage; le pourcentage en découle
+    missing_df = pd.DataFrame(
+        {"Missing Count": missing_values, "Missing Percentage": missing_values / len(df) * 100}
+    ).sort_values("Missing Percentage", ascending=False)
     print(missing_df[missing_df["Missing Count"] > 0])
 
 
 def get_target_distribution(df: pd.DataFrame, target_col: str = "SalePrice") -> Dict[str, Any]:
     """
-    Calcule les statistiques de distribution de la variable cible.
+    Calcule les statistiques de distribution de la variable cible, en une lecture (DatasetProfile).
 
     Args:
         df: DataFrame contenant les données
@@ -111,41 +390,133 @@ def get_target_distribution(df: pd.DataFrame, target_col: str = "SalePrice") ->
     Returns:
         Dictionnaire avec les statistiques de distribution
     """
+    from .profiling import profile_data
+
     if target_col not in df.columns:
         raise ValueError(f"Colonne cible '{target_col}' non trouvée dans le dataset")
 
-    target = df[target_col]
-
-    stats = {
-        "mean": target.mean(),
-        "median": target.median(),
-        "std": target.std(),
-        "min": target.min(),
-        "max": target.max(),
-        "q25": target.quantile(0.25),
-        "q75": target.quantile(0.75),
-        "skewness": target.skew(),
-        "kurtosis": target.kurtosis(),
-    }
-
-    return stats
-
+    stats = profile_data(df[[target_col]]).column_stats(target_col)
+    return {key: stats[key] for key in ("mean", "median", "std", "min", "max", "q25", "q75", "skewness", "kurtosis")}
+
+
+def _save_format(filename: str, format: Optional[str]) -> str:
+    if format is not None:
+        fmt = format.lower()
+    else:
+        suffixes = [suffix.lower() for suffix in Path(filename).suffixes]
+        fmt = next((_SAVE_SUFFIXES[suffix] for suffix in reversed(suffixes) if suffix in _SAVE_SUFFIXES), "csv")
+    if fmt not in SAVE_FORMATS:
+        raise ValueError(f"Format de sauvegarde non supporté pour {filename}: {format} (formats: {', '.join(SAVE_FORMATS)})")
+    return fmt
+
+
+def _write(
+    df: pd.DataFrame, path: Path, fmt: str, compression: Optional[str], partition_cols: Optional[Sequence[str]]
+) -> None:
+    if fmt == "csv":
+        df.to_csv(path, index=False, compression=None if compression == "none" else compression or "infer")
+        return
+    engine = _parquet_engine() if fmt == "parquet" else importlib.util.find_spec("pyarrow") and "pyarrow"
+    if not engine:
+        raise ImportError(f"Format {fmt} indisponible sans moteur colonnaire: pip install pyarrow")
+    codec = (compression or _CACHE_COMPRESSION[engine]) if compression != "none" else None
+    if fmt == "feather":
+        df.reset_index(drop=True).to_feather(path, compression=codec or "uncompressed")
+    else:
+        df.to_parquet(path, engine=engine, compression=codec, index=False, partition_cols=partition_cols)
+
+
+def _publish_directory(version: Path, full_path: Path) -> None:
+    """
+    Publie le dossier `version` sous `full_path`, un lien symbolique remplacé atomiquement:
+    un lecteur suit l'ancien lien ou le nouveau, jamais un chemin absent. L'ancienne version
+    est supprimée ensuite (une lecture en cours de l'ancienne version peut alors échouer).
 
-def save_data(df: pd.DataFrame, output_path: str, filename: str) -> None:
+    Restent non atomiques, avec restauration de l'ancien contenu en cas d'échec: le premier
+    remplacement d'un dossier (ou fichier) réel, et les systèmes sans liens symboliques.
+    """
+    previous = full_path.parent / os.readlink(full_path) if full_path.is_symlink() else None
+    aside = None
+    if previous is None and full_path.exists():
+        aside = full_path.with_name(f".old-{os.getpid()}-{full_path.name}")
+        os.replace(full_path, aside)
+    link = full_path.with_name(f".link-{os.getpid()}-{full_path.name}")
+    try:
+        try:
+            os.symlink(version.name, link, target_is_directory=True)
+        except (OSError, NotImplementedError):  # Liens symboliques indisponibles (ex: Windows sans droits)
+            os.replace(version, full_path)
+        else:
+            os.replace(link, full_path)
+    except BaseException:
+        link.unlink(missing_ok=True)
+        if aside is not None and not full_path.exists():
+            os.replace(aside, full_path)
+        raise
+    for old in (previous, aside):
+        if old is not None and old.is_dir():
+            shutil.rmtree(old, ignore_errors=True)
+        elif old is not None:
+            old.unlink(missing_ok=True)
+
+
+def save_data(
+    df: pd.DataFrame,
+    output_path: Union[str, Path],
+    filename: str,
+    format: Optional[str] = None,
+    compression: Optional[str] = None,
+    partition_cols: Optional[Sequence[str]] = None,
+) -> Path:
     """
-    Sauvegarde un DataFrame au format CSV.
+    Sauvegarde un DataFrame (CSV, Parquet ou Feather), de façon atomique.
+
+    Le fichier est écrit sous un nom temporaire du même dossier puis renommé: un lecteur
+    voit l'ancienne version ou la nouvelle complète, jamais un fichier tronqué. Avec
+    `partition_cols`, le résultat est un dossier Parquet partitionné (`YrSold=2008/...`)
+    écrit dans un dossier versionné caché (`.sales.v<horodatage>`) puis publié par un lien
+    symbolique `sales` remplacé atomiquement (voir _publish_directory); un lecteur ne charge
+    que les partitions utiles: pd.read_parquet(path, filters=[("YrSold", "==", 2008)]).
 
     Args:
         df: DataFrame à sauvegarder
         output_path: Chemin de sortie
-        filename: Nom du fichier
+        filename: Nom du fichier (ou du dossier partitionné)
+        format: "csv", "parquet" ou "feather" (défaut: déduit de l'extension, ex: .parquet, .feather;
+            CSV pour toute autre extension ou sans extension)
+        compression: Codec (Parquet: zstd, snappy, gzip, brotli, lz4; Feather: zstd, lz4; CSV: gzip, zstd...);
+            défaut: zstd en colonnaire, déduit de l'extension en CSV; "none" pour ne pas compresser
+        partition_cols: Colonnes de partitionnement (Parquet uniquement)
+
+    Returns:
+        Chemin écrit
     """
+    fmt = _save_format(filename, format)
+    if partition_cols and fmt != "parquet":
+        raise ValueError("Le partitionnement n'est disponible qu'en Parquet")
+
     output_dir = Path(output_path)
     output_dir.mkdir(parents=True, exist_ok=True)
-
     full_path = output_dir / filename
-    df.to_csv(full_path, index=False)
+    if partition_cols:
+        tmp = output_dir / f".{filename}.v{time.time_ns()}-{os.getpid()}"
+    else:
+        tmp = output_dir / f".tmp-{os.getpid()}-{filename}"  # Même extension: codec CSV déduit comme pour le nom final
+
+    try:
+        _write(df, tmp, fmt, compression, partition_cols)
+        if partition_cols:
+            _publish_directory(tmp, full_path)
+        else:
+            os.replace(tmp, full_path)
+    except BaseException:
+        if tmp.is_dir():
+            shutil.rmtree(tmp, ignore_errors=True)
+        else:
+            tmp.unlink(missing_ok=True)
+        raise
     logger.info(f"Données sauvegardées: {full_path}")
+    return full_path
 
 
 if __name__ == "__main__":
@@ -0,0 +1,67 @@
+"""
+Moments fusionnables de colonnes numériques (formules de Chan / Pébay).
+
+Un accumulateur est un tableau (7, colonnes): effectif, moyenne, moments centrés
+d'ordre 2 à 4, minimum et maximum, NaN ignorés. chunk_moments le calcule sur un
+morceau de lignes, merge_moments fusionne deux accumulateurs (exact à l'arrondi près):
+SkewnessCorrector et DatasetProfile s'en servent pour traiter un jeu morceau par morceau.
+"""
+
+import numpy as np
+
+# Lignes d'un accumulateur
+N, MEAN, M2, M3, M4, MIN, MAX = range(7)
+
+
+def empty_moments(n_columns: int) -> np.ndarray:
+    """Accumulateur de colonnes sans valeur (élément neutre de merge_moments)."""
+    return chunk_moments(np.empty((0, n_columns)))
+
+
+def chunk_moments(values: np.ndarray) -> np.ndarray:
+    """Moments d'un morceau (lignes x colonnes, NaN ignorés)."""
+    total = values.sum(axis=0)
+    if np.isfinite(total).all():
+        # Cas courant après imputation: aucun NaN, pas de masque
+        n = np.full(values.shape[1], float(len(values)))
+        mean = total / n if len(values) else total
+        centered = values - mean
+    else:
+        observed = ~np.isnan(values)
+        n = observed.sum(axis=0).astype(np.float64)
+        centered = np.where(observed, values, 0.0)
+        mean = np.divide(centered.sum(axis=0), n, out=np.zeros_like(n), where=n > 0)
+        centered -= mean
+        centered[~observed] = 0.0
+    power = centered * centered
+    m2 = power.sum(axis=0)
+    m3 = (power * centered).sum(axis=0)
+    power *= power
+    m4 = power.sum(axis=0)
+    minimum = np.fmin.reduce(values, axis=0, initial=np.inf)
+    maximum = np.fmax.reduce(values, axis=0, initial=-np.inf)
+    return np.stack([n, mean, m2, m3, m4, minimum, maximum])
+
+
+def merge_moments(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Fusionne deux accumulateurs colonne par colonne (un côté vide laisse l'autre inchangé)."""
+    na, nb = a[N], b[N]
+    n = na + nb
+    wa = np.divide(na, n, out=np.zeros_like(n), where=n > 0)
+    wb = np.divide(nb, n, out=np.zeros_like(n), where=n > 0)
+    delta = b[MEAN] - a[MEAN]
+    merged = np.empty_like(a)
+    merged[N] = n
+    merged[MEAN] = a[MEAN] + delta * wb
+    merged[M2] = a[M2] + b[M2] + delta**2 * na * wb
+    merged[M3] = a[M3] + b[M3] + delta**3 * na * wb * (wa - wb) + 3 * delta * (wa * b[M2] - wb * a[M2])
+    merged[M4] = (
+        a[M4]
+        + b[M4]
+        + delta**4 * na * wb * (wa**2 - wa * wb + wb**2)
+        + 6 * delta**2 * (wa**2 * b[M2] + wb**2 * a[M2])
+        + 4 * delta * (wa * b[M3] - wb * a[M3])
+    )
+    merged[MIN] = np.fmin(a[MIN], b[MIN])
+    merged[MAX] = np.fmax(a[MAX], b[MAX])
+    return merged
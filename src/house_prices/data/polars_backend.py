@@ -0,0 +1,516 @@
+"""
+Backend Polars des transformers de prétraitement.
+
+Les étapes pandas d'un pipeline (CategoricalCaster, MissingValuesHandler,
+AnomalyCorrector, FeatureEngineer, OrdinalEncoderCustom, SkewnessCorrector,
+NumericCaster) sont traduites, avec leurs paramètres entraînés, en une seule
+requête Polars paresseuse: l'optimiseur de Polars l'exécute en parallèle sur
+tous les cœurs. Le résultat est converti en DataFrame pandas identique à celui
+des étapes pandas (à un ulp près pour log1p, calculé par Polars), puis passé aux
+étapes suivantes (DataQualityMonitor, ColumnTransformer, modèle) inchangées.
+
+Polars est une dépendance optionnelle: ce module s'importe sans elle, PolarsPipeline
+lève ImportError à l'utilisation.
+
+Usage:
+    backend = PolarsPipeline(pipeline)  # pipeline entraîné (pandas ou fit_out_of_core)
+    y_pred = backend.predict(backend.scan_csv("historique.csv"))
+"""
+
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.pipeline import Pipeline
+
+from .features import FeatureExpressions
+from .preprocessing import (
+    UNKNOWN_CATEGORY,
+    AnomalyCorrector,
+    CategoricalCaster,
+    DebugTransformer,
+    FeatureEngineer,
+    FeatureSelector,
+    MissingValuesHandler,
+    NumericCaster,
+    OrdinalEncoderCustom,
+    SkewnessCorrector,
+)
+
+try:
+    import polars as pl
+except ImportError:  # Dépendance optionnelle
+    pl = None
+
+logger = logging.getLogger(__name__)
+
+# Chaînes lues comme NA par pd.read_csv (valeurs par défaut de na_values)
+CSV_NA_VALUES = [
+    "",
+    "#N/A",
+    "#N/A N/A",
+    "#NA",
+    "-1.#IND",
+    "-1.#QNAN",
+    "-NaN",
+    "-nan",
+    "1.#IND",
+    "1.#QNAN",
+    "<NA>",
+    "N/A",
+    "NA",
+    "NULL",
+    "NaN",
+    "None",
+    "n/a",
+    "nan",
+    "null",
+]
+
+# Lignes lues pour inférer les types d'un CSV quand le pipeline n'est pas encore entraîné
+_INFER_SCHEMA_ROWS = 10_000
+
+# dtype des chaînes lues par pd.read_csv (str avec pandas >= 3, object avant)
+_STRING_DTYPE = pd.Series(["a"]).dtype
+
+# Étapes entraînées sur le seul schéma: pas de collecte des données au fit
+_SCHEMA_ONLY_STEPS = (AnomalyCorrector, FeatureEngineer, NumericCaster, DebugTransformer)
+
+
+def _require_polars():
+    if pl is None:
+        raise ImportError("Le backend Polars nécessite le paquet optionnel polars (pip install polars)")
+
+
+# ============================================================
+# CONVERSIONS PANDAS <-> POLARS
+# ============================================================
+
+
+def _to_lazy(X: Any) -> "pl.LazyFrame":
+    """DataFrame pandas (NaN -> null, chaînes et catégories -> String) ou Polars -> LazyFrame."""
+    if isinstance(X, pl.LazyFrame):
+        return X
+    if isinstance(X, pl.DataFrame):
+        return X.lazy()
+    columns = []
+    for col in X.columns:
+        series, dtype = X[col], X[col].dtype
+        if isinstance(dtype, np.dtype) and dtype.kind in "iub":
+            columns.append(pl.Series(col, series.to_numpy()))
+        elif isinstance(dtype, np.dtype) and dtype.kind == "f":
+            columns.append(pl.Series(col, series.to_numpy(), nan_to_null=True))
+        elif pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+            # Dtypes pandas nullables (Int64, Float64...): float64, comme _column_values
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            columns.append(pl.Series(col, values, nan_to_null=True))
+        elif isinstance(dtype, pd.CategoricalDtype):
+            # Catégories converties une fois, puis indexées par les codes (-1 -> null)
+            codes = pl.Series(col, series.array.codes, dtype=pl.Int64)
+            categories = pl.Series(col, [str(category) for category in dtype.categories], dtype=pl.String)
+            columns.append(categories.gather(pl.select(pl.when(codes >= 0).then(codes)).to_series()))
+        else:
+            values = series.to_numpy(dtype=object, na_value=None).tolist()
+            columns.append(pl.Series(col, values, dtype=pl.String, strict=False))
+    return pl.DataFrame(columns).lazy()
+
+
+def _to_pandas(frame: "pl.DataFrame", categorical: Dict[str, Any], index: Optional[pd.Index] = None) -> pd.DataFrame:
+    """
+    DataFrame Polars -> pandas avec les dtypes des étapes pandas: null -> NaN, chaînes
+    dans le dtype par défaut de pandas, ou Categorical (`categorical`: colonne -> dtype).
+    """
+    index = index if index is not None else pd.RangeIndex(frame.height)
+    columns = {}
+    for series in frame.iter_columns():
+        dtype = categorical.get(series.name)
+        if series.dtype != pl.String:
+            values = series.to_numpy()
+        elif dtype is not None:
+            # Codes calculés par Polars: aucune chaîne Python créée
+            positions = pl.Series(range(len(dtype.categories)), dtype=pl.Int64)
+            codes = series.replace_strict(list(dtype.categories), positions, default=-1).fill_null(-1)
+            values = pd.Categorical.from_codes(codes.to_numpy(), dtype=dtype)
+        else:
+            values = series.to_numpy()
+            if _STRING_DTYPE == object:
+                values[pd.isna(values)] = np.nan  # NA des colonnes objet lues par pd.read_csv
+            values = pd.array(values, dtype=_STRING_DTYPE)
+        columns[series.name] = pd.Series(values, index=index, copy=False)
+    return pd.DataFrame(columns, index=index)
+
+
+def _pandas_dtypes(schema: "pl.Schema") -> pd.Series:
+    """Schéma Polars -> Series colonne -> dtype NumPy équivalent (pour les _resolve des étapes)."""
+    dtypes = {}
+    for col, dtype in schema.items():
+        if dtype.is_float():
+            dtypes[col] = np.dtype(np.float32 if dtype == pl.Float32 else np.float64)
+        elif dtype.is_integer():
+            dtypes[col] = np.dtype(np.int64)
+        elif dtype == pl.Boolean:
+            dtypes[col] = np.dtype(bool)
+        else:
+            dtypes[col] = np.dtype(object)
+    return pd.Series(dtypes, dtype=object)
+
+
+def _polars_dtype(dtype: Any) -> "pl.DataType":
+    """dtype pandas -> dtype Polars de lecture (chaînes et catégories -> String)."""
+    if pd.api.types.is_bool_dtype(dtype):
+        return pl.Boolean
+    if pd.api.types.is_integer_dtype(dtype):
+        return pl.Int64
+    if pd.api.types.is_float_dtype(dtype):
+        return pl.Float32 if dtype == np.float32 else pl.Float64
+    return pl.String
+
+
+def _literal(value: Any) -> Any:
+    """Scalaire NumPy -> scalaire Python (littéraux Polars)."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+# ============================================================
+# TRADUCTION DES ÉTAPES
+# ============================================================
+
+# Traduction d'une étape: (expressions de with_columns, colonnes supprimées ensuite).
+# Les traductions enregistrent dans `categorical` le dtype pandas des colonnes texte produites.
+_Operations = Tuple[List[Any], List[str]]
+
+
+def _categorical_caster(step: CategoricalCaster, dtypes: pd.Series, categorical: Dict[str, Any]) -> _Operations:
+    """Modalités hors vocabulaire -> UNKNOWN_CATEGORY; NA conservés."""
+    exprs = []
+    for col in step._resolve(dtypes):
+        dtype = step.categories_[col]
+        value = pl.col(col).cast(pl.String)
+        known = value.is_in([str(category) for category in dtype.categories[:-1]])
+        exprs.append(pl.when(known | value.is_null()).then(value).otherwise(pl.lit(UNKNOWN_CATEGORY)).alias(col))
+        categorical[col] = dtype
+    return exprs, []
+
+
+def _missing_values(step: MissingValuesHandler, dtypes: pd.Series, categorical: Dict[str, Any]) -> _Operations:
+    """Imputation None / 0, regroupement des quartiers, LotFrontage par quartier, puis modes."""
+    fill_values, has_neighborhood = step._resolve(dtypes)
+    exprs: Dict[str, "pl.Expr"] = {}
+
+    def current(col):
+        return exprs.get(col, pl.col(col))
+
+    for feature, value in fill_values.items():
+        if feature in dtypes.index:
+            exprs[feature] = current(feature).fill_null(pl.lit(value))
+
+    if step.correct_neighborhoods_ is not None and has_neighborhood:
+        correct = [k for k in step.correct_neighborhoods_ if not pd.isna(k)]
+        neighborhood = current("Neighborhood")
+        keep = neighborhood.is_in(correct)
+        if len(correct) < len(step.correct_neighborhoods_):  # NA assez représentés: conservés comme NA
+            keep = keep | neighborhood.is_null()
+        neighborhood = pl.when(keep).then(neighborhood).otherwise(pl.lit("Autres"))
+        exprs["Neighborhood"] = neighborhood
+
+        if "LotFrontage" in dtypes.index:
+            stats = step.stat_lotfrontage_per_neighborhood_
+            mapped = neighborhood.replace_strict(
+                list(stats), [float(v) for v in stats.values()], default=None, return_dtype=pl.Float64
+            ).fill_nan(None)
+            lotfrontage = current("LotFrontage").fill_null(mapped)
+            if step.global_stat_lotfrontage_ is not None and not pd.isna(step.global_stat_lotfrontage_):
+                lotfrontage = lotfrontage.fill_null(float(step.global_stat_lotfrontage_))
+            exprs["LotFrontage"] = lotfrontage
+
+    for feature, value in (step.mode_for_mode_features_ or {}).items():
+        if feature in dtypes.index and not pd.isna(value):
+            exprs[feature] = current(feature).fill_null(pl.lit(_literal(value)))
+
+    return [expr.alias(col) for col, expr in exprs.items()], []
+
+
+def _anomaly(step: AnomalyCorrector, dtypes: pd.Series, categorical: Dict[str, Any]) -> _Operations:
+    if not step._resolve(dtypes):
+        return [], []
+    garage, built = pl.col("GarageYrBlt"), pl.col("YearBuilt")
+    return [pl.when(garage > built).then(built).otherwise(garage).alias("GarageYrBlt")], []
+
+
+def _feature_engineer(step: FeatureEngineer, dtypes: pd.Series, categorical: Dict[str, Any]) -> _Operations:
+    """Features dérivées (graphe de FeatureExpressions traduit nœud par nœud), puis suppressions."""
+    expressions = step.expressions
+    names, _, drop_cols = step._resolve(dtypes)
+    translated = _FeatureTranslator(expressions)
+    exprs = []
+    for name in names:
+        exprs.append(translated.output(name).alias(name))
+        labels = expressions.labels(name)
+        if labels is not None:
+            categorical[name] = pd.CategoricalDtype(labels, ordered=True)
+    return exprs, drop_cols
+
+
+def _ordinal(step: OrdinalEncoderCustom, dtypes: pd.Series, categorical: Dict[str, Any]) -> _Operations:
+    """Une correspondance par colonne (ligne de la table compilée); inconnues et NA -> unknown_value."""
+    columns, categories, table = step._resolve(dtypes)
+    return_dtype = pl.Float64 if table.dtype.kind == "f" else pl.Int64
+    exprs = []
+    for j, col in enumerate(columns):
+        unknown = _literal(table[j, -1])
+        encoded = (
+            pl.col(col)
+            .cast(pl.String)
+            .replace_strict(list(categories), table[j, :-1].tolist(), default=unknown, return_dtype=return_dtype)
+        )
+        exprs.append(encoded.fill_null(unknown).alias(col))
+        categorical.pop(col, None)
+    return exprs, []
+
+
+def _skewness(step: SkewnessCorrector, dtypes: pd.Series, categorical: Dict[str, Any]) -> _Operations:
+    return [pl.col(col).log1p() for col in step._resolve(dtypes)], []
+
+
+def _numeric_caster(step: NumericCaster, dtypes: pd.Series, categorical: Dict[str, Any]) -> _Operations:
+    target = pl.Float32 if np.dtype(step.dtype) == np.float32 else pl.Float64
+    return [pl.col(col).cast(target) for col in step._resolve(dtypes)], []
+
+
+def _feature_selector(step: FeatureSelector, dtypes: pd.Series, categorical: Dict[str, Any]) -> _Operations:
+    return [], step._resolve(dtypes)
+
+
+def _identity(step: Any, dtypes: pd.Series, categorical: Dict[str, Any]) -> _Operations:
+    return [], []
+
+
+_TRANSLATIONS: Dict[type, Callable] = {
+    CategoricalCaster: _categorical_caster,
+    MissingValuesHandler: _missing_values,
+    AnomalyCorrector: _anomaly,
+    FeatureEngineer: _feature_engineer,
+    OrdinalEncoderCustom: _ordinal,
+    SkewnessCorrector: _skewness,
+    NumericCaster: _numeric_caster,
+    FeatureSelector: _feature_selector,
+    DebugTransformer: _identity,
+}
+# Étapes traduites en expressions Polars
+POLARS_STEPS = tuple(_TRANSLATIONS)
+
+
+def _translatable(step: Any) -> bool:
+    """Étape traduisible en expressions (l'imputation par plus proches voisins reste en pandas)."""
+    if isinstance(step, MissingValuesHandler) and step.strategy_lotfrontage == "knn":
+        return False
+    return type(step) in _TRANSLATIONS
+
+
+class _FeatureTranslator:
+    """
+    Nœuds d'un graphe FeatureExpressions -> expressions Polars, avec la sémantique de
+    l'évaluation NumPy: NA propagés par l'arithmétique, comparaisons fausses sur NA
+    (sauf !=), max/min NA si un opérande est NA, lookup et cut comme _lookup et _cut.
+    Les sous-expressions communes sont partagées; Polars les calcule une fois (CSE).
+    """
+
+    def __init__(self, expressions: FeatureExpressions):
+        self.expressions = expressions
+        self.cache: Dict[int, "pl.Expr"] = {}
+
+    def output(self, name: str) -> "pl.Expr":
+        index = self.expressions.outputs[name]
+        expr = self.node(index)
+        if self.expressions.nodes[index][0] in ("eq", "ne", "gt", "ge", "lt", "le"):
+            return expr.cast(pl.Int64)  # Indicateurs 0/1 en int64, comme FeatureEngineer
+        return expr
+
+    def constant(self, index: int) -> Any:
+        """Valeur d'un nœud constant (nombre, constante nommée ou expression de constantes)."""
+        op, *arguments = self.expressions.nodes[index]
+        if op == "const":
+            return arguments[0]
+        if op == "constant":
+            return self.expressions.constants[arguments[0]]
+        if op == "neg":
+            return -self.constant(arguments[0])
+        raise TypeError(f"Argument non constant dans une formule de feature: nœud {op}")
+
+    def node(self, index: int) -> "pl.Expr":
+        if index not in self.cache:
+            self.cache[index] = self._translate(index)
+        return self.cache[index]
+
+    def _translate(self, index: int) -> "pl.Expr":
+        op, *arguments = self.expressions.nodes[index]
+        if op == "column":
+            return pl.col(arguments[0])
+        if op == "const":
+            return pl.lit(arguments[0])
+        if op == "lookup":
+            return self._lookup(*arguments)
+        if op == "cut":
+            return self._cut(self.node(arguments[0]), self.constant(arguments[1]), self.constant(arguments[2]))
+        return self._operator(op, [self.node(argument) for argument in arguments])
+
+    def _lookup(self, values: int, table: int, default: Optional[int] = None) -> "pl.Expr":
+        """Table de correspondance catégorie -> valeur (défaut pour les catégories absentes et les NA)."""
+        table = self.constant(table)
+        default = float(self.constant(default)) if default is not None else 0.0
+        mapped = (
+            self.node(values)
+            .cast(pl.String)
+            .replace_strict(list(table), [float(v) for v in table.values()], default=default, return_dtype=pl.Float64)
+        )
+        return mapped.fill_null(default)
+
+    @staticmethod
+    def _operator(op: str, operands: List["pl.Expr"]) -> "pl.Expr":
+        """Opérateurs unaires et binaires, avec la sémantique NA du mode NumPy."""
+        if op == "neg":
+            return -operands[0]
+        if op == "abs":
+            return operands[0].abs()
+        a, b = operands
+        if op == "div":
+            return (a / b).fill_nan(None)  # 0 / 0: NA, comme NaN côté NumPy
+        if op in ("max", "min"):
+            first = a >= b if op == "max" else a <= b
+            return pl.when(a.is_null() | b.is_null()).then(None).when(first).then(a).otherwise(b)
+        arithmetic = {"add": a + b, "sub": a - b, "mul": a * b}
+        if op in arithmetic:
+            return arithmetic[op]
+        comparison = {"eq": a == b, "ne": a != b, "gt": a > b, "ge": a >= b, "lt": a < b, "le": a <= b}[op]
+        return comparison.fill_null(op == "ne")
+
+    @staticmethod
+    def _cut(values: "pl.Expr", bins: List[float], labels: List[Any]) -> "pl.Expr":
+        """Tranches (bins[i], bins[i+1]], bins[0] inclus; hors bornes et NA -> NA."""
+        expr = pl.when(values == bins[0]).then(pl.lit(labels[0]))
+        for i, label in enumerate(labels):
+            expr = expr.when((values > bins[i]) & (values <= bins[i + 1])).then(pl.lit(label))
+        return expr.otherwise(None)
+
+
+# ============================================================
+# PIPELINE
+# ============================================================
+
+
+def _flatten_steps(pipeline: Pipeline) -> List[Any]:
+    steps = []
+    for _, step in pipeline.steps:
+        if isinstance(step, Pipeline):
+            steps.extend(_flatten_steps(step))
+        elif step is not None and step != "passthrough":
+            steps.append(step)
+    return steps
+
+
+class PolarsPipeline:
+    """
+    Exécute un pipeline de create_full_pipeline() avec le backend Polars.
+
+    Les étapes de tête traduisibles (POLARS_STEPS) forment une requête Polars paresseuse
+    construite avec leurs paramètres entraînés; les étapes suivantes (DataQualityMonitor,
+    ColumnTransformer, modèle) reçoivent le DataFrame pandas produit, identique à celui
+    des étapes pandas. Le pipeline est partagé: fit met à jour ses étapes.
+
+    Args:
+        pipeline: Pipeline de prétraitement, éventuellement suivi d'un modèle
+            (ex: Pipeline([("preprocessing", create_full_pipeline()), ("model", ...)]))
+    """
+
+    def __init__(self, pipeline: Pipeline):
+        _require_polars()
+        self.pipeline = pipeline
+        steps = _flatten_steps(pipeline)
+        n_head = 0
+        while n_head < len(steps) and _translatable(steps[n_head]):
+            n_head += 1
+        self.head: List[Any] = steps[:n_head]  # Étapes exécutées par Polars
+        self.tail: List[Any] = steps[n_head:]  # Étapes exécutées sur le DataFrame pandas
+        if not self.head:
+            raise TypeError("Aucune étape traduisible en tête du pipeline (voir POLARS_STEPS)")
+
+    def scan_csv(self, path: str, **kwargs: Any) -> "pl.LazyFrame":
+        """
+        pl.scan_csv avec les NA de pd.read_csv; le fichier est lu par la requête, en parallèle.
+        Les colonnes du schéma d'entraînement sont typées comme au fit (ex: LotFrontage en
+        float64 même si ses premières lignes sont entières), sans passe d'inférence.
+        """
+        kwargs.setdefault("null_values", CSV_NA_VALUES)
+        schema = getattr(self.head[0], "schema_in_", None)
+        if schema is not None:
+            overrides = {col: _polars_dtype(dtype) for col, dtype in zip(schema.columns, schema.dtypes)}
+            kwargs["schema_overrides"] = {**overrides, **kwargs.get("schema_overrides", {})}
+        else:
+            kwargs.setdefault("infer_schema_length", _INFER_SCHEMA_ROWS)
+        return pl.scan_csv(path, **kwargs)
+
+    def _apply(self, step: Any, lf: "pl.LazyFrame", categorical: Dict[str, Any]) -> "pl.LazyFrame":
+        """Ajoute une étape à la requête (décisions résolues sur le schéma courant)."""
+        dtypes = _pandas_dtypes(lf.collect_schema())
+        exprs, drop_cols = _TRANSLATIONS[type(step)](step, dtypes, categorical)
+        if exprs:
+            lf = lf.with_columns(exprs)
+        return lf.drop(drop_cols) if drop_cols else lf
+
+    def query(self, X: Any) -> Tuple["pl.LazyFrame", Dict[str, Any]]:
+        """(requête paresseuse des étapes Polars, dtypes Categorical des colonnes texte en sortie)."""
+        lf = _to_lazy(X)
+        categorical: Dict[str, Any] = {}
+        for step in self.head:
+            lf = self._apply(step, lf, categorical)
+        return lf, categorical
+
+    def _collect(self, lf: "pl.LazyFrame", categorical: Dict[str, Any], index: Optional[pd.Index]) -> pd.DataFrame:
+        return _to_pandas(lf.collect(), categorical, index)
+
+    def transform_frame(self, X: Any) -> pd.DataFrame:
+        """Sortie des étapes Polars, en DataFrame pandas (index de X conservé)."""
+        lf, categorical = self.query(X)
+        return self._collect(lf, categorical, X.index if isinstance(X, pd.DataFrame) else None)
+
+    def transform(self, X: Any) -> Any:
+        """Équivalent de pipeline.transform (le modèle final éventuel n'est pas appliqué)."""
+        Xt = self.transform_frame(X)
+        for step in self.tail:
+            if not hasattr(step, "transform"):
+                break
+            Xt = step.transform(Xt)
+        return Xt
+
+    def predict(self, X: Any) -> np.ndarray:
+        """Équivalent de pipeline.predict."""
+        *transformers, model = self.tail
+        Xt = self.transform_frame(X)
+        for step in transformers:
+            Xt = step.transform(Xt)
+        return model.predict(Xt)
+
+    def fit(self, X: Any, y: Any = None) -> "PolarsPipeline":
+        """
+        Entraîne le pipeline comme pipeline.fit, les transformations intermédiaires étant
+        exécutées par Polars: chaque étape statistique est entraînée sur la sortie collectée
+        des étapes précédentes, les étapes qui ne dépendent que du schéma sur un DataFrame vide.
+        """
+        lf = _to_lazy(X)
+        index = X.index if isinstance(X, pd.DataFrame) else None
+        categorical: Dict[str, Any] = {}
+        for step in self.head:
+            if isinstance(step, _SCHEMA_ONLY_STEPS):
+                step.fit(self._collect(lf.head(0), categorical, None))
+            else:
+                step.fit(self._collect(lf, categorical, index), y)
+            lf = self._apply(step, lf, categorical)
+
+        Xt = self._collect(lf, categorical, index)
+        for step in self.tail[:-1]:
+            Xt = step.fit_transform(Xt, y)
+        if self.tail:
+            self.tail[-1].fit(Xt, y)
+        logger.info(f"PolarsPipeline: {len(self.head)} étapes Polars, {len(self.tail)} étapes pandas / scikit-learn")
+        return self
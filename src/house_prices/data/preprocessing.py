@@ -4,30 +4,447 @@ Includes advanced custom transformers from grp_06_ml.py
 """
 
 import logging
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
-from scipy.stats import skew
 from sklearn.base import BaseEstimator, TransformerMixin
 from sklearn.compose import ColumnTransformer
 from sklearn.compose import make_column_selector
 from sklearn.compose import make_column_selector as selector
 from sklearn.impute import SimpleImputer
+from sklearn.model_selection import KFold
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from sklearn.utils import check_random_state
+
+from .features import FeatureExpressions, parse_feature_config
+from .load_data import load_config
+from .moments import M2, M3, MIN, N, chunk_moments, empty_moments, merge_moments
+from .schema import ColumnSchema, FrozenColumnTransformer
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# ============================================================
+# ENCODAGES ORDINAUX ET CONSTANTES DE FEATURE ENGINEERING
+# ============================================================
+
+QUALITY_MAPPING = {"None": 0, "Po": 1, "Fa": 2, "TA": 3, "Gd": 4, "Ex": 5}
+EXPOSURE_MAPPING = {"None": 0, "No": 1, "Mn": 2, "Av": 3, "Gd": 4}
+GARAGE_FINISH_MAPPING = {"None": 0, "Unf": 1, "RFn": 2, "Fin": 3}
+FUNCTIONAL_MAPPING = {"Sal": 0, "Sev": 1, "Maj2": 2, "Maj1": 3, "Mod": 4, "Min2": 5, "Min1": 6, "Typ": 7}
+SLOPE_MAPPING = {"Sev": 0, "Mod": 1, "Gtl": 2}
+SHAPE_MAPPING = {"IR3": 0, "IR2": 1, "IR1": 2, "Reg": 3}
+CONTOUR_MAPPING = {"Low": 0, "HLS": 1, "Bnk": 2, "Lvl": 3}
+HOUSE_AGE_MAPPING = {"New": 0, "Recent": 1, "Moderate": 2, "Old": 3, "VeryOld": 4}
+FENCE_MAPPING = {"None": 0, "MnWw": 1, "GdWo": 2, "MnPrv": 3, "GdPrv": 4}
+BSMT_FIN_TYPE_MAPPING = {"None": 0, "Unf": 1, "LwQ": 2, "Rec": 3, "BLQ": 4, "ALQ": 5, "GLQ": 6}
+
+# Colonne -> correspondance ordinale appliquée par OrdinalEncoderCustom
+ORDINAL_MAPPINGS = {
+    # Quality features
+    "ExterQual": QUALITY_MAPPING,
+    "ExterCond": QUALITY_MAPPING,
+    "BsmtQual": QUALITY_MAPPING,
+    "BsmtCond": QUALITY_MAPPING,
+    "HeatingQC": QUALITY_MAPPING,
+    "KitchenQual": QUALITY_MAPPING,
+    "FireplaceQu": QUALITY_MAPPING,
+    "GarageQual": QUALITY_MAPPING,
+    "GarageCond": QUALITY_MAPPING,
+    "PoolQC": QUALITY_MAPPING,
+    # Other ordinal features
+    "BsmtExposure": EXPOSURE_MAPPING,
+    "GarageFinish": GARAGE_FINISH_MAPPING,
+    "Functional": FUNCTIONAL_MAPPING,
+    "LandSlope": SLOPE_MAPPING,
+    "LotShape": SHAPE_MAPPING,
+    "LandContour": CONTOUR_MAPPING,
+    "HouseAgeBin": HOUSE_AGE_MAPPING,
+    "Fence": FENCE_MAPPING,
+    # Basement finish type mapping
+    "BsmtFinType1": BSMT_FIN_TYPE_MAPPING,
+    "BsmtFinType2": BSMT_FIN_TYPE_MAPPING,
+}
+
+# Jusqu'à ce nombre de lignes, OrdinalEncoderCustom encode par dictionnaire plutôt que par Index
+_ORDINAL_DICT_MAX_ROWS = 256
+
+# SkewnessCorrector: variables avec au plus ce nombre de valeurs distinctes (binaires, ordinales) ignorées
+_SKEW_MAX_DISCRETE_UNIQUE = 10
+# Lignes triées en premier pour écarter rapidement les variables continues du comptage exact
+_DISTINCT_PROBE_ROWS = 1024
+# Taille des blocs de lignes pour le calcul des moments (tableau de travail en cache)
+_MOMENTS_BLOCK_ROWS = 8192
+
+# FeatureSelector: régularisation de la matrice de corrélation (colinéarités exactes -> VIF très grand)
+_VIF_RIDGE = 1e-10
+# FeatureSelector: écart-type relatif en deçà duquel une colonne est considérée constante
+_VIF_MIN_SCALE = 1e-12
+# FeatureSelector: effectif minimal de l'échantillon pour estimer l'information mutuelle
+_MI_MIN_SAMPLES = 10
+
+# Modalité réservée par CategoricalCaster aux valeurs absentes du vocabulaire appris au fit
+UNKNOWN_CATEGORY = "__unknown__"
+
+# Fraction des batches inspectés par DataQualityMonitor (monitoring.sample_rate de config.yaml)
+MONITOR_SAMPLE_RATE = 0.01
+# Jusqu'à ce nombre de lignes, DataQualityMonitor inspecte le batch en une conversion objet
+_MONITOR_DICT_MAX_ROWS = 256
+
+# Prédicteurs de l'imputation par plus proches voisins (MissingValuesHandler, strategy_lotfrontage="knn"),
+# complétés par le code du quartier
+KNN_PREDICTORS = ("LotArea", "GrLivArea")
+
+# Variables nominales à forte cardinalité encodées par TargetFrequencyEncoder (create_full_pipeline(nominal_encoding="target"))
+HIGH_CARDINALITY_NOMINALS = ("Neighborhood", "Exterior1st", "Exterior2nd", "Condition1", "Condition2")
+
+# Tranches d'âge utilisées par FeatureEngineer pour HouseAgeBin
+HOUSE_AGE_BINS = [0, 5, 20, 50, 100, 200]
+HOUSE_AGE_LABELS = ["New", "Recent", "Moderate", "Old", "VeryOld"]
+
+# Constantes utilisables dans les formules de feature_engineering (config.yaml)
+FEATURE_CONSTANTS = {
+    "QUALITY_MAPPING": QUALITY_MAPPING,
+    "HOUSE_AGE_BINS": HOUSE_AGE_BINS,
+    "HOUSE_AGE_LABELS": HOUSE_AGE_LABELS,
+}
+
+# Features dérivées par défaut (identiques à la section feature_engineering de config.yaml),
+# utilisées sans configuration et par les modèles sérialisés avant le moteur d'expressions
+DEFAULT_FEATURES = {
+    # Surfaces
+    "TotalSF": "TotalBsmtSF + (1stFlrSF + 2ndFlrSF)",
+    "TotalSF_AboveGround": "1stFlrSF + 2ndFlrSF",
+    "Has2ndFloor": "2ndFlrSF > 0",
+    "HasBasement": "TotalBsmtSF > 0",
+    # Porches
+    "TotalPorchSF": "OpenPorchSF + 3SsnPorch + EnclosedPorch + ScreenPorch + WoodDeckSF",
+    "HasPorch": "TotalPorchSF > 0",
+    "HasDeck": "WoodDeckSF > 0",
+    "HasPool": "PoolArea > 0",
+    # Ages
+    "HouseAge": "YrSold - YearBuilt",
+    "IsNew": "YrSold == YearBuilt",
+    "RemodAge": "YrSold - YearRemodAdd",
+    "HasBeenRemod": "YearRemodAdd > YearBuilt",
+    "HouseAgeBin": "cut(HouseAge, HOUSE_AGE_BINS, HOUSE_AGE_LABELS)",
+    # Garage
+    "HasGarage": "GarageArea > 0",
+    "GarageAge": "max(YrSold - GarageYrBlt, 0)",
+    # Cheminée
+    "HasFireplace": "Fireplaces > 0",
+    "FireplaceScore": "Fireplaces * lookup(FireplaceQu, QUALITY_MAPPING)",
+}
+DEFAULT_DROPPED_COLUMNS = [
+    "1stFlrSF",
+    "2ndFlrSF",
+    "TotalBsmtSF",
+    "OpenPorchSF",
+    "3SsnPorch",
+    "EnclosedPorch",
+    "YearBuilt",
+    "YearRemodAdd",
+    "YrSold",
+    "GarageYrBlt",
+    "Fireplaces",
+]
+
+
+# ============================================================
+# RÉSUMÉS FUSIONNABLES (ENTRAÎNEMENT PAR MORCEAUX)
+# ============================================================
+
+
+class ModeSketch:
+    """
+    Comptages fusionnables (Misra-Gries) d'une variable catégorielle: mode et fréquences.
+
+    Exacts tant que le nombre de modalités distinctes reste <= max_size; au-delà,
+    seules les modalités fréquentes sont conservées (mémoire bornée).
+    """
+
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+        self.counts = {}
+        self.n = 0  # Effectif total hors NA
+
+    def update(self, values):
+        counts = pd.Series(values).value_counts(dropna=True, sort=False)
+        counts = counts[counts > 0]  # Categorical: catégories du vocabulaire absentes du morceau
+        self._add(zip(counts.index.tolist(), counts.to_numpy().tolist()), int(counts.sum()))
+        return self
+
+    def merge(self, other):
+        self._add(other.counts.items(), other.n)
+        return self
+
+    def _add(self, items, n):
+        for key, count in items:
+            self.counts[key] = self.counts.get(key, 0) + count
+        self.n += n
+        if len(self.counts) > self.max_size:
+            # On retranche le (max_size + 1)-ième comptage et on oublie les modalités épuisées
+            cut = sorted(self.counts.values(), reverse=True)[self.max_size]
+            self.counts = {key: count - cut for key, count in self.counts.items() if count > cut}
+
+    def mode(self):
+        """Modalité la plus fréquente; en cas d'égalité la plus petite, comme Series.mode()[0]."""
+        if not self.counts:
+            return np.nan
+        best = max(self.counts.values())
+        return min(key for key, count in self.counts.items() if count == best)
+
+    def proportions(self):
+        """Fréquences relatives par effectif décroissant, comme value_counts(normalize=True)."""
+        ranked = sorted(self.counts.items(), key=lambda item: -item[1])
+        return {key: count / self.n for key, count in ranked}
+
+
+class MedianSketch:
+    """
+    Distribution numérique fusionnable (valeurs distinctes et effectifs): médiane et moyenne.
+
+    Exacte tant que le nombre de valeurs distinctes reste <= max_size; au-delà, les
+    valeurs voisines sont fusionnées deux à deux en centroïdes pondérés. La moyenne
+    reste exacte dans tous les cas.
+    """
+
+    def __init__(self, max_size=4096):
+        self.max_size = max_size
+        self.values = np.empty(0)
+        self.weights = np.empty(0)
+        self.total = 0.0
+        self.n = 0
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        distinct, counts = np.unique(values, return_counts=True)
+        self._add(distinct, counts.astype(np.float64), float(values.sum()))
+        return self
+
+    def merge(self, other):
+        self._add(other.values, other.weights, other.total)
+        return self
+
+    def _add(self, values, weights, total):
+        if len(values) == 0:
+            return
+        self.n += int(round(weights.sum()))
+        self.total += total
+        values = np.concatenate([self.values, values])
+        weights = np.concatenate([self.weights, weights])
+        order = np.argsort(values, kind="stable")
+        values, weights = values[order], weights[order]
+        starts = np.r_[0, np.flatnonzero(np.diff(values)) + 1]
+        self.values = values[starts]
+        self.weights = np.add.reduceat(weights, starts)
+        while len(self.values) > self.max_size:
+            self._compact()
+
+    def _compact(self):
+        paired = len(self.values) // 2 * 2
+        values = self.values[:paired].reshape(-1, 2)
+        weights = self.weights[:paired].reshape(-1, 2)
+        merged_weights = weights.sum(axis=1)
+        self.values = np.r_[(values * weights).sum(axis=1) / merged_weights, self.values[paired:]]
+        self.weights = np.r_[merged_weights, self.weights[paired:]]
+
+    def median(self):
+        if self.n == 0:
+            return np.nan
+        cumulative = np.cumsum(self.weights)
+        lower = self.values[np.searchsorted(cumulative, (self.n - 1) // 2 + 1)]
+        upper = self.values[np.searchsorted(cumulative, self.n // 2 + 1)]
+        return float((lower + upper) / 2)
+
+    def quantile(self, q):
+        """Quantile par interpolation linéaire entre rangs, comme Series.quantile(q)."""
+        if self.n == 0:
+            return np.nan
+        cumulative = np.cumsum(self.weights)
+        rank = (self.n - 1) * q
+        low = int(np.floor(rank))
+        lower = self.values[np.searchsorted(cumulative, low + 1)]
+        upper = self.values[np.searchsorted(cumulative, min(low + 1, self.n - 1) + 1)]
+        return float(lower + (upper - lower) * (rank - low))
+
+    def mean(self):
+        return self.total / self.n if self.n else np.nan
+
+
+class NeighborIndex:
+    """
+    Index spatial (KDTree) pour l'imputation d'une colonne par ses plus proches voisins.
+
+    update() accumule les lignes complètes (prédicteurs et cible renseignés) d'un morceau
+    du jeu d'entraînement dans un échantillon uniforme borné à max_size lignes (clés
+    aléatoires les plus petites), fusionnable comme les autres résumés. build() construit
+    l'arbre une fois sur les prédicteurs standardisés; query() impute ensuite par la
+    moyenne de la cible des n_neighbors voisins, par lots de batch_size lignes, en
+    O(log n) par ligne au lieu du parcours complet de KNNImputer.
+
+    Les groupes (quartiers) sont portés par une dimension supplémentaire: encode_groups
+    (groupes -> codes numériques) est fourni à build() et à query(), des groupes de codes
+    proches sont voisins dans l'index.
+    """
+
+    def __init__(self, n_neighbors=5, max_size=100_000, batch_size=8192, random_state=0):
+        self.n_neighbors = n_neighbors
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.random_state = check_random_state(random_state)
+        self.points = None  # (n, d) prédicteurs bruts de l'échantillon
+        self.groups = np.empty(0, dtype=object)
+        self.targets = np.empty(0)
+        self.keys = np.empty(0)
+        self.tree = None
+        self.center = self.scale = None
+        self.fallback = np.nan  # Médiane de la cible de l'échantillon
+
+    def __len__(self):
+        return len(self.targets)
+
+    def update(self, points, targets, groups=None):
+        points = np.asarray(points, dtype=np.float64)
+        targets = np.asarray(targets, dtype=np.float64)
+        groups = np.full(len(targets), None, dtype=object) if groups is None else np.asarray(groups, dtype=object)
+        complete = ~np.isnan(points).any(axis=1) & ~np.isnan(targets)
+        self._add(points[complete], targets[complete], groups[complete], self.random_state.random_sample(complete.sum()))
+        return self
+
+    def merge(self, other):
+        if other.points is not None:
+            self._add(other.points, other.targets, other.groups, other.keys)
+        return self
+
+    def _add(self, points, targets, groups, keys):
+        if self.points is None:
+            self.points = np.empty((0, points.shape[1]))
+        self.points = np.concatenate([self.points, points])
+        self.targets = np.concatenate([self.targets, targets])
+        self.groups = np.concatenate([self.groups, groups])
+        self.keys = np.concatenate([self.keys, keys])
+        if len(self.keys) > self.max_size:
+            keep = np.sort(np.argpartition(self.keys, self.max_size)[: self.max_size])
+            self.points, self.targets = self.points[keep], self.targets[keep]
+            self.groups, self.keys = self.groups[keep], self.keys[keep]
+        self.tree = None
+
+    @staticmethod
+    def _matrix(points, codes):
+        return points if codes is None else np.column_stack([points, codes])
+
+    def build(self, encode_groups=None):
+        """Construit l'arbre; encode_groups: groupes -> codes numériques (dernière dimension)."""
+        from sklearn.neighbors import KDTree
+
+        self.tree = None
+        if not len(self):
+            return self
+        self.fallback = float(np.median(self.targets))
+        matrix = self._matrix(self.points, None if encode_groups is None else encode_groups(self.groups))
+        complete = ~np.isnan(matrix).any(axis=1)
+        matrix, self.targets = matrix[complete], self.targets[complete]
+        self.points, self.groups, self.keys = self.points[complete], self.groups[complete], self.keys[complete]
+        self.center = matrix.mean(axis=0)
+        scale = matrix.std(axis=0)
+        self.scale = np.where(scale > 0, scale, 1.0)
+        self.tree = KDTree((matrix - self.center) / self.scale)
+        return self
+
+    def query(self, points, groups=None, encode_groups=None):
+        """Moyenne de la cible des plus proches voisins; NaN pour les lignes aux prédicteurs incomplets."""
+        points = np.asarray(points, dtype=np.float64)
+        imputed = np.full(len(points), np.nan)
+        if self.tree is None or not len(points):
+            return imputed
+        codes = None if encode_groups is None else encode_groups(groups)
+        matrix = (self._matrix(points, codes) - self.center) / self.scale
+        rows = np.flatnonzero(~np.isnan(matrix).any(axis=1))
+        k = min(self.n_neighbors, len(self))
+        for start in range(0, len(rows), self.batch_size):
+            batch = rows[start : start + self.batch_size]
+            neighbors = self.tree.query(matrix[batch], k=k, return_distance=False)
+            imputed[batch] = self.targets[neighbors].mean(axis=1)
+        return imputed
+
+
 # ============================================================
 # CUSTOM TRANSFORMERS FROM grp_06_ml.py
 # ============================================================
 
 
-class MissingValuesHandler(BaseEstimator, TransformerMixin):
-    """Advanced missing values handler with neighborhood-based imputation."""
+class _CopyMixin:
+    """
+    Gestion de la copie du DataFrame en entrée de transform.
+
+    Avec copy=True (défaut), chaque transformer travaille sur sa propre copie.
+    Avec copy=False, le transformer modifie en place le DataFrame reçu: à réserver
+    aux étapes qui suivent une étape propriétaire de la copie (voir create_full_pipeline).
+    """
+
+    def __setstate__(self, state):
+        # Compatibilité avec les modèles sérialisés avant l'ajout de `copy`
+        state.setdefault("copy", True)
+        super().__setstate__(state)
+
+    def _prepare(self, X):
+        return X.copy() if self.copy else X
+
+
+class _FrozenSchemaMixin:
+    """
+    Schéma d'entrée figé au fit (voir schema.ColumnSchema).
+
+    fit enregistre le schéma reçu (schema_in_) et résout une fois les décisions qui ne
+    dépendent que du schéma (_resolve, résultat dans resolved_). transform réutilise
+    ces décisions si les colonnes reçues sont exactement celles du fit; sinon
+    la dérive est journalisée et les décisions sont recalculées sur les colonnes reçues.
+    Seule la première étape du pipeline compare aussi les dtypes et signale la dérive en
+    WARNING (_check_dtypes, _drift_level): le schéma des étapes suivantes en découle,
+    elles la journalisent en DEBUG.
+    """
+
+    _check_dtypes = False
+    _drift_level = logging.DEBUG
+
+    def _freeze_schema(self, X, reset=False):
+        """Enregistre le schéma de X (au premier appel, ou si `reset`) puis résout les décisions."""
+        if reset or getattr(self, "schema_in_", None) is None:
+            self.schema_in_ = ColumnSchema.from_frame(X)
+        self.resolved_ = self._resolve(self.schema_in_.dtypes_series())
+
+    def _resolved(self, X):
+        schema = getattr(self, "schema_in_", None)  # Absent des modèles sérialisés avant le schéma figé
+        if schema is not None and schema.matches(X, dtypes=self._check_dtypes):
+            return self.resolved_
+        if schema is not None:
+            schema.report_drift(X, type(self).__name__, self._drift_level)
+        return self._resolve(X.dtypes)
+
+    def _resolve(self, dtypes):
+        """Décisions pour un schéma donné (Series colonne -> dtype)."""
+        raise NotImplementedError
+
+
+class MissingValuesHandler(_FrozenSchemaMixin, _CopyMixin, BaseEstimator, TransformerMixin):
+    """
+    Advanced missing values handler with neighborhood-based imputation.
+
+    strategy_lotfrontage="knn": LotFrontage (et les colonnes de knn_features) sont imputées
+    par la moyenne de leurs plus proches voisins sur KNN_PREDICTORS et le code du quartier
+    (sa médiane de LotFrontage), via un NeighborIndex construit une fois au fit. La médiane
+    du quartier reste l'imputation de repli des lignes sans prédicteurs complets.
+    """
+
+    # Première étape: toute dérive du schéma d'entrée est signalée ici
+    _check_dtypes = True
+    _drift_level = logging.WARNING
 
     def __init__(
         self,
@@ -37,6 +454,11 @@ class MissingValuesHandler(BaseEstimator, TransformerMixin):
         mode_features,
         strategy_lotfrontage="median",
         neighborhoods_threshold=0.02,
+        diagnostics=False,
+        copy=True,
+        knn_features=None,
+        knn_neighbors=5,
+        knn_max_samples=100_000,
     ):
         """Cette classe permet de traiter les missing values et elle pourra être inclus dans un Pipeline scikit-learn"""
         self.none_features = none_features
@@ -45,351 +467,1261 @@ class MissingValuesHandler(BaseEstimator, TransformerMixin):
         self.mode_features = mode_features
         self.correct_neighborhoods_ = None
         self.neighborhoods_threshold = neighborhoods_threshold
-        self.strategy_lotfrontage = strategy_lotfrontage  # median / mean
+        self.strategy_lotfrontage = strategy_lotfrontage  # median / mean / knn
+        self.diagnostics = diagnostics  # comptages de NA et logs détaillés à chaque transform
+        self.copy = copy  # False: imputation en place sur le DataFrame reçu
+        self.knn_features = knn_features  # colonnes imputées par voisins (None: LotFrontage)
+        self.knn_neighbors = knn_neighbors
+        self.knn_max_samples = knn_max_samples  # taille maximale de l'échantillon indexé
         self.global_stat_lotfrontage_ = None
         self.stat_lotfrontage_per_neighborhood_ = {}  # median / mean de lotfrontage par neighbourhood
         self.mode_for_mode_features_ = {}
 
+    def __setstate__(self, state):
+        # Compatibilité avec les modèles sérialisés avant l'ajout de `diagnostics`
+        state.setdefault("diagnostics", False)
+        state.setdefault("knn_features", None)
+        state.setdefault("knn_neighbors", 5)
+        state.setdefault("knn_max_samples", 100_000)
+        super().__setstate__(state)
+
     def fit(self, X_train, y=None):
         """Calcul des paramètres pour l'imputation à partir du jeu d'entraînement"""
         print("Missing Values Handler starting in fit...")
         logging.info("Calcul des paramètres pour l'imputation à partir du jeu d'entraînement...")
+        if self.strategy_lotfrontage not in ("median", "mean", "knn"):
+            logging.error("Mauvaise valeur de strategy_lotfrontage: mettre mean, median ou knn")
+
+        self._reset()
+        return self.partial_fit(X_train).finalize()  # Important pour la compatibilité avec scikit-learn
+
+    def partial_fit(self, X_train, y=None):
+        """
+        Met à jour les résumés (comptages des quartiers et des modes, distributions de
+        LotFrontage) avec un morceau du jeu d'entraînement, puis les paramètres d'imputation.
+        Les index de plus proches voisins sont construits une fois, par finalize() (appelée
+        par fit et fit_out_of_core, sinon au premier transform qui suit des partial_fit).
+        """
+        if not hasattr(self, "neighborhood_sketch_"):
+            self._reset()
+
         if "Neighborhood" in X_train.columns:
-            # Modalités assez représentées (% > self.neighborhoods_threshold)
-            neighborhood_proportions = X_train["Neighborhood"].value_counts(normalize=True)
-            correct_neighborhoods = neighborhood_proportions[neighborhood_proportions >= self.neighborhoods_threshold].index
-            correct_neighborhoods = list(correct_neighborhoods)
-            self.correct_neighborhoods_ = correct_neighborhoods
+            if self.neighborhood_sketch_ is None:
+                self.neighborhood_sketch_ = ModeSketch()
+            self.neighborhood_sketch_.update(X_train["Neighborhood"])
 
         # Mode for mode_features
-        if self.mode_features and len(self.mode_features) > 0:
-            result = {}
-            for feature in self.mode_features:
-                mode_value = X_train[feature].mode()[0]
-                result[feature] = mode_value
-            self.mode_for_mode_features_ = result
+        for feature in self.mode_features or []:
+            self.mode_sketches_.setdefault(feature, ModeSketch()).update(X_train[feature])
+
+        if "LotFrontage" in X_train.columns and self.strategy_lotfrontage in ("median", "mean", "knn"):
+            self._update_lotfrontage(X_train)
+        if self.strategy_lotfrontage == "knn" and self._has_knn_predictors(X_train):
+            self._update_knn(X_train)
+
+        self._finalize()
+        self._freeze_schema(X_train)
+        self.finalize_pending_ = bool(self.knn_indexes_)
+        return self
+
+    def _update_lotfrontage(self, X_train):
+        lotfrontage = X_train["LotFrontage"]
+        if self.lotfrontage_sketch_ is None:
+            self.lotfrontage_sketch_ = MedianSketch()
+        self.lotfrontage_sketch_.update(lotfrontage.to_numpy(dtype=np.float64, na_value=np.nan))
+
+        # Un résumé par quartier brut: le regroupement en 'Autres' dépend des proportions finales
+        if "Neighborhood" in X_train.columns:
+            for neighborhood, values in lotfrontage.groupby(X_train["Neighborhood"], dropna=False, sort=False):
+                key = None if pd.isna(neighborhood) else neighborhood
+                sketch = self.lotfrontage_sketches_.setdefault(key, MedianSketch())
+                sketch.update(values.to_numpy(dtype=np.float64, na_value=np.nan))
+
+    def _update_knn(self, X_train):
+        points, groups = self._knn_points(X_train)
+        for feature in self._knn_targets():
+            if feature in X_train.columns:
+                index = self.knn_indexes_.setdefault(
+                    feature, NeighborIndex(n_neighbors=self.knn_neighbors, max_size=self.knn_max_samples)
+                )
+                index.update(points, X_train[feature].to_numpy(dtype=np.float64, na_value=np.nan), groups)
+
+    def finalize(self):
+        """Construit les index de plus proches voisins à partir des échantillons accumulés."""
+        encode_groups = self._encode_neighborhoods if self.stat_lotfrontage_per_neighborhood_ else None
+        for index in getattr(self, "knn_indexes_", {}).values():
+            index.build(encode_groups)
+        self.finalize_pending_ = False
+        return self
+
+    def _reset(self):
+        self.neighborhood_sketch_ = None
+        self.mode_sketches_ = {}
+        self.lotfrontage_sketch_ = None
+        self.lotfrontage_sketches_ = {}  # quartier brut (None pour NA) -> MedianSketch
+        self.knn_indexes_ = {}  # colonne -> NeighborIndex (strategy_lotfrontage="knn")
+        self.schema_in_ = None
+        self.correct_neighborhoods_ = None
+        self.global_stat_lotfrontage_ = None
+        self.stat_lotfrontage_per_neighborhood_ = {}
+        self.mode_for_mode_features_ = {}
+        self.finalize_pending_ = False
+
+    def _finalize(self):
+        """Paramètres d'imputation à partir des résumés accumulés."""
+        if self.neighborhood_sketch_ is not None:
+            # Modalités assez représentées (% > self.neighborhoods_threshold)
+            proportions = self.neighborhood_sketch_.proportions()
+            self.correct_neighborhoods_ = [k for k, p in proportions.items() if p >= self.neighborhoods_threshold]
+
+        if self.mode_sketches_:
+            self.mode_for_mode_features_ = {feature: sketch.mode() for feature, sketch in self.mode_sketches_.items()}
 
+        if self.lotfrontage_sketch_ is not None:
             # stat global pour lotfrontage
-            if "LotFrontage" in X_train.columns:
-                if self.strategy_lotfrontage == "median":
-                    self.global_stat_lotfrontage_ = X_train["LotFrontage"].median()
-                elif self.strategy_lotfrontage == "mean":
-                    self.global_stat_lotfrontage_ = X_train["LotFrontage"].mean()
-                else:
-                    logging.error("Mauvaise valeur de strategy_lotfrontage: mettre mean ou median")
-
-            # Stat de lotfrontage par neighborhoods
-            if (
-                "Neighborhood" in X_train.columns
-                and "LotFrontage" in X_train.columns
-                and self.correct_neighborhoods_ is not None
-            ):
-                X_train_temp = X_train.copy()
-                # Conserver uniquement les correct_neighborhoods, les autres sont groupés en 'Autres'
-                all_unique_neighborhoods = set(X_train_temp["Neighborhood"].unique())
-                categories_to_replace = list(all_unique_neighborhoods.difference(set(self.correct_neighborhoods_)))
-                X_train_temp["Neighborhood"] = X_train_temp["Neighborhood"].replace(categories_to_replace, "Autres")
-
-                effective_neighborhoods = list(set(self.correct_neighborhoods_ + ["Autres"]))
-
-                for neighborhood in effective_neighborhoods:
-                    neighborhood_data = X_train_temp[X_train_temp["Neighborhood"] == neighborhood]
-                    if self.strategy_lotfrontage == "median":
-                        self.stat_lotfrontage_per_neighborhood_[neighborhood] = neighborhood_data["LotFrontage"].median()
-                    elif self.strategy_lotfrontage == "mean":
-                        self.stat_lotfrontage_per_neighborhood_[neighborhood] = neighborhood_data["LotFrontage"].mean()
-                    else:
-                        logging.error("Mauvaise valeur de strategy_lotfrontage: mettre mean ou median")
-
-        return self  # Important pour la compatibilité avec scikit-learn
+            statistic = "median" if self.strategy_lotfrontage == "knn" else self.strategy_lotfrontage
+            self.global_stat_lotfrontage_ = getattr(self.lotfrontage_sketch_, statistic)()
+
+            # Stat de lotfrontage par neighborhoods: les quartiers peu représentés (et les NA)
+            # sont regroupés en 'Autres' en fusionnant leurs résumés
+            if self.lotfrontage_sketches_ and self.correct_neighborhoods_ is not None:
+                others = MedianSketch()
+                for key, sketch in self.lotfrontage_sketches_.items():
+                    if key not in self.correct_neighborhoods_:
+                        others.merge(sketch)
+                stats = {
+                    neighborhood: getattr(self.lotfrontage_sketches_.get(neighborhood, MedianSketch()), statistic)()
+                    for neighborhood in self.correct_neighborhoods_
+                }
+                stats.setdefault("Autres", getattr(others, statistic)())
+                self.stat_lotfrontage_per_neighborhood_ = stats
+
+    def _knn_targets(self):
+        return list(self.knn_features) if self.knn_features is not None else ["LotFrontage"]
+
+    @staticmethod
+    def _has_knn_predictors(X):
+        return all(col in X.columns for col in KNN_PREDICTORS)
+
+    @staticmethod
+    def _knn_points(X):
+        """(prédicteurs log1p, quartiers bruts, None pour NA) des lignes de X."""
+        points = np.log1p(X[list(KNN_PREDICTORS)].to_numpy(dtype=np.float64, na_value=np.nan))
+        if "Neighborhood" not in X.columns:
+            return points, None
+        groups = X["Neighborhood"].to_numpy(dtype=object)
+        return points, np.where(pd.isna(groups), None, groups)
+
+    def _encode_neighborhoods(self, neighborhoods):
+        """Quartiers bruts -> code: médiane de LotFrontage de leur groupe (rares, inconnus et NA: 'Autres')."""
+        stats = self.stat_lotfrontage_per_neighborhood_
+        others = stats.get("Autres", np.nan)
+        codes = {key: stats.get(key, others) for key in pd.unique(neighborhoods)}
+        codes.update({key: others for key in codes if key not in self.correct_neighborhoods_})
+        return np.array([codes[key] for key in neighborhoods], dtype=np.float64)
+
+    def _impute_knn(self, X, columns_with_na):
+        """
+        Imputation par plus proches voisins des colonnes de knn_indexes_ qui contiennent des NA.
+        Les lignes aux prédicteurs incomplets restent NA pour LotFrontage (repli par quartier)
+        et reçoivent la médiane de l'échantillon pour les autres colonnes.
+        """
+        if getattr(self, "finalize_pending_", False):  # partial_fit sans finalize: index construits ici, une fois
+            self.finalize()
+        if not self._has_knn_predictors(X):
+            return
+        for feature, index in self.knn_indexes_.items():
+            if feature not in columns_with_na or feature not in X.columns:
+                continue
+            values = X[feature].to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+            missing = np.isnan(values)
+            points, groups = self._knn_points(X.loc[missing])
+            encode_groups = self._encode_neighborhoods if groups is not None and index.center is not None else None
+            if index.center is not None and len(index.center) != points.shape[1] + (encode_groups is not None):
+                continue  # Index construit avec/sans quartier: schéma d'entrée différent du fit
+            imputed = index.query(points, groups, encode_groups)
+            if feature != "LotFrontage":
+                imputed = np.where(np.isnan(imputed), index.fallback, imputed)
+            values[missing] = imputed
+            X[feature] = values
+
+    def _resolve(self, dtypes):
+        """(valeurs d'imputation None/0 par colonne, présence de Neighborhood)."""
+        fill_values = {feature: 0 for feature in self.zero_features or []}
+        fill_values.update({feature: "None" for feature in self.none_features or []})
+        return fill_values, "Neighborhood" in dtypes.index
+
+    def _group_neighborhoods(self, neighborhoods):
+        """Remplace les quartiers absents de correct_neighborhoods_ (et les NA) par 'Autres'."""
+        if isinstance(neighborhoods.dtype, pd.CategoricalDtype):
+            if "Autres" not in neighborhoods.dtype.categories:
+                neighborhoods = neighborhoods.cat.add_categories(["Autres"])
+            # Table code -> code sur les seules catégories, puis indexation par les codes
+            dtype = neighborhoods.dtype
+            others = dtype.categories.get_loc("Autres")
+            lut = np.where(dtype.categories.isin(self.correct_neighborhoods_), np.arange(len(dtype.categories)), others)
+            codes = np.append(lut, others)[neighborhoods.array.codes]
+            return pd.Series(pd.Categorical.from_codes(codes, dtype=dtype), index=neighborhoods.index, copy=False)
+        return neighborhoods.where(neighborhoods.isin(self.correct_neighborhoods_), "Autres")
+
+    @staticmethod
+    def _map_values(series, mapping):
+        """series.map(mapping) en float64 (NaN hors correspondance); Categorical: via ses seules catégories."""
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            lut = np.append(series.cat.categories.map(mapping).to_numpy(dtype=np.float64, na_value=np.nan), np.nan)
+            return pd.Series(lut[series.array.codes], index=series.index, copy=False)
+        return series.map(mapping)
+
+    @staticmethod
+    def _fill_columns(X, fill_values, columns_with_na):
+        """fillna en place, limité aux colonnes qui contiennent effectivement des NA."""
+        for feature, value in fill_values.items():
+            if feature in columns_with_na:
+                series = X[feature]
+                if isinstance(series.dtype, pd.CategoricalDtype) and value not in series.dtype.categories:
+                    # Vocabulaire sans la valeur d'imputation (CategoricalCaster la réserve via extra_categories)
+                    series = series.cat.add_categories([value])
+                X[feature] = series.fillna(value)
+                columns_with_na.discard(feature)
 
     def transform(self, X):
         """Applique diverses transformations pour gérer les valeurs manquantes"""
-        X = X.copy()  # Travailler sur une copie pour éviter les SettingWithCopyWarning
-        print("Missing Values Handler starting in transform...")
-        logging.info("Imputation des valeurs manquantes en cours...")
-        missing_before = X.isnull().sum().sum()
-        logging.info(f"  • Valeurs manquantes avant: {missing_before:,}")
-
-        logging.info("1. Imputation - ÉTAPE 1: NA = 'None' (Absence d'équipements)")
-        if self.none_features and len(self.none_features) > 0:
-            for feature in self.none_features:
-                if feature in X.columns:
-                    X[feature] = X[feature].fillna("None")
-                    logging.info(f"  ✓ {feature}: NA → 'None'")
-
-        logging.info("2. Imputation - ÉTAPE 2: NA = 0 (Quantité nulle)")
-        if self.zero_features and len(self.zero_features) > 0:
-            for feature in self.zero_features:
-                if feature in X.columns:
-                    X[feature] = X[feature].fillna(0)
-                    logging.info(f"  ✓ {feature}: NA → 0")
-
-        logging.info("3. Imputation - ÉTAPE 3: LotFrontage par groupe (Neighborhood)")
-        # remplacer les categories mal représentées par 'Autres'
-        # D'abord, identifier les catégories qui ne sont PAS dans `correct_neighborhoods`
-        if self.correct_neighborhoods_ is not None and "Neighborhood" in X.columns:
-            all_neighborhoods = set(X["Neighborhood"].unique())
-            categories_to_replace = list(all_neighborhoods.difference(set(self.correct_neighborhoods_)))
-            X["Neighborhood"] = X["Neighborhood"].replace(categories_to_replace, "Autres")
+        X = self._prepare(X)  # Travailler sur une copie pour éviter les SettingWithCopyWarning
+        logger.debug("Missing Values Handler starting in transform...")
+        if self.diagnostics:
+            logging.info("Imputation des valeurs manquantes en cours...")
+            logging.info(f"  • Valeurs manquantes avant: {X.isnull().sum().sum():,}")
+
+        fill_values, has_neighborhood = self._resolved(X)
+        # Un seul balayage pour repérer les colonnes à imputer
+        columns_with_na = set(X.columns[X.isna().to_numpy().any(axis=0)])
+
+        # ÉTAPES 1 et 2: NA = 'None' (Absence d'équipements) puis NA = 0 (Quantité nulle)
+        self._fill_columns(X, fill_values, columns_with_na)
+
+        # ÉTAPE 3: plus proches voisins (strategy_lotfrontage="knn") puis LotFrontage par groupe (Neighborhood)
+        if getattr(self, "knn_indexes_", None):
+            self._impute_knn(X, columns_with_na)
+        if self.correct_neighborhoods_ is not None and has_neighborhood:
+            X["Neighborhood"] = self._group_neighborhoods(X["Neighborhood"])
 
             # Imputation par médiane / moyenne de groupe
-            # On utilisera le dictionnaire self.stat_lotfrontage_per_neighborhood_
-            if "LotFrontage" in X.columns:
-                mapped_lotfrontage = X["Neighborhood"].map(self.stat_lotfrontage_per_neighborhood_)
+            if "LotFrontage" in columns_with_na:
+                mapped_lotfrontage = self._map_values(X["Neighborhood"], self.stat_lotfrontage_per_neighborhood_)
                 X["LotFrontage"] = X["LotFrontage"].fillna(mapped_lotfrontage)
 
                 # Si encore des NA (Neighborhood avec tous les NA), imputer par médiane globale
-                remaining_na = X["LotFrontage"].isnull().sum()
-                if remaining_na > 0:
-                    if self.global_stat_lotfrontage_ is not None:
-                        X["LotFrontage"] = X["LotFrontage"].fillna(self.global_stat_lotfrontage_)
-                        logging.info(
-                            f"   {remaining_na} valeurs imputées par {self.strategy_lotfrontage} globale ({self.global_stat_lotfrontage_:.1f})"
-                        )
-        else:
+                if self.global_stat_lotfrontage_ is not None:
+                    X["LotFrontage"] = X["LotFrontage"].fillna(self.global_stat_lotfrontage_)
+        elif self.diagnostics:
             logging.info(
                 "  !!! LotFrontage: NA → aucune imputation car, pas de Neighborhood ou de correct_neighborhoods spécifié "
             )
 
-        logging.info("4. IMPUTATION - ÉTAPE 4: Variables catégorielles par mode")
+        # ÉTAPE 4: Variables catégorielles par mode
         if self.mode_for_mode_features_:
-            for feature in self.mode_features:
-                if feature in X.columns:
-                    mode_value = self.mode_for_mode_features_[feature]
-                    X[feature] = X[feature].fillna(mode_value)
-        else:
+            self._fill_columns(X, self.mode_for_mode_features_, columns_with_na)
+        elif self.diagnostics:
             logging.info(
                 "  !!! Variables catégorielles par mode: NA → aucune imputation car, pas de mode_for_mode_features spécifié "
             )
 
-        na_final = X.isnull().sum().sum()
-        logging.info(f"  ✓ Valeurs manquantes après:  {na_final:,}")
+        if self.diagnostics:
+            logging.info(f"  ✓ Valeurs manquantes après:  {X.isnull().sum().sum():,}")
 
         return X
 
 
-class AnomalyCorrector(BaseEstimator, TransformerMixin):
+class AnomalyCorrector(_FrozenSchemaMixin, _CopyMixin, BaseEstimator, TransformerMixin):
     """Corrects data anomalies and inconsistencies."""
 
+    def __init__(self, copy=True):
+        self.copy = copy
+
     def fit(self, X, y=None):
+        self._freeze_schema(X, reset=True)
         return self
 
+    def partial_fit(self, X, y=None):
+        self._freeze_schema(X)
+        return self
+
+    def _resolve(self, dtypes):
+        return "GarageYrBlt" in dtypes.index and "YearBuilt" in dtypes.index
+
     def transform(self, X):
-        X = X.copy()
-        print("Anomaly Corrector Handler starting...")
+        X = self._prepare(X)
+        logger.debug("Anomaly Corrector Handler starting...")
 
         # Fix GarageYrBlt > YearBuilt
-        if "GarageYrBlt" in X.columns and "YearBuilt" in X.columns:
+        if self._resolved(X):
             mask = X["GarageYrBlt"] > X["YearBuilt"]
             X.loc[mask, "GarageYrBlt"] = X.loc[mask, "YearBuilt"]
 
         return X
 
 
-class FeatureEngineer(BaseEstimator, TransformerMixin):
-    """Advanced feature engineering for house prices."""
+class FeatureEngineer(_FrozenSchemaMixin, _CopyMixin, BaseEstimator, TransformerMixin):
+    """
+    Advanced feature engineering for house prices.
+
+    Les features sont décrites par des formules (section feature_engineering de
+    config.yaml, DEFAULT_FEATURES par défaut) compilées par FeatureExpressions:
+    sous-expressions communes calculées une fois, une seule passe NumPy.
+    Une feature n'est créée que si toutes ses colonnes sources sont présentes: ce choix,
+    comme les colonnes à lire et à supprimer, est résolu une fois au fit.
+    """
+
+    def __init__(self, copy=True, features=None, drop_columns=None):
+        self.copy = copy
+        self.features = features  # nom -> formule (None: DEFAULT_FEATURES)
+        self.drop_columns = drop_columns  # colonnes sources supprimées (None: DEFAULT_DROPPED_COLUMNS)
+
+    def __setstate__(self, state):
+        # Modèles sérialisés avant le moteur d'expressions: features par défaut
+        state.setdefault("features", None)
+        state.setdefault("drop_columns", None)
+        super().__setstate__(state)
 
     def fit(self, X, y=None):
+        self._freeze_schema(X, reset=True)
         return self
 
-    def transform(self, X):
-        X = X.copy()
-        print("Feature Engineering Handler starting...")
-
-        # Surfaces
-        if all(col in X.columns for col in ["TotalBsmtSF", "1stFlrSF", "2ndFlrSF"]):
-            X["TotalSF"] = X["TotalBsmtSF"] + X["1stFlrSF"] + X["2ndFlrSF"]
-            X["TotalSF_AboveGround"] = X["1stFlrSF"] + X["2ndFlrSF"]
-            X["Has2ndFloor"] = (X["2ndFlrSF"] > 0).astype(int)
-            X["HasBasement"] = (X["TotalBsmtSF"] > 0).astype(int)
-
-        # Porches
-        porch_cols = ["OpenPorchSF", "3SsnPorch", "EnclosedPorch", "ScreenPorch", "WoodDeckSF"]
-        if all(col in X.columns for col in porch_cols):
-            X["TotalPorchSF"] = X["OpenPorchSF"] + X["3SsnPorch"] + X["EnclosedPorch"] + X["ScreenPorch"] + X["WoodDeckSF"]
-            X["HasPorch"] = (X["TotalPorchSF"] > 0).astype(int)
-            X["HasDeck"] = (X["WoodDeckSF"] > 0).astype(int)
-
-        if "PoolArea" in X.columns:
-            X["HasPool"] = (X["PoolArea"] > 0).astype(int)
-
-        # Ages
-        if "YrSold" in X.columns:
-            if "YearBuilt" in X.columns:
-                X["HouseAge"] = X["YrSold"] - X["YearBuilt"]
-                X["IsNew"] = (X["YearBuilt"] == X["YrSold"]).astype(int)
-
-            if "YearRemodAdd" in X.columns:
-                X["RemodAge"] = X["YrSold"] - X["YearRemodAdd"]
-                if "YearBuilt" in X.columns:
-                    X["HasBeenRemod"] = (X["YearRemodAdd"] != X["YearBuilt"]).astype(int)
-
-        # Temps
-        if all(col in X.columns for col in ["YrSold", "YearBuilt", "YearRemodAdd"]):
-            X["HouseAge"] = X["YrSold"] - X["YearBuilt"]
-            X["RemodAge"] = X["YrSold"] - X["YearRemodAdd"]
-            X["IsNew"] = (X["YrSold"] == X["YearBuilt"]).astype(int)
-            X["HasBeenRemod"] = (X["YearRemodAdd"] > X["YearBuilt"]).astype(int)
-            X["HouseAgeBin"] = pd.cut(
-                X["HouseAge"],
-                bins=[0, 5, 20, 50, 100, 200],
-                labels=["New", "Recent", "Moderate", "Old", "VeryOld"],
-                include_lowest=True,
-            )
+    def partial_fit(self, X, y=None):
+        self._freeze_schema(X)
+        return self
 
-        # Garage
-        if "GarageArea" in X.columns:
-            X["HasGarage"] = (X["GarageArea"] > 0).astype(int)
-        if all(col in X.columns for col in ["YrSold", "GarageYrBlt"]):
-            X["GarageAge"] = (X["YrSold"] - X["GarageYrBlt"]).clip(lower=0)
+    def _resolve(self, dtypes):
+        """(features calculables, colonnes sources à lire, colonnes à supprimer)."""
+        columns = dtypes.index
+        expressions = self.expressions
+        names = expressions.available(columns)
+        sources = list(dict.fromkeys(col for name in names for col in expressions.columns(name)))
+        drop_cols = DEFAULT_DROPPED_COLUMNS if self.drop_columns is None else self.drop_columns
+        return names, sources, [c for c in drop_cols if c in columns]
+
+    @property
+    def expressions(self) -> FeatureExpressions:
+        """Formules compilées (partagées entre instances de même configuration)."""
+        formulas = DEFAULT_FEATURES if self.features is None else self.features
+        return _compile_features(tuple(formulas.items()))
 
-        # Cheminée
-        if all(col in X.columns for col in ["Fireplaces", "FireplaceQu"]):
-            fireplace_map = {"None": 0, "Po": 1, "Fa": 2, "TA": 3, "Gd": 4, "Ex": 5}
-            X["HasFireplace"] = (X["Fireplaces"] > 0).astype(int)
-            X["FireplaceScore"] = X["Fireplaces"] * X["FireplaceQu"].map(fireplace_map).fillna(0)
+    def transform(self, X):
+        X = self._prepare(X)
+        logger.debug("Feature Engineering Handler starting...")
+
+        expressions = self.expressions
+        names, sources, drop_cols = self._resolved(X)
+        values = expressions.evaluate({col: _column_values(X[col]) for col in sources}, names)
+        for name in names:
+            X[name] = pd.Series(values[name], index=X.index, copy=False)  # Tableaux neufs: pas de recopie
+        logger.debug(
+            f"FeatureEngineer: {len(names)} features, {expressions.n_operations} opérations "
+            f"({expressions.n_operations_raw} avant élimination des sous-expressions communes)"
+        )
 
         # Suppressions
-        drop_cols = [
-            "1stFlrSF",
-            "2ndFlrSF",
-            "TotalBsmtSF",
-            "OpenPorchSF",
-            "3SsnPorch",
-            "EnclosedPorch",
-            "YearBuilt",
-            "YearRemodAdd",
-            "YrSold",
-            "GarageYrBlt",
-            "Fireplaces",
-        ]
-        X = X.drop(columns=[c for c in drop_cols if c in X.columns])
+        X.drop(columns=drop_cols, inplace=True)
 
         return X
 
 
-class OrdinalEncoderCustom(BaseEstimator, TransformerMixin):
-    """Custom ordinal encoder with predefined mappings."""
+@lru_cache(maxsize=32)
+def _compile_features(formulas):
+    return FeatureExpressions(dict(formulas), FEATURE_CONSTANTS)
+
+
+def _column_values(series):
+    """
+    Valeurs d'une colonne pour FeatureExpressions: tableau NumPy, float64 pour les dtypes
+    numériques pandas (Int64, Float64...), tableau pandas pour les chaînes (lookup sans conversion en objets).
+    """
+    if isinstance(series.dtype, np.dtype):
+        return series.to_numpy()
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return series.to_numpy(dtype=np.float64, na_value=np.nan)
+    return series.array
+
+
+class OrdinalEncoderCustom(_FrozenSchemaMixin, _CopyMixin, BaseEstimator, TransformerMixin):
+    """
+    Custom ordinal encoder with predefined mappings.
+
+    Les correspondances de ORDINAL_MAPPINGS sont compilées au fit en une table
+    (colonne x catégorie) appliquée en une seule passe vectorisée sur toutes les
+    colonnes ordinales. Les catégories absentes de la correspondance (et les NA)
+    reçoivent explicitement `unknown_value` au lieu de devenir NaN.
+    """
+
+    def __init__(self, copy=True, unknown_value=-1):
+        self.copy = copy
+        self.unknown_value = unknown_value
+
+    def __setstate__(self, state):
+        # Les modèles sérialisés avant les tables compilées encodaient les inconnues en NaN
+        state.setdefault("unknown_value", np.nan)
+        super().__setstate__(state)
 
     def fit(self, X, y=None):
+        self.columns_, self.categories_, self.table_ = self._compile(X.columns)
+        self._freeze_schema(X, reset=True)
+        self.unknown_categories_ = {}
+        self._record_unknown_categories(X)
+        return self
+
+    def partial_fit(self, X, y=None):
+        """Les tables ne dépendent que des colonnes: seules les catégories sans code sont cumulées."""
+        if not hasattr(self, "table_"):
+            return self.fit(X)
+        self._record_unknown_categories(X)
         return self
 
+    def _record_unknown_categories(self, X):
+        """Catégories vues à l'entraînement mais sans code ordinal."""
+        for col in self.columns_:
+            values = X[col].dropna()
+            unknown = values[~values.isin(list(ORDINAL_MAPPINGS[col]))]
+            if len(unknown):
+                seen = set(self.unknown_categories_.get(col, []))
+                self.unknown_categories_[col] = sorted(seen | set(map(str, unknown.unique())))
+                logger.warning(f"OrdinalEncoderCustom: catégories sans code dans {col}: {self.unknown_categories_[col]}")
+
+    def _resolve(self, dtypes):
+        """Tables du fit si toutes leurs colonnes sont présentes, sinon compilation sur les colonnes reçues."""
+        columns = dtypes.index
+        if hasattr(self, "table_") and all(col in columns for col in self.columns_):
+            return self.columns_, self.categories_, self.table_
+        return self._compile(columns)  # Non entraîné (anciens modèles) ou colonnes manquantes
+
+    def _compile(self, columns):
+        """(colonnes ordinales présentes, index des catégories, table colonne x catégorie)."""
+        columns = [col for col in ORDINAL_MAPPINGS if col in columns]
+        categories = {}
+        for col in columns:
+            for category in ORDINAL_MAPPINGS[col]:
+                categories.setdefault(category, len(categories))
+
+        # Dernière colonne de la table: code des catégories inconnues (index -1)
+        dtype = np.float64 if pd.isna(self.unknown_value) else np.int64
+        table = np.full((len(columns), len(categories) + 1), self.unknown_value, dtype=dtype)
+        for j, col in enumerate(columns):
+            for category, code in ORDINAL_MAPPINGS[col].items():
+                table[j, categories[category]] = code
+        return columns, categories, table
+
+    @staticmethod
+    def _encode_columns(block, categories, table):
+        """
+        Encode chaque colonne du bloc par une seule indexation dans sa ligne de table.
+
+        Les colonnes catégorielles réutilisent leurs codes; les autres sont indexées
+        par hachage (Index.get_indexer) ou, pour quelques lignes, par dictionnaire.
+        Les valeurs inconnues ou NA pointent vers la dernière colonne (code inconnu).
+        """
+        vocabulary = pd.Index(list(categories), dtype=object) if len(block) > _ORDINAL_DICT_MAX_ROWS else None
+        encoded = []
+        for j, col in enumerate(block.columns):
+            series = block[col]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                lut = _categorical_positions(series.dtype, tuple(categories))
+                encoded.append(table[j, lut][series.array.codes])
+                continue
+            if vocabulary is not None:
+                codes = vocabulary.get_indexer(series)
+            else:
+                codes = np.fromiter((categories.get(v, -1) for v in series.to_numpy(dtype=object)), np.intp, len(series))
+            encoded.append(table[j][codes])
+        return encoded
+
     def transform(self, X):
-        X = X.copy()
-        print("Ordinal Encoder Handler starting...")
-
-        quality_mapping = {"None": 0, "Po": 1, "Fa": 2, "TA": 3, "Gd": 4, "Ex": 5}
-        exposure_mapping = {"None": 0, "No": 1, "Mn": 2, "Av": 3, "Gd": 4}
-        garage_finish_mapping = {"None": 0, "Unf": 1, "RFn": 2, "Fin": 3}
-        functional_mapping = {"Sal": 0, "Sev": 1, "Maj2": 2, "Maj1": 3, "Mod": 4, "Min2": 5, "Min1": 6, "Typ": 7}
-        slope_mapping = {"Sev": 0, "Mod": 1, "Gtl": 2}
-        shape_mapping = {"IR3": 0, "IR2": 1, "IR1": 2, "Reg": 3}
-        contour_mapping = {"Low": 0, "HLS": 1, "Bnk": 2, "Lvl": 3}
-        house_age_mapping = {"New": 0, "Recent": 1, "Moderate": 2, "Old": 3, "VeryOld": 4}
-        fence_mapping = {"None": 0, "MnWw": 1, "GdWo": 2, "MnPrv": 3, "GdPrv": 4}
-        bsmt_fin_type_mapping = {"None": 0, "Unf": 1, "LwQ": 2, "Rec": 3, "BLQ": 4, "ALQ": 5, "GLQ": 6}
-
-        # Quality features
-        for col in [
-            "ExterQual",
-            "ExterCond",
-            "BsmtQual",
-            "BsmtCond",
-            "HeatingQC",
-            "KitchenQual",
-            "FireplaceQu",
-            "GarageQual",
-            "GarageCond",
-            "PoolQC",
-        ]:
-            if col in X.columns:
-                X[col] = X[col].map(quality_mapping)
-
-        # Other ordinal features
-        if "BsmtExposure" in X.columns:
-            X["BsmtExposure"] = X["BsmtExposure"].map(exposure_mapping)
-        if "GarageFinish" in X.columns:
-            X["GarageFinish"] = X["GarageFinish"].map(garage_finish_mapping)
-        if "Functional" in X.columns:
-            X["Functional"] = X["Functional"].map(functional_mapping)
-        if "LandSlope" in X.columns:
-            X["LandSlope"] = X["LandSlope"].map(slope_mapping)
-        if "LotShape" in X.columns:
-            X["LotShape"] = X["LotShape"].map(shape_mapping)
-        if "LandContour" in X.columns:
-            X["LandContour"] = X["LandContour"].map(contour_mapping)
-        if "HouseAgeBin" in X.columns:
-            X["HouseAgeBin"] = X["HouseAgeBin"].map(house_age_mapping)
-        if "Fence" in X.columns:
-            X["Fence"] = X["Fence"].map(fence_mapping)
-
-        # Basement finish type mapping
-        for col in ["BsmtFinType1", "BsmtFinType2"]:
-            if col in X.columns:
-                X[col] = X[col].map(bsmt_fin_type_mapping)
+        X = self._prepare(X)
+        logger.debug("Ordinal Encoder Handler starting...")
+
+        columns, categories, table = self._resolved(X)
+        if not columns:
+            return X
+
+        encoded = self._encode_columns(X[columns], categories, table)
+        is_unknown = np.isnan if pd.isna(self.unknown_value) else (lambda values: values == self.unknown_value)
+        n_unknown = sum(int(is_unknown(values).sum()) for values in encoded)
+        if n_unknown:
+            logger.warning(
+                f"OrdinalEncoderCustom: {n_unknown} valeurs inconnues ou manquantes encodées en {self.unknown_value}"
+            )
 
+        for col, values in zip(columns, encoded):
+            X[col] = values
         return X
 
 
-class SkewnessCorrector(BaseEstimator, TransformerMixin):
+def _sorted_distinct(column):
+    """Valeurs distinctes (hors NaN) d'une colonne triée."""
+    column = column[~np.isnan(column)]
+    if len(column) == 0:
+        return column
+    return column[np.r_[True, column[1:] != column[:-1]]]
+
+
+class SkewnessCorrector(_FrozenSchemaMixin, _CopyMixin, BaseEstimator, TransformerMixin):
     """
     Corrige l'asymétrie (skewness) des variables numériques.
     Applique log1p si |skew| > 0.75.
+
+    Les statistiques nécessaires (minimum, valeurs distinctes jusqu'au seuil de
+    cardinalité, effectif et moments centrés, voir moments.py) sont calculées en une
+    passe vectorisée sur toutes les colonnes numériques. Elles sont fusionnables:
+    partial_fit accumule des morceaux successifs d'un jeu trop grand pour la mémoire.
     """
 
-    def __init__(self, threshold=0.75):
+    def __init__(self, threshold=0.75, copy=True):
         self.threshold = threshold
+        self.copy = copy
         self.skewed_features = []
 
     def fit(self, X, y=None):
         print("Skewness Corrector Handler starting...")
-        # Identifier les variables numériques
-        numeric_features = X.select_dtypes(include=[np.number]).columns.tolist()
-
-        for col in numeric_features:
-            # Vérifier conditions: non-négatif et assez de valeurs uniques (éviter binaires)
-            if X[col].min() >= 0 and X[col].nunique() > 10:
-                try:
-                    skew_val = skew(X[col].dropna())
-                    if abs(skew_val) > self.threshold:
-                        self.skewed_features.append(col)
-                        print(f"  Feature détectée asymétrique: {col} (skew={skew_val:.2f})")
-                except Exception:
-                    pass
-
+        # Réinitialisation: un second fit ne cumule pas les features du premier
+        self._reset()
+        self.partial_fit(X)
+        for col in self.skewed_features:
+            print(f"  Feature détectée asymétrique: {col} (skew={self.skewness_[self.columns_.index(col)]:.2f})")
         print(f"  Total features asymétriques à corriger: {len(self.skewed_features)}")
         return self
 
+    def partial_fit(self, X, y=None):
+        """Met à jour les accumulateurs avec un morceau de données puis la liste des features asymétriques."""
+        if not hasattr(self, "moments_"):
+            self._reset()
+
+        # Identifier les variables numériques (les nouvelles colonnes démarrent avec des accumulateurs vides)
+        columns = X.select_dtypes(include=[np.number]).columns.tolist()
+        new_columns = [col for col in columns if col not in set(self.columns_)]
+        if new_columns:
+            k = len(new_columns)
+            self.columns_ = self.columns_ + new_columns
+            self.moments_ = np.hstack([self.moments_, empty_moments(k)])
+            self.distinct_ = self.distinct_ + [set() for _ in new_columns]
+        position = {col: i for i, col in enumerate(self.columns_)}
+        idx = np.array([position[col] for col in columns], dtype=np.intp)
+
+        values = X[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        merged = self.moments_[:, idx]
+        # Blocs de lignes qui tiennent en cache, fusionnés au fil de l'eau
+        for start in range(0, len(values), _MOMENTS_BLOCK_ROWS):
+            merged = merge_moments(merged, chunk_moments(values[start : start + _MOMENTS_BLOCK_ROWS]))
+        self.moments_[:, idx] = merged
+
+        self._update_distinct(X, columns, values, idx)
+        self._update_skewed_features()
+        self._freeze_schema(X)
+        return self
+
+    def _reset(self):
+        self.schema_in_ = None
+        self.columns_ = []
+        self.moments_ = empty_moments(0)  # Accumulateur de moments (moments.py), une colonne par variable
+        self.distinct_ = []  # Valeurs distinctes vues, None au-delà du seuil de cardinalité
+        self.skewness_ = np.zeros(0)
+        self.skewed_features = []
+
+    def _update_distinct(self, X, columns, values, idx):
+        """
+        Cardinalité bornée: on ne garde les valeurs distinctes que jusqu'au seuil (au-delà: None).
+        Un premier échantillon trié suffit à saturer la plupart des variables continues;
+        seules les colonnes restantes (discrètes) sont parcourues en entier.
+        """
+        open_columns = [j for j, i in enumerate(idx) if self.distinct_[i] is not None]
+        if not open_columns:
+            return
+        probe = np.sort(values[:_DISTINCT_PROBE_ROWS, open_columns], axis=0)
+        remaining = [j for m, j in enumerate(open_columns) if not self._add_distinct(idx[j], _sorted_distinct(probe[:, m]))]
+        if len(values) > _DISTINCT_PROBE_ROWS:
+            # Hachage sur la colonne d'origine (contiguë, dtype natif) plutôt que sur la matrice float
+            for j in remaining:
+                distinct = X[columns[j]].dropna().unique()
+                self._add_distinct(idx[j], np.asarray(distinct, dtype=np.float64))
+
+    def _add_distinct(self, i, distinct):
+        """Ajoute des valeurs distinctes à la colonne i; renvoie True si la colonne est saturée."""
+        if len(distinct) <= _SKEW_MAX_DISCRETE_UNIQUE:
+            self.distinct_[i].update(distinct.tolist())
+        if len(distinct) > _SKEW_MAX_DISCRETE_UNIQUE or len(self.distinct_[i]) > _SKEW_MAX_DISCRETE_UNIQUE:
+            self.distinct_[i] = None
+            return True
+        return False
+
+    def _update_skewed_features(self):
+        # Coefficient d'asymétrie biaisé, comme scipy.stats.skew
+        with np.errstate(invalid="ignore", divide="ignore"):
+            n, m2, m3 = self.moments_[N], self.moments_[M2], self.moments_[M3]
+            self.skewness_ = np.sqrt(n) * m3 / m2**1.5
+        # Conditions: non-négatif et assez de valeurs uniques (éviter binaires)
+        continuous = np.array([distinct is None for distinct in self.distinct_], dtype=bool)
+        mask = (self.moments_[MIN] >= 0) & continuous & (np.abs(self.skewness_) > self.threshold)
+        self.skewed_features = [col for col, skewed in zip(self.columns_, mask) if skewed]
+
+    def _resolve(self, dtypes):
+        return [col for col in self.skewed_features if col in dtypes.index]
+
     def transform(self, X):
-        X = X.copy()
-        print("Skewness Corrector applying transformation...")
-        for col in self.skewed_features:
+        X = self._prepare(X)
+        logger.debug("Skewness Corrector applying transformation...")
+        for col in self._resolved(X):
+            X[col] = np.log1p(X[col])
+        return X
+
+
+def _vif_elimination(corr, threshold):
+    """
+    Retire une à une les colonnes de plus grand VIF tant qu'il dépasse `threshold`.
+
+    Tous les VIF d'une itération sont lus sur la diagonale de l'inverse de la matrice de
+    corrélation; une légère régularisation rend les colinéarités exactes (VIF infini)
+    inversibles avec un VIF très grand, retiré en premier.
+
+    Returns:
+        Tuple (indices conservés, VIF de chaque colonne: final ou au moment de son retrait)
+    """
+    keep = list(range(len(corr)))
+    vif = np.full(len(corr), np.nan)
+    while len(keep) > 1:
+        sub = corr[np.ix_(keep, keep)] + _VIF_RIDGE * np.eye(len(keep))
+        values = np.diag(np.linalg.inv(sub))
+        vif[keep] = values
+        worst = int(np.argmax(values))
+        if values[worst] <= threshold:
+            break
+        del keep[worst]
+    return keep, vif
+
+
+def _columns_mutual_info(values, y, random_state):
+    """Information mutuelle colonne par colonne: même estimation quel que soit le découpage en blocs."""
+    from sklearn.feature_selection import mutual_info_regression
+
+    return np.array(
+        [
+            mutual_info_regression(values[:, [j]], y, discrete_features=False, random_state=random_state)[0]
+            for j in range(values.shape[1])
+        ]
+    )
+
+
+def _mutual_info(values, y, n_jobs, random_state):
+    """mutual_info_regression par blocs de colonnes, un bloc par worker joblib."""
+    from joblib import Parallel, delayed, effective_n_jobs
+
+    n_blocks = min(effective_n_jobs(n_jobs), values.shape[1])
+    if n_blocks <= 1:
+        return _columns_mutual_info(values, y, random_state)
+    blocks = np.array_split(np.arange(values.shape[1]), n_blocks)
+    scores = Parallel(n_jobs=n_blocks)(delayed(_columns_mutual_info)(values[:, block], y, random_state) for block in blocks)
+    return np.concatenate(scores)
+
+
+class FeatureSelector(_FrozenSchemaMixin, _CopyMixin, BaseEstimator, TransformerMixin):
+    """
+    Élagage des variables numériques redondantes (VIF) ou sans lien avec la cible (information mutuelle).
+
+    Les VIF de toutes les colonnes sont calculés d'un coup, sur la diagonale de l'inverse de
+    la matrice de corrélation (au lieu d'une régression par colonne avec statsmodels): la
+    colonne de plus grand VIF est retirée puis les VIF recalculés, jusqu'à vif_threshold.
+    L'information mutuelle des colonnes restantes avec la cible est estimée par blocs de
+    colonnes en parallèle (n_jobs), sur un échantillon borné à mi_max_samples lignes; les
+    colonnes d'information mutuelle <= mi_threshold sont retirées.
+
+    partial_fit accumule les sommes et produits croisés (corrélations exactes) et un
+    échantillon uniforme des lignes (clés aléatoires les plus petites), fusionnables par morceaux.
+    La sélection est calculée une fois, par finalize() (appelée par fit et fit_out_of_core,
+    sinon au premier transform qui suit des partial_fit).
+
+    Args:
+        vif_threshold: VIF maximal conservé (None: VIF calculés sans élagage)
+        mi_threshold: Information mutuelle minimale conservée (None: pas d'élagage par information mutuelle)
+        n_jobs: Workers joblib pour l'information mutuelle
+        mi_max_samples: Taille de l'échantillon de l'information mutuelle
+        random_state: Graine de l'échantillonnage et de l'estimateur d'information mutuelle
+    """
+
+    def __init__(self, vif_threshold=10.0, mi_threshold=0.0, n_jobs=None, mi_max_samples=20_000, random_state=0, copy=True):
+        self.vif_threshold = vif_threshold
+        self.mi_threshold = mi_threshold
+        self.n_jobs = n_jobs
+        self.mi_max_samples = mi_max_samples
+        self.random_state = random_state
+        self.copy = copy
+
+    def fit(self, X, y=None):
+        self._reset()
+        self.partial_fit(X, y).finalize()
+        logger.info(f"FeatureSelector: {len(self.dropped_columns_)} colonnes retirées sur {len(self.columns_)}")
+        return self
+
+    def partial_fit(self, X, y=None):
+        """Met à jour les produits croisés et l'échantillon avec un morceau (sélection différée: finalize)."""
+        if not hasattr(self, "columns_"):
+            self._reset()
+        if self.columns_ is None:
+            self.columns_ = X.select_dtypes(include=[np.number]).columns.tolist()
+        values = X[self.columns_].to_numpy(dtype=np.float64, na_value=np.nan)
+        complete = ~np.isnan(values).any(axis=1)
+        values = values[complete]
+        if self.shift_ is None and len(values):
+            self.shift_ = values.mean(axis=0)  # Décalage: produits croisés sans annulation catastrophique
+        if len(values):
+            centered = values - self.shift_
+            self.n_samples_seen_ += len(values)
+            self.sum_ += centered.sum(axis=0)
+            self.cross_ += centered.T @ centered
+        if y is not None:
+            target = np.asarray(y, dtype=np.float64)[complete]
+            self._sample(values, target)
+        if self.schema_in_ is None:
+            self.schema_in_ = ColumnSchema.from_frame(X)
+        self.finalize_pending_ = True
+        return self
+
+    def finalize(self):
+        """Sélection (VIF puis information mutuelle) à partir des statistiques cumulées."""
+        self._update_selection()
+        self.resolved_ = self._resolve(self.schema_in_.dtypes_series())
+        self.finalize_pending_ = False
+        return self
+
+    def _reset(self):
+        self.schema_in_ = None
+        self.columns_ = None
+        self.shift_ = None
+        self.n_samples_seen_ = 0
+        self.sum_ = 0.0
+        self.cross_ = 0.0
+        self.sample_ = self.sample_target_ = self.sample_keys_ = None
+        self.random_state_ = check_random_state(self.random_state)
+        self.vif_ = pd.Series(dtype=np.float64)
+        self.mutual_info_ = pd.Series(dtype=np.float64)
+        self.dropped_columns_ = []
+        self.finalize_pending_ = False
+
+    def _sample(self, values, target):
+        keys = self.random_state_.random_sample(len(values))
+        if self.sample_ is not None:
+            values = np.concatenate([self.sample_, values])
+            target = np.concatenate([self.sample_target_, target])
+            keys = np.concatenate([self.sample_keys_, keys])
+        if len(keys) > self.mi_max_samples:
+            keep = np.sort(np.argpartition(keys, self.mi_max_samples)[: self.mi_max_samples])
+            values, target, keys = values[keep], target[keep], keys[keep]
+        self.sample_, self.sample_target_, self.sample_keys_ = values, target, keys
+
+    def _correlation(self):
+        n = self.n_samples_seen_
+        mean = self.sum_ / n
+        covariance = self.cross_ / n - np.outer(mean, mean)
+        scale = np.sqrt(np.clip(np.diag(covariance), 0, None))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return covariance / np.outer(scale, scale), scale
+
+    def _update_selection(self):
+        columns = np.array(self.columns_ or [], dtype=object)
+        if self.n_samples_seen_ < 2 or not len(columns):
+            return
+        corr, scale = self._correlation()
+        varying = np.flatnonzero(scale > _VIF_MIN_SCALE * np.maximum(np.abs(self.shift_), 1.0))
+        dropped = [col for j, col in enumerate(columns) if j not in set(varying)]  # Colonnes constantes
+
+        keep = varying
+        vif = np.full(len(columns), np.nan)
+        if len(varying) > 1:  # VIF toujours calculés (rapport); élagage seulement avec un seuil
+            threshold = np.inf if self.vif_threshold is None else self.vif_threshold
+            kept, vif[varying] = _vif_elimination(corr[np.ix_(varying, varying)], threshold)
+            keep = varying[kept]
+            dropped += [col for col in columns[varying] if col not in set(columns[keep])]
+        self.vif_ = pd.Series(vif, index=self.columns_)
+
+        self.mutual_info_ = pd.Series(np.nan, index=self.columns_)
+        if self.mi_threshold is not None and self.sample_ is not None and len(self.sample_) > _MI_MIN_SAMPLES:
+            scores = _mutual_info(self.sample_[:, keep], self.sample_target_, self.n_jobs, self.random_state)
+            self.mutual_info_.iloc[keep] = scores
+            dropped += [col for col, score in zip(columns[keep], scores) if score <= self.mi_threshold]
+        self.dropped_columns_ = [col for col in self.columns_ if col in set(dropped)]
+
+    def _resolve(self, dtypes):
+        return [col for col in self.dropped_columns_ if col in dtypes.index]
+
+    def transform(self, X):
+        if getattr(self, "finalize_pending_", False):
+            self.finalize()
+        X = self._prepare(X)
+        columns = self._resolved(X)
+        if columns:
+            X.drop(columns=columns, inplace=True)
+        return X
+
+
+class TargetFrequencyEncoder(_FrozenSchemaMixin, _CopyMixin, BaseEstimator, TransformerMixin):
+    """
+    Encodage compact des variables nominales à forte cardinalité: moyenne de la cible et fréquence.
+
+    Chaque colonne encodée est remplacée par deux colonnes numériques, `<col>_target`
+    (moyenne lissée de la cible par modalité: (somme + smoothing * moyenne globale) /
+    (effectif + smoothing)) et `<col>_freq` (proportion de la modalité à l'entraînement),
+    au lieu d'une colonne one-hot par modalité. Modalités inconnues et NA: moyenne globale
+    et fréquence 0.
+
+    fit_transform(X, y) encode les lignes d'entraînement hors fold (KFold à `cv` plis): la
+    moyenne d'une ligne est calculée sans les lignes de son pli, le modèle ne voit donc pas
+    sa propre cible. transform (et fit puis transform) utilise les moyennes de tout l'entraînement.
+
+    partial_fit accumule sommes et effectifs par modalité (fusionnables par morceaux).
+
+    Args:
+        columns: Colonnes encodées (absentes ignorées)
+        smoothing: Effectif fictif de la moyenne globale dans le lissage
+        cv: Nombre de plis de l'encodage hors fold de fit_transform
+        random_state: Graine du découpage en plis
+        dtype: dtype des colonnes produites
+    """
+
+    def __init__(self, columns=HIGH_CARDINALITY_NOMINALS, smoothing=10.0, cv=5, random_state=0, dtype="float64", copy=True):
+        self.columns = columns
+        self.smoothing = smoothing
+        self.cv = cv
+        self.random_state = random_state
+        self.dtype = dtype
+        self.copy = copy
+
+    def fit(self, X, y=None):
+        self.stats_ = None
+        return self.partial_fit(X, y)
+
+    def partial_fit(self, X, y=None):
+        """Met à jour sommes et effectifs par modalité avec un morceau, puis les tables d'encodage."""
+        if y is None:
+            raise ValueError("TargetFrequencyEncoder: la cible est requise (fit(X, y))")
+        target = pd.Series(np.asarray(y, dtype=np.float64), index=X.index)
+        if getattr(self, "stats_", None) is None:
+            self.stats_ = {}
+            self.schema_in_ = None
+            self.n_samples_seen_ = 0
+            self.target_sum_ = 0.0
+        self.n_samples_seen_ += len(X)
+        self.target_sum_ += float(target.sum())
+        for col in self.columns:
+            if col not in X.columns:
+                continue
+            chunk = target.groupby(X[col], observed=True, dropna=True).agg(["sum", "count"])
+            chunk.index = pd.Index(chunk.index.astype(object))
+            stats = self.stats_.get(col)
+            self.stats_[col] = chunk if stats is None else stats.add(chunk, fill_value=0.0)
+        self._update_tables()
+        self._freeze_schema(X)
+        return self
+
+    def _update_tables(self):
+        self.prior_ = self.target_sum_ / self.n_samples_seen_ if self.n_samples_seen_ else 0.0
+        self.categories_, self.target_, self.frequency_, self.lookups_ = {}, {}, {}, {}
+        for col, stats in self.stats_.items():
+            self.categories_[col] = stats.index
+            self.target_[col] = self._smooth(stats["sum"].to_numpy(), stats["count"].to_numpy(), self.prior_)
+            self.frequency_[col] = stats["count"].to_numpy() / self.n_samples_seen_
+            self.lookups_[col] = dict(zip(stats.index, zip(self.target_[col].tolist(), self.frequency_[col].tolist())))
+
+    def _smooth(self, sums, counts, prior):
+        return (sums + self.smoothing * prior) / (counts + self.smoothing)
+
+    def _resolve(self, dtypes):
+        return [col for col in self.categories_ if col in dtypes.index]
+
+    def output_columns(self, col):
+        """Colonnes produites pour `col`."""
+        return [f"{col}_target", f"{col}_freq"]
+
+    def transform(self, X):
+        # Nouveau DataFrame (colonnes encodées retirées, bloc encodé ajouté): X n'est pas modifié, sans copie préalable
+        columns = self._resolved(X)
+        if not columns:
+            return X
+        if len(X) <= _ORDINAL_DICT_MAX_ROWS:
+            # Petits batches (requêtes unitaires): une conversion objet, recherche par dictionnaire
+            unknown = (self.prior_, 0.0)
+            values = [
+                [self.lookups_[col].get(v, unknown) for v in column]
+                for col, column in zip(columns, X[columns].to_numpy(dtype=object).T)
+            ]
+            block = np.array(values, dtype=np.float64).transpose(1, 0, 2).reshape(len(X), -1)
+        else:
+            encoded = []
+            for col in columns:
+                # Une recherche par modalité distincte du batch, puis indexation par les codes (NA: code -1)
+                codes, uniques = pd.factorize(X[col])
+                positions = self.categories_[col].get_indexer(np.asarray(uniques, dtype=object))
+                known = positions >= 0
+                target = np.append(np.where(known, self.target_[col][positions], self.prior_), self.prior_)
+                frequency = np.append(np.where(known, self.frequency_[col][positions], 0.0), 0.0)
+                encoded += [target[codes], frequency[codes]]
+            block = np.column_stack(encoded)
+        names = [name for col in columns for name in self.output_columns(col)]
+        encoded = pd.DataFrame(block.astype(self.dtype, copy=False), index=X.index, columns=names)
+        return pd.concat([X.drop(columns=columns), encoded], axis=1)  # Un seul bloc ajouté
+
+    def fit_transform(self, X, y=None, **fit_params):
+        """fit puis transform, avec l'encodage de la cible hors fold pour les lignes d'entraînement."""
+        self.fit(X, y)
+        encoded = self.transform(X)
+        target = np.asarray(y, dtype=np.float64)
+        folds = np.empty(len(X), dtype=np.intp)
+        for k, (_, test) in enumerate(KFold(self.cv, shuffle=True, random_state=self.random_state).split(X)):
+            folds[test] = k
+        fold_sums = np.bincount(folds, weights=target, minlength=self.cv)
+        fold_counts = np.bincount(folds, minlength=self.cv)
+        fold_prior = (target.sum() - fold_sums) / (len(target) - fold_counts)  # Moyenne globale hors fold
+        for col in self.resolved_:
+            codes, uniques = pd.factorize(X[col])
+            valid = codes >= 0
+            cells = folds[valid] * len(uniques) + codes[valid]  # (pli, modalité)
+            sums = np.bincount(cells, weights=target[valid], minlength=self.cv * len(uniques)).reshape(self.cv, -1)
+            counts = np.bincount(cells, minlength=self.cv * len(uniques)).reshape(self.cv, -1)
+            oof_sums, oof_counts = sums.sum(axis=0) - sums, counts.sum(axis=0) - counts
+            values = fold_prior[folds].copy()
+            rows = folds[valid], codes[valid]
+            values[valid] = self._smooth(oof_sums[rows], oof_counts[rows], fold_prior[folds[valid]])
+            encoded[self.output_columns(col)[0]] = values.astype(self.dtype, copy=False)
+        return encoded
+
+
+class NumericCaster(_FrozenSchemaMixin, _CopyMixin, BaseEstimator, TransformerMixin):
+    """
+    Convertit les variables numériques dans le dtype de la politique de précision.
+
+    Placé avant le ColumnTransformer final par create_full_pipeline(dtype="float32"):
+    StandardScaler conserve alors le float32 et la matrice de features, comme les
+    coefficients du modèle, occupe deux fois moins de mémoire. Les colonnes à convertir
+    sont résolues au fit (schéma figé).
+    """
+
+    _check_dtypes = True  # Les colonnes converties dépendent des dtypes reçus
+
+    def __init__(self, dtype="float32", copy=True):
+        self.dtype = dtype
+        self.copy = copy
+
+    def fit(self, X, y=None):
+        self._freeze_schema(X, reset=True)
+        return self
+
+    def partial_fit(self, X, y=None):
+        self._freeze_schema(X)
+        return self
+
+    def _resolve(self, dtypes):
+        target = np.dtype(self.dtype)
+        return [
+            col
+            for col, dtype in dtypes.items()
+            if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype) and dtype != target
+        ]
+
+    def transform(self, X):
+        X = self._prepare(X)
+        columns = self._resolved(X)
+        if columns:
+            # Un seul bloc converti (NA des dtypes pandas nullables -> NaN)
+            X[columns] = X[columns].to_numpy(dtype=self.dtype, na_value=np.nan)
+        return X
+
+
+class CategoricalCaster(_FrozenSchemaMixin, _CopyMixin, BaseEstimator, TransformerMixin):
+    """
+    Convertit les variables catégorielles (chaînes) en pandas Categorical de vocabulaire figé.
+
+    Le vocabulaire de chaque colonne est appris au fit: modalités observées, plus
+    `extra_categories` (valeurs que les étapes suivantes peuvent introduire, comme
+    'None' ou 'Autres') et `known_categories` (colonne -> modalités connues des encodeurs,
+    ex: ORDINAL_MAPPINGS, même si absentes de l'entraînement), suivi de
+    UNKNOWN_CATEGORY qui reçoit les modalités inconnues:
+    elles restent ainsi distinctes des NA et sont traitées comme avant par l'imputation,
+    les encodeurs et le OneHotEncoder. Les dtypes produits sont identiques d'un batch à
+    l'autre: les étapes suivantes travaillent sur les codes entiers (imputation, quartiers,
+    encodage ordinal, blocs one-hot) et leur schéma figé est toujours reconnu.
+    """
+
+    def __init__(self, extra_categories=(), known_categories=None, copy=True):
+        self.extra_categories = extra_categories
+        self.known_categories = known_categories
+        self.copy = copy
+
+    def fit(self, X, y=None):
+        self.categories_ = None
+        return self.partial_fit(X)
+
+    def partial_fit(self, X, y=None):
+        if getattr(self, "categories_", None) is None:
+            self.categories_ = {}
+            self.schema_in_ = None
+            self.observed_categories_ = {}
+            columns = [col for col, dtype in X.dtypes.items() if _is_categorical_dtype(dtype)]
+        else:
+            columns = list(self.categories_)
+        for col in columns:
             if col in X.columns:
-                X[col] = np.log1p(X[col])
+                observed = self.observed_categories_.setdefault(col, set())
+                observed.update(X[col].dropna().unique().tolist())
+        known = self.known_categories or {}
+        for col, observed in self.observed_categories_.items():
+            vocabulary = sorted(observed | set(self.extra_categories) | set(known.get(col, ())), key=str)
+            vocabulary.append(UNKNOWN_CATEGORY)
+            self.categories_[col] = pd.CategoricalDtype(vocabulary)
+        self._freeze_schema(X)
+        return self
+
+    def _resolve(self, dtypes):
+        """Colonnes à convertir présentes dans le schéma."""
+        return [col for col in self.categories_ if col in dtypes.index]
+
+    def transform(self, X):
+        X = self._prepare(X)
+        dtypes = dict(zip(X.columns, X.dtypes))
+        columns = [col for col in self._resolved(X) if not _same_dtype(dtypes[col], self.categories_[col])]
+        if not columns:
+            return X
+        if len(X) <= _ORDINAL_DICT_MAX_ROWS:
+            # Petits batches (requêtes unitaires): une seule conversion objet (moins coûteuse sur tout
+            # le DataFrame qu'après sélection des colonnes), recherche par dictionnaire
+            values = X.to_numpy(dtype=object)
+            positions = X.columns.get_indexer(columns)
+            codes = [self._lookup_codes(values[:, j], self.categories_[col]) for j, col in zip(positions, columns)]
+        else:
+            codes = [self._codes(X[col], self.categories_[col]) for col in columns]
+        for col, col_codes in zip(columns, codes):
+            X[col] = pd.Categorical.from_codes(col_codes, dtype=self.categories_[col], validate=False)
         return X
 
+    @staticmethod
+    def _lookup_codes(values, dtype):
+        """Codes d'un tableau objet par dictionnaire (NA -> -1, modalité inconnue -> UNKNOWN_CATEGORY)."""
+        lookup = _category_lookup(dtype)
+        unknown = len(lookup) - 1
+        return np.fromiter((lookup.get(v, unknown) if v == v and v is not None else -1 for v in values), np.int64, len(values))
+
+    @staticmethod
+    def _codes(series, dtype):
+        """Codes dans le vocabulaire: -1 pour les NA, code de UNKNOWN_CATEGORY pour les modalités inconnues."""
+        categories = dtype.categories
+        unknown = len(categories) - 1
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Recodage des seules catégories sources, puis indexation par les codes
+            positions = _categorical_positions(series.dtype, tuple(categories))[:-1]
+            lut = np.append(np.where(positions < 0, unknown, positions), -1)  # NA (code -1) conservés
+            return lut[series.array.codes]
+        codes = categories.get_indexer(series)
+        codes[(codes < 0) & series.notna().to_numpy()] = unknown
+        return codes
+
+
+def _same_dtype(dtype, categorical_dtype):
+    """Même dtype Categorical (identité d'abord: les colonnes converties partagent le dtype du vocabulaire)."""
+    return dtype is categorical_dtype or (isinstance(dtype, pd.CategoricalDtype) and dtype == categorical_dtype)
+
+
+@lru_cache(maxsize=256)
+def _category_lookup(dtype):
+    """Dictionnaire modalité -> code d'un vocabulaire (partagé entre les batches)."""
+    return {category: code for code, category in enumerate(dtype.categories)}
+
+
+@lru_cache(maxsize=512)
+def _categorical_positions(dtype, vocabulary):
+    """
+    Position de chaque catégorie d'un dtype Categorical dans `vocabulary` (-1 si absente),
+    suivie de -1 pour le code des NA: `table[codes]` encode la colonne sans toucher aux valeurs.
+    """
+    positions = {category: i for i, category in enumerate(vocabulary)}
+    return np.array([positions.get(category, -1) for category in dtype.categories] + [-1], dtype=np.intp)
 
-class DebugTransformer(BaseEstimator, TransformerMixin):
-    """Debug transformer to log data state."""
+
+def _is_categorical_dtype(dtype):
+    """Chaînes (object, str) ou Categorical: variables nominales du pipeline."""
+    return isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype)
+
+
+class DataQualityMonitor(_FrozenSchemaMixin, BaseEstimator, TransformerMixin):
+    """
+    Surveillance échantillonnée de la qualité des données en production.
+
+    Au fit, l'étape retient les bornes observées des variables numériques et les
+    modalités connues des variables catégorielles. En transform, seule une fraction
+    `sample_rate` des batches est inspectée: NaN, valeurs hors des bornes
+    d'entraînement et modalités inconnues y sont comptés par colonne dans des
+    compteurs cumulés (report, summary, reset_counters). Les autres batches traversent
+    l'étape sans aucun calcul, et X est toujours renvoyé tel quel. Les données
+    d'entraînement (fit_transform) ne sont pas comptées.
+    """
+
+    def __init__(self, sample_rate=0.01, random_state=None):
+        self.sample_rate = sample_rate
+        self.random_state = random_state
 
     def fit(self, X, y=None):
+        self.columns_ = None
+        return self.partial_fit(X)
+
+    def partial_fit(self, X, y=None):
+        if getattr(self, "columns_", None) is None:
+            self.columns_ = list(X.columns)
+            self.lower_ = np.full(len(self.columns_), np.nan)
+            self.upper_ = np.full(len(self.columns_), np.nan)
+            self.categories_ = {
+                col: pd.Index([]) for col, dtype in X.dtypes.items() if not pd.api.types.is_numeric_dtype(dtype)
+            }
+            self.schema_in_ = None
+            self._freeze_schema(X)
+            self.reset_counters()
+
+        # Bornes fusionnables: min / max cumulés (NaN ignorés), union des modalités
+        numeric, numeric_positions, categorical, _ = self._resolved(X)
+        if numeric and len(X):
+            values = X[numeric].to_numpy(dtype=np.float64, na_value=np.nan)
+            self.lower_[numeric_positions] = np.fmin(self.lower_[numeric_positions], np.fmin.reduce(values, axis=0))
+            self.upper_[numeric_positions] = np.fmax(self.upper_[numeric_positions], np.fmax.reduce(values, axis=0))
+        for col in categorical:
+            self.categories_[col] = self.categories_[col].union(pd.Index(X[col].dropna().unique().tolist()))
+        self._known_categories = {col: frozenset(categories) for col, categories in self.categories_.items()}
+        return self
+
+    def fit_transform(self, X, y=None, **fit_params):
+        # Les données d'entraînement ne sont pas comptées
+        self.fit(X, y)
+        return X
+
+    def _resolve(self, dtypes):
+        """Colonnes surveillées présentes: numériques (bornes) et catégorielles (modalités), avec leurs positions."""
+        index = pd.Index(self.columns_)
+        numeric = [
+            col
+            for col, dtype in dtypes.items()
+            if col not in self.categories_
+            and col in index
+            and pd.api.types.is_numeric_dtype(dtype)
+            and not pd.api.types.is_bool_dtype(dtype)
+        ]
+        categorical = [col for col in dtypes.index if col in self.categories_]
+        return numeric, index.get_indexer(numeric), categorical, index.get_indexer(categorical)
+
+    def reset_counters(self):
+        """Remet à zéro les compteurs (ex: après un redéploiement ou une lecture périodique)."""
+        n_columns = len(self.columns_)
+        self.nan_counts_ = np.zeros(n_columns, dtype=np.int64)
+        self.out_of_range_counts_ = np.zeros(n_columns, dtype=np.int64)
+        self.unseen_counts_ = np.zeros(n_columns, dtype=np.int64)
+        self.batches_seen_ = 0
+        self.batches_sampled_ = 0
+        self.rows_observed_ = 0
+        self.rng_ = check_random_state(self.random_state)
         return self
 
     def transform(self, X):
-        print("\n--- DEBUG: Après prétraitement ---")
-        print("Dimension:", X.shape)
-        num_nans = X.isnull().sum().sum()
-        print("Nombre de NaNs:", num_nans)
-        if num_nans > 0:
-            print("Colonnes avec NAN et leurs types:")
-            nan_cols_df = X.isnull().sum()
-            nan_cols_df = nan_cols_df[nan_cols_df > 0]
-            for col in nan_cols_df.index:
-                print(f"  - {col}: Dtype={X[col].dtype}, NaNs={nan_cols_df[col]}")
+        if self.should_sample():
+            self.observe(X)
+        return X
+
+    def should_sample(self) -> bool:
+        """Compte un batch et tire au sort son inspection (probabilité sample_rate)."""
+        self.batches_seen_ += 1
+        return self.sample_rate >= 1 or (self.sample_rate > 0 and self.rng_.random_sample() < self.sample_rate)
+
+    def observe(self, X):
+        """Met à jour les compteurs avec un batch échantillonné."""
+        numeric, numeric_positions, categorical, categorical_positions = self._resolved(X)
+        index = pd.Index(self.columns_)
+        positions = index.get_indexer(X.columns)
+        if len(X) <= _MONITOR_DICT_MAX_ROWS:
+            # Petits batches (requêtes unitaires): une seule conversion, modalités testées par ensemble
+            values = X.to_numpy(dtype=object)
+            missing = pd.isna(values)
+            numeric_values = np.where(missing, np.nan, values)[:, X.columns.get_indexer(numeric)].astype(np.float64)
+            for j, position in zip(X.columns.get_indexer(categorical), categorical_positions):
+                known = self._known_categories[self.columns_[position]]
+                self.unseen_counts_[position] += sum(v not in known for v in values[~missing[:, j], j])
         else:
-            print("Aucune valeur manquante trouvée.")
-        print("----------------------------------\n")
+            missing = X.isna().to_numpy()
+            numeric_values = X[numeric].to_numpy(dtype=np.float64, na_value=np.nan)
+            for col, position in zip(categorical, categorical_positions):
+                codes = self.categories_[col].get_indexer(X[col])
+                self.unseen_counts_[position] += int(((codes < 0) & X[col].notna().to_numpy()).sum())
+
+        present = positions >= 0
+        self.nan_counts_[positions[present]] += missing.sum(axis=0)[present]
+        if numeric:
+            lower, upper = self.lower_[numeric_positions], self.upper_[numeric_positions]
+            self.out_of_range_counts_[numeric_positions] += ((numeric_values < lower) | (numeric_values > upper)).sum(axis=0)
+
+        self.batches_sampled_ += 1
+        self.rows_observed_ += len(X)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Qualité des données (batch échantillonné, {len(X)} lignes): {self.summary()}")
+
+    def report(self) -> pd.DataFrame:
+        """Compteurs par colonne et taux rapportés aux lignes inspectées, colonnes en anomalie en tête."""
+        report = pd.DataFrame(
+            {"nan": self.nan_counts_, "out_of_range": self.out_of_range_counts_, "unseen": self.unseen_counts_},
+            index=pd.Index(self.columns_, name="column"),
+        )
+        rows = max(self.rows_observed_, 1)
+        for name in ["nan", "out_of_range", "unseen"]:
+            report[f"{name}_rate"] = report[name] / rows
+        issues = report[["nan", "out_of_range", "unseen"]].sum(axis=1)
+        return report.iloc[np.argsort(-issues.to_numpy(), kind="stable")]
+
+    def summary(self) -> Dict[str, Any]:
+        """Totaux des compteurs, sérialisables en JSON."""
+        report = self.report()
+        issues = report[["nan", "out_of_range", "unseen"]].sum(axis=1)
+        return {
+            "batches_seen": self.batches_seen_,
+            "batches_sampled": self.batches_sampled_,
+            "rows_observed": self.rows_observed_,
+            "nan": int(self.nan_counts_.sum()),
+            "out_of_range": int(self.out_of_range_counts_.sum()),
+            "unseen": int(self.unseen_counts_.sum()),
+            "columns_with_issues": issues.index[issues > 0].tolist(),
+        }
+
+    @classmethod
+    def find(cls, pipeline) -> Optional["DataQualityMonitor"]:
+        """Premier DataQualityMonitor d'un pipeline (sous-pipelines compris), None s'il n'y en a pas."""
+        if isinstance(pipeline, cls):
+            return pipeline
+        for _, step in getattr(pipeline, "steps", []):
+            monitor = cls.find(step)
+            if monitor is not None:
+                return monitor
+        return None
+
+
+class DebugTransformer(BaseEstimator, TransformerMixin):
+    """
+    Debug transformer to log data state.
+
+    Conservé pour les modèles sérialisés: create_full_pipeline utilise désormais
+    DataQualityMonitor, échantillonné et sans calcul sur les batches non inspectés.
+    Les dimensions, dtypes et temps de chaque étape sont fournis par
+    instrumentation.profile_pipeline; ce transformer ne fait plus que journaliser
+    les NaN restants au niveau DEBUG (aucun calcul si ce niveau est désactivé).
+    """
+
+    def fit(self, X, y=None):
+        return self
+
+    def partial_fit(self, X, y=None):
+        return self
+
+    def transform(self, X):
+        if logger.isEnabledFor(logging.DEBUG):
+            nan_counts = X.isnull().sum()
+            nan_counts = nan_counts[nan_counts > 0]
+            logger.debug(f"Après prétraitement: dimension={X.shape}, NaNs={int(nan_counts.sum())}")
+            for col in nan_counts.index:
+                logger.debug(f"  - {col}: Dtype={X[col].dtype}, NaNs={nan_counts[col]}")
         return X
 
 
@@ -475,12 +1807,59 @@ def get_feature_lists():
     return none_features, zero_features, group_impute, mode_features
 
 
-def create_full_pipeline():
+def create_full_pipeline(
+    inplace=False,
+    feature_config=None,
+    sparse=False,
+    dtype="float64",
+    monitor_sample_rate=None,
+    categorical=False,
+    feature_selection=False,
+    nominal_encoding="onehot",
+):
     """
     Creates the complete preprocessing pipeline as defined in grp_06_ml.py.
     This includes all custom transformers and the final ColumnTransformer.
+
+    Args:
+        inplace: Mode propriétaire. Le DataFrame de l'appelant est copié une seule fois
+            par MissingValuesHandler, puis les étapes suivantes modifient cette copie
+            en place au lieu d'allouer chacune un nouveau DataFrame.
+        feature_config: Section feature_engineering (formules des features dérivées).
+            Par défaut, lue dans config.yaml; DEFAULT_FEATURES si absente.
+        sparse: Sortie CSR de bout en bout. Les blocs one-hot restent creux et le bloc
+            numérique est mis à l'échelle sans centrage (StandardScaler(with_mean=False)),
+            ce qui préserve ses zéros; l'empilement final est une matrice CSR consommée
+            directement par les modèles linéaires (HuberRegressor, Ridge, SGDRegressor).
+            L'intercept du modèle absorbe le centrage: les coefficients sont inchangés.
+        dtype: Politique de précision de la matrice de features ("float64" ou "float32").
+            En float32, une étape NumericCaster convertit les variables numériques avant
+            le ColumnTransformer et les blocs one-hot sont produits en float32.
+        monitor_sample_rate: Fraction des batches inspectés par DataQualityMonitor.
+            Par défaut, monitoring.sample_rate de config.yaml (MONITOR_SAMPLE_RATE si absent).
+        categorical: Variables nominales portées en pandas Categorical. Une étape
+            CategoricalCaster en tête du pipeline fige leur vocabulaire au fit; l'imputation,
+            le regroupement des quartiers, l'encodage ordinal et les blocs one-hot travaillent
+            ensuite sur les codes entiers. Les prédictions sont identiques au mode par défaut.
+        feature_selection: Étape FeatureSelector avant le ColumnTransformer final: les variables
+            numériques redondantes (VIF) ou sans information mutuelle avec la cible sont retirées
+            au fit (la cible doit alors être passée à fit). Matrice de features plus étroite.
+        nominal_encoding: "onehot" (défaut) ou "target". En mode "target", une étape
+            TargetFrequencyEncoder remplace les variables nominales à forte cardinalité
+            (HIGH_CARDINALITY_NOMINALS) par leur moyenne de cible hors fold et leur fréquence:
+            deux colonnes numériques par variable au lieu d'un bloc one-hot (la cible doit être passée à fit).
     """
+    if nominal_encoding not in ("onehot", "target"):
+        raise ValueError(f"nominal_encoding inconnu: {nominal_encoding!r} ('onehot' ou 'target')")
     none_features, zero_features, group_impute, mode_features = get_feature_lists()
+    copy = not inplace
+    config = load_config() if feature_config is None or monitor_sample_rate is None else {}
+    if feature_config is None:
+        feature_config = config.get("feature_engineering")
+    if monitor_sample_rate is None:
+        monitor_sample_rate = (config.get("monitoring") or {}).get("sample_rate", MONITOR_SAMPLE_RATE)
+    features, drop_columns = parse_feature_config(feature_config)
+    dtype = np.dtype(dtype)
 
     pipeline = Pipeline(
         [
@@ -491,33 +1870,52 @@ def create_full_pipeline():
                     zero_features=zero_features,
                     group_impute=group_impute,
                     mode_features=mode_features,
-                ),
+                ),  # Toujours copy=True: seule copie du DataFrame de l'appelant
             ),
-            ("anomaly", AnomalyCorrector()),
-            ("features", FeatureEngineer()),
-            ("ordinal", OrdinalEncoderCustom()),
-            ("skewness", SkewnessCorrector()),  # Ajout de la correction de skewness
-            ("debug", DebugTransformer()),
+            ("anomaly", AnomalyCorrector(copy=copy)),
+            ("features", FeatureEngineer(copy=copy, features=features, drop_columns=drop_columns)),
+            ("ordinal", OrdinalEncoderCustom(copy=copy)),
+            ("skewness", SkewnessCorrector(copy=copy)),  # Ajout de la correction de skewness
+            ("monitor", DataQualityMonitor(sample_rate=monitor_sample_rate)),
             (
                 "preprocess",
-                ColumnTransformer(
+                FrozenColumnTransformer(
                     [
                         (
                             "num",
-                            Pipeline([("scaler", StandardScaler())]),
-                            make_column_selector(dtype_exclude=object),
+                            Pipeline([("scaler", StandardScaler(with_mean=not sparse))]),
+                            make_column_selector(dtype_exclude=[object, "category"]),
                         ),
                         (
                             "nom",
-                            OneHotEncoder(handle_unknown="ignore", sparse_output=False),
-                            make_column_selector(dtype_include=object),
+                            OneHotEncoder(handle_unknown="ignore", sparse_output=sparse, dtype=dtype),
+                            make_column_selector(dtype_include=[object, "category"]),
                         ),
                     ],
                     remainder="passthrough",
+                    # 1.0: la sortie est CSR dès qu'un bloc est creux, quelle que soit sa densité
+                    sparse_threshold=1.0 if sparse else 0.3,
                 ),
             ),
         ]
     )
+    if categorical:
+        # Conversion en tête: CategoricalCaster devient propriétaire de la copie du DataFrame de l'appelant
+        known = {col: list(mapping) for col, mapping in ORDINAL_MAPPINGS.items()}
+        for col, categories in FeatureEngineer(features=features).expressions.lookup_categories().items():
+            known[col] = list(dict.fromkeys(known.get(col, []) + categories))
+        caster = CategoricalCaster(extra_categories=("None", "Autres"), known_categories=known)
+        pipeline.steps.insert(0, ("categorical", caster))
+        pipeline.named_steps["missing"].set_params(copy=copy)
+    if dtype != np.float64:
+        # Conversion après les étapes pandas, juste avant DataQualityMonitor et le ColumnTransformer final
+        pipeline.steps.insert(-2, ("dtype", NumericCaster(dtype=dtype.name, copy=copy)))
+    if nominal_encoding == "target":
+        # Après DataQualityMonitor (modalités brutes surveillées), avant FeatureSelector (colonnes produites numériques)
+        pipeline.steps.insert(-1, ("encoder", TargetFrequencyEncoder(dtype=dtype.name, copy=copy)))
+    if feature_selection:
+        # Après DataQualityMonitor, qui surveille toutes les colonnes
+        pipeline.steps.insert(-1, ("selector", FeatureSelector(copy=copy)))
     return pipeline
 
 
@@ -529,4 +1927,6 @@ if __name__ == "__main__":
     print("  - AnomalyCorrector")
     print("  - FeatureEngineer")
     print("  - OrdinalEncoderCustom")
-    print("  - DebugTransformer")
+    print("  - FeatureSelector")
+    print("  - TargetFrequencyEncoder")
+    print("  - DataQualityMonitor")
@@ -0,0 +1,320 @@
+"""
+Profil d'un jeu de données en une seule lecture, par accumulateurs fusionnables.
+
+Pour chaque colonne: effectif, valeurs manquantes, cardinalité (exacte jusqu'à
+distinct_size valeurs, estimée au-delà par les k plus petites empreintes), et selon le type:
+- numériques: moments jusqu'à l'ordre 4 (moyenne, écart-type, coefficient de variation,
+  asymétrie, aplatissement, mêmes conventions que pandas), min/max, quantiles (MedianSketch,
+  exacts tant que le nombre de valeurs distinctes reste <= quantile_size) et corrélation
+  avec la cible si elle est donnée;
+- autres: modalité la plus fréquente et son effectif (ModeSketch).
+
+Les accumulateurs se mettent à jour morceau par morceau (update) et se fusionnent (merge):
+profiler un extrait de 10M lignes coûte une lecture, et des profils calculés en parallèle
+(un par fichier) se combinent sans relire les données.
+
+Usage:
+    profile = profile_data("data/raw/train.csv", chunksize=100_000, target="SalePrice")
+    profile.summary()                  # Une ligne par colonne
+    profile.column_stats("SalePrice")  # Statistiques de get_target_distribution
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .load_data import iter_data
+from .moments import chunk_moments, empty_moments, merge_moments
+from .preprocessing import MedianSketch, ModeSketch
+
+logger = logging.getLogger(__name__)
+
+# Co-moments avec la cible (lignes où les deux valeurs sont présentes)
+_XN, _XMEAN, _YMEAN, _XM2, _YM2, _XY = range(6)
+
+SUMMARY_COLUMNS = [
+    "dtype",
+    "count",
+    "missing",
+    "missing_pct",
+    "distinct",
+    "mean",
+    "std",
+    "cv",
+    "min",
+    "q25",
+    "median",
+    "q75",
+    "max",
+    "skewness",
+    "kurtosis",
+    "top",
+    "top_freq",
+]
+
+
+def _ratio(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    return np.divide(num, den, out=np.zeros(np.broadcast(num, den).shape), where=den > 0)
+
+
+def _merge_comoments(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Fusion des co-moments (x, cible) par colonne."""
+    na, nb = a[_XN], b[_XN]
+    n = na + nb
+    wa, wb = _ratio(na, n), _ratio(nb, n)
+    dx, dy = b[_XMEAN] - a[_XMEAN], b[_YMEAN] - a[_YMEAN]
+    merged = np.empty_like(a)
+    merged[_XN] = n
+    merged[_XMEAN] = a[_XMEAN] * wa + b[_XMEAN] * wb
+    merged[_YMEAN] = a[_YMEAN] * wa + b[_YMEAN] * wb
+    merged[_XM2] = a[_XM2] + b[_XM2] + dx * dx * na * wb
+    merged[_YM2] = a[_YM2] + b[_YM2] + dy * dy * na * wb
+    merged[_XY] = a[_XY] + b[_XY] + dx * dy * na * wb
+    return merged
+
+
+def _chunk_comoments(X: np.ndarray, y: np.ndarray) -> np.ndarray:
+    present = ~np.isnan(X) & ~np.isnan(y)[:, None]
+    n = present.sum(axis=0).astype(np.float64)
+    Y = np.broadcast_to(y[:, None], X.shape)
+    x_mean = _ratio(np.where(present, X, 0.0).sum(axis=0), n)
+    y_mean = _ratio(np.where(present, Y, 0.0).sum(axis=0), n)
+    dx = np.where(present, X - x_mean, 0.0)
+    dy = np.where(present, Y - y_mean, 0.0)
+    return np.stack([n, x_mean, y_mean, (dx * dx).sum(axis=0), (dy * dy).sum(axis=0), (dx * dy).sum(axis=0)])
+
+
+class DistinctSketch:
+    """
+    Cardinalité fusionnable (k plus petites empreintes, KMV): exacte sous k valeurs distinctes,
+    estimée au-delà (erreur relative ~ 1/sqrt(k)).
+    """
+
+    def __init__(self, k: int = 2048):
+        self.k = k
+        self.hashes = np.empty(0, dtype=np.uint64)
+
+    def update(self, values: pd.Series) -> "DistinctSketch":
+        hashes = pd.util.hash_pandas_object(values.dropna(), index=False).to_numpy()
+        return self._add(hashes)
+
+    def merge(self, other: "DistinctSketch") -> "DistinctSketch":
+        return self._add(other.hashes)
+
+    def _add(self, hashes: np.ndarray) -> "DistinctSketch":
+        self.hashes = np.unique(np.concatenate([self.hashes, hashes]))[: self.k]
+        return self
+
+    def count(self) -> float:
+        if len(self.hashes) < self.k:
+            return float(len(self.hashes))
+        return float((self.k - 1) * 2.0**64 / (float(self.hashes[-1]) + 1))
+
+
+class DatasetProfile:
+    """
+    Accumulateurs fusionnables de toutes les colonnes d'un jeu de données.
+
+    Le type d'une colonne (numérique ou non) est fixé au premier morceau qui la contient
+    avec des valeurs; les morceaux suivants sont convertis vers ce type.
+
+    Args:
+        target: Colonne cible (corrélation de chaque colonne numérique avec elle)
+        quantile_size: Valeurs distinctes gardées par MedianSketch (quantiles exacts en dessous)
+        distinct_size: Empreintes gardées par DistinctSketch (cardinalité exacte en dessous)
+        top_size: Modalités gardées par ModeSketch (colonnes non numériques)
+    """
+
+    def __init__(
+        self, target: Optional[str] = None, quantile_size: int = 4096, distinct_size: int = 2048, top_size: int = 1024
+    ):
+        self.target = target
+        self.quantile_size = quantile_size
+        self.distinct_size = distinct_size
+        self.top_size = top_size
+        self.n_rows = 0
+        self.dtypes: Dict[str, str] = {}  # Colonnes dans l'ordre d'apparition
+        self.missing: Dict[str, int] = {}
+        self.distinct: Dict[str, DistinctSketch] = {}
+        self.numeric: List[str] = []
+        self.moments = empty_moments(0)
+        self.comoments = np.empty((6, 0))
+        self.quantiles: Dict[str, MedianSketch] = {}
+        self.tops: Dict[str, ModeSketch] = {}
+
+    # ------------------------------------------------------------------
+    # Accumulation
+    # ------------------------------------------------------------------
+
+    def _register(self, col: str, values: pd.Series) -> None:
+        self.dtypes[col] = str(values.dtype)
+        self.missing[col] = 0
+        self.distinct[col] = DistinctSketch(self.distinct_size)
+
+    def _classify(self, col: str, values: pd.Series) -> None:
+        """Type d'une colonne au premier morceau où elle a des valeurs."""
+        if col in self.quantiles or col in self.tops or not values.notna().any():
+            return
+        self.dtypes[col] = str(values.dtype)
+        if pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype):
+            self._add_numeric(col)
+        else:
+            self.tops[col] = ModeSketch(self.top_size)
+
+    def _add_numeric(self, col: str) -> None:
+        self.numeric.append(col)
+        self.moments = np.hstack([self.moments, empty_moments(1)])
+        self.comoments = np.hstack([self.comoments, np.zeros((6, 1))])
+        self.quantiles[col] = MedianSketch(self.quantile_size)
+
+    def update(self, chunk: pd.DataFrame) -> "DatasetProfile":
+        """Ajoute un morceau de lignes au profil."""
+        self.n_rows += len(chunk)
+        for col in chunk.columns:
+            values = chunk[col]
+            if col not in self.dtypes:
+                self._register(col, values)
+            self._classify(col, values)
+            self.missing[col] += int(values.isna().sum())
+            if col in self.tops:
+                if pd.api.types.is_numeric_dtype(values.dtype):  # Morceau lu comme numérique (ex: NA seuls)
+                    values = values.astype(str).where(values.notna())
+                self.tops[col].update(values)
+            self.distinct[col].update(values)
+
+        numeric = [col for col in self.numeric if col in chunk.columns]
+        if numeric:
+            X = np.column_stack(
+                [pd.to_numeric(chunk[col], errors="coerce").to_numpy(np.float64, na_value=np.nan) for col in numeric]
+            )
+            index = [self.numeric.index(col) for col in numeric]
+            self.moments[:, index] = merge_moments(self.moments[:, index], chunk_moments(X))
+            for col, values in zip(numeric, X.T):
+                self.quantiles[col].update(values)
+            if self.target is not None and self.target in chunk.columns:
+                y = pd.to_numeric(chunk[self.target], errors="coerce").to_numpy(np.float64, na_value=np.nan)
+                self.comoments[:, index] = _merge_comoments(self.comoments[:, index], _chunk_comoments(X, y))
+        return self
+
+    def merge(self, other: "DatasetProfile") -> "DatasetProfile":
+        """Fusionne le profil d'autres lignes (ex: un autre fichier profilé en parallèle)."""
+        self.n_rows += other.n_rows
+        for col, dtype in other.dtypes.items():
+            if col not in self.dtypes:
+                self.dtypes[col] = dtype
+                self.missing[col] = 0
+                self.distinct[col] = DistinctSketch(self.distinct_size)
+            elif col not in self.quantiles and col not in self.tops:
+                self.dtypes[col] = dtype  # Colonne sans valeur de ce côté: type de l'autre profil
+            self.missing[col] += other.missing[col]
+            self.distinct[col].merge(other.distinct[col])
+            if col in other.tops and col not in self.quantiles:
+                self.tops.setdefault(col, ModeSketch(self.top_size)).merge(other.tops[col])
+        for j, col in enumerate(other.numeric):
+            if col in self.tops:
+                continue  # Type fixé autrement de ce côté: seuls effectifs et cardinalité sont fusionnés
+            if col not in self.quantiles:
+                self._add_numeric(col)
+            i = self.numeric.index(col)
+            self.moments[:, [i]] = merge_moments(self.moments[:, [i]], other.moments[:, [j]])
+            self.comoments[:, [i]] = _merge_comoments(self.comoments[:, [i]], other.comoments[:, [j]])
+            self.quantiles[col].merge(other.quantiles[col])
+        return self
+
+    # ------------------------------------------------------------------
+    # Résultats
+    # ------------------------------------------------------------------
+
+    def column_stats(self, col: str) -> Dict[str, Any]:
+        """Statistiques d'une colonne (conventions de pandas: std ddof=1, skew et kurtosis corrigés)."""
+        if col not in self.dtypes:
+            raise KeyError(f"Colonne '{col}' absente du profil")
+        count = self.n_rows - self.missing[col]
+        stats: Dict[str, Any] = {
+            "dtype": self.dtypes[col],
+            "count": count,
+            "missing": self.missing[col],
+            "missing_pct": 100.0 * self.missing[col] / self.n_rows if self.n_rows else np.nan,
+            "distinct": self.distinct[col].count(),
+        }
+        if col in self.quantiles:
+            stats.update(self._numeric_stats(self.numeric.index(col)))
+        elif col in self.tops and self.tops[col].counts:
+            top = self.tops[col].mode()
+            stats.update({"top": top, "top_freq": self.tops[col].counts[top]})
+        return stats
+
+    def _numeric_stats(self, i: int) -> Dict[str, Any]:
+        n, mean, m2, m3, m4, low, high = self.moments[:, i]
+        sketch = self.quantiles[self.numeric[i]]
+        std = np.sqrt(m2 / (n - 1)) if n > 1 else np.nan
+        if n < 3:
+            skewness = np.nan
+        else:
+            skewness = 0.0 if m2 == 0 else np.sqrt(n * (n - 1)) / (n - 2) * np.sqrt(n) * m3 / m2**1.5
+        if n < 4:
+            kurtosis = np.nan
+        else:
+            kurtosis = (
+                0.0
+                if m2 == 0
+                else n * (n + 1) * (n - 1) * m4 / ((n - 2) * (n - 3) * m2**2) - 3 * (n - 1) ** 2 / ((n - 2) * (n - 3))
+            )
+        stats = {
+            "mean": mean if n else np.nan,
+            "std": std,
+            "cv": std / mean if n and mean != 0 else np.nan,
+            "min": low if n else np.nan,
+            "q25": sketch.quantile(0.25),
+            "median": sketch.quantile(0.5),
+            "q75": sketch.quantile(0.75),
+            "max": high if n else np.nan,
+            "skewness": skewness,
+            "kurtosis": kurtosis,
+        }
+        if self.target is not None:
+            _, _, _, xm2, ym2, xy = self.comoments[:, i]
+            stats["target_corr"] = xy / np.sqrt(xm2 * ym2) if xm2 > 0 and ym2 > 0 else np.nan
+        return stats
+
+    def summary(self) -> pd.DataFrame:
+        """Une ligne par colonne (ordre d'apparition)."""
+        columns = SUMMARY_COLUMNS + (["target_corr"] if self.target is not None else [])
+        rows = {col: self.column_stats(col) for col in self.dtypes}
+        return pd.DataFrame.from_dict(rows, orient="index").reindex(columns=columns)
+
+
+def profile_data(
+    data: Union[pd.DataFrame, str, Path, Sequence[Union[str, Path]]],
+    chunksize: int = 100_000,
+    target: Optional[str] = None,
+    columns: Optional[Sequence[str]] = None,
+    dtypes: Optional[Mapping[str, Any]] = None,
+    **kwargs: Any,
+) -> DatasetProfile:
+    """
+    Profil d'un DataFrame ou de fichiers CSV, en une lecture par morceaux de `chunksize` lignes.
+
+    Args:
+        data: DataFrame, fichier CSV, dossier de CSV ou liste de fichiers (lus par iter_data)
+        chunksize: Lignes par morceau (borne la mémoire temporaire)
+        target: Colonne cible (corrélations)
+        columns: Colonnes à profiler (fichiers uniquement; défaut: toutes)
+        dtypes: Types imposés à la lecture (fichiers uniquement)
+        **kwargs: Tailles des accumulateurs (voir DatasetProfile)
+
+    Returns:
+        DatasetProfile
+    """
+    profile = DatasetProfile(target=target, **kwargs)
+    if isinstance(data, pd.DataFrame):
+        chunks = (data.iloc[start : start + chunksize] for start in range(0, len(data), chunksize))
+    else:
+        chunks = iter_data(data, chunksize=chunksize, columns=columns, dtypes=dtypes)
+    for chunk in chunks:
+        profile.update(chunk)
+    logger.info(f"Profil: {profile.n_rows} lignes, {len(profile.dtypes)} colonnes")
+    return profile
@@ -0,0 +1,296 @@
+"""
+Schéma de colonnes figé à l'entraînement.
+
+Les étapes du pipeline enregistrent au fit la disposition exacte des colonnes
+reçues (noms, ordre, dtypes). À chaque transform, le schéma entrant est comparé
+une fois à cet enregistrement: identique, l'étape réutilise les décisions prises au
+fit (colonnes présentes, blocs du ColumnTransformer) sans aucune redécouverte;
+différent, la dérive est signalée (une fois par dérive distincte) et l'étape
+revient au chemin général.
+
+Usage:
+    schema = ColumnSchema.from_frame(X_train)
+    schema.validate(X_new)  # SchemaDriftError si les colonnes ont dérivé
+"""
+
+import logging
+import math
+import numbers
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, List, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+logger = logging.getLogger(__name__)
+
+# Jusqu'à ce nombre de lignes, les variables nominales sont encodées par dictionnaire plutôt que par Index
+_DICT_MAX_ROWS = 256
+
+
+class SchemaDriftError(ValueError):
+    """Le schéma des données diffère de celui vu à l'entraînement."""
+
+
+@dataclass(frozen=True)
+class ColumnSchema:
+    """Disposition des colonnes d'un DataFrame: noms dans l'ordre et dtypes."""
+
+    columns: Tuple[str, ...]
+    dtypes: Tuple[Any, ...]
+    index: pd.Index = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Index pré-construit: la comparaison des colonnes se fait sans conversion
+        object.__setattr__(self, "index", pd.Index(self.columns, dtype=object))
+
+    def __getstate__(self):
+        return {"columns": self.columns, "dtypes": self.dtypes}
+
+    def __setstate__(self, state):
+        object.__setattr__(self, "columns", state["columns"])
+        object.__setattr__(self, "dtypes", state["dtypes"])
+        self.__post_init__()
+
+    @classmethod
+    def from_frame(cls, X: pd.DataFrame) -> "ColumnSchema":
+        return cls(tuple(X.columns), tuple(X.dtypes))
+
+    def dtypes_series(self) -> pd.Series:
+        """Schéma sous forme de Series colonne -> dtype, comme DataFrame.dtypes."""
+        return pd.Series(self.dtypes, index=self.index, dtype=object)
+
+    def matches(self, X: Any, dtypes: bool = True) -> bool:
+        """Vérification rapide: mêmes colonnes dans le même ordre (et mêmes dtypes si `dtypes`)."""
+        if not isinstance(X, pd.DataFrame) or not X.columns.equals(self.index):
+            return False
+        return not dtypes or tuple(X.dtypes) == self.dtypes
+
+    def drift(self, X: Any) -> List[str]:
+        """Différences entre le schéma de X et le schéma enregistré (liste vide si aucune)."""
+        if not isinstance(X, pd.DataFrame):
+            return [f"DataFrame attendu, reçu {type(X).__name__}"]
+        expected = dict(zip(self.columns, self.dtypes))
+        received = dict(zip(X.columns, X.dtypes))
+        differences = []
+        missing = [col for col in self.columns if col not in received]
+        if missing:
+            differences.append(f"colonnes manquantes: {missing}")
+        extra = [col for col in received if col not in expected]
+        if extra:
+            differences.append(f"colonnes en trop: {extra}")
+        changed = {
+            col: f"{expected[col]} -> {dtype}" for col, dtype in received.items() if col in expected and dtype != expected[col]
+        }
+        if changed:
+            differences.append(f"dtypes modifiés: {changed}")
+        if not differences and tuple(X.columns) != self.columns:
+            differences.append("ordre des colonnes modifié")
+        return differences
+
+    def validate(self, X: Any) -> None:
+        """Lève SchemaDriftError si le schéma de X diffère du schéma enregistré."""
+        differences = self.drift(X)
+        if differences:
+            raise SchemaDriftError("Dérive du schéma: " + "; ".join(differences))
+
+    def report_drift(self, X: Any, owner: str, level: int = logging.WARNING) -> None:
+        """Journalise la dérive du schéma de X (une seule fois par étape et par dérive)."""
+        differences = self.drift(X)
+        if differences:
+            _log_once(level, f"{owner}: dérive du schéma, chemin général utilisé ({'; '.join(differences)})")
+
+
+@lru_cache(maxsize=256)
+def _log_once(level: int, message: str) -> None:
+    logger.log(level, message)
+
+
+class FrozenColumnTransformer(ColumnTransformer):
+    """
+    ColumnTransformer dont le schéma d'entrée et la disposition de sortie sont figés au fit.
+
+    Quand le DataFrame reçu a exactement le schéma d'entraînement, transform calcule la
+    matrice directement à partir des paramètres entraînés (moyennes et échelles des
+    StandardScaler, catégories des OneHotEncoder), sans la validation colonne par
+    colonne de scikit-learn: le bloc numérique est mis à l'échelle en une opération et
+    chaque variable nominale est encodée par une indexation dans ses catégories (une
+    valeur manquante ne retrouve que la catégorie apprise avec le même marqueur, None ou
+    NaN, comme dans OneHotEncoder). La sortie (dense ou CSR) est identique à celle de ColumnTransformer. Tout autre
+    cas (dérive du schéma, transformers non pris en charge, infinis) passe par
+    ColumnTransformer.transform.
+    """
+
+    def fit_transform(self, X, y=None, **params):
+        result = super().fit_transform(X, y, **params)
+        self.schema_in_ = ColumnSchema.from_frame(X) if isinstance(X, pd.DataFrame) else None
+        self._frozen_plan = None  # Construit au premier transform (transformers_ peut encore être substitué)
+        return result
+
+    def __setstate__(self, state):
+        state["_frozen_plan"] = None  # Dérivé des paramètres entraînés: reconstruit au premier transform
+        super().__setstate__(state)
+
+    def transform(self, X, **params):
+        schema = getattr(self, "schema_in_", None)
+        if schema is None or params:
+            return super().transform(X, **params)
+        if not schema.matches(X):
+            schema.report_drift(X, type(self).__name__)
+            return super().transform(X, **params)
+
+        plan = self._frozen_plan if self._frozen_plan is not None else self._freeze_plan()
+        if not plan:
+            return super().transform(X, **params)
+        result = self._transform_frozen(X, plan)
+        return super().transform(X, **params) if result is None else result
+
+    def _freeze_plan(self):
+        """
+        Blocs de sortie figés: ("num", dtype, colonnes, tranche, moyenne, échelle) ou
+        ("nom", dtype, colonnes, tranche, décalages, index et dictionnaires des catégories, code de NaN,
+        tables code Categorical -> position pour les colonnes Categorical du schéma).
+        Liste vide si un transformer n'est pas pris en charge.
+        """
+        schema_dtypes = dict(zip(self.schema_in_.columns, self.schema_in_.dtypes))
+        plan = []
+        for name, transformer, columns in self.transformers_:
+            if transformer == "drop" or len(columns) == 0:
+                continue
+            columns = [self.feature_names_in_[c] if isinstance(c, (int, np.integer)) else c for c in columns]
+            if isinstance(transformer, Pipeline) and len(transformer.steps) == 1:
+                transformer = transformer.steps[0][1]
+            out = self.output_indices_[name]
+
+            if isinstance(transformer, StandardScaler):
+                # Comme check_array: float32 conservé si toutes les colonnes le sont, sinon float64
+                dtype = np.float32 if all(schema_dtypes[col] == np.float32 for col in columns) else np.float64
+                # Statistiques converties dans le dtype des données, comme StandardScaler.transform
+                mean = transformer.mean_.astype(dtype) if transformer.with_mean else None
+                scale = transformer.scale_.astype(dtype) if transformer.with_std else None
+                plan.append(("num", dtype, columns, out, mean, scale))
+            elif (
+                isinstance(transformer, OneHotEncoder)
+                and transformer.handle_unknown == "ignore"
+                and transformer.drop_idx_ is None
+                and not getattr(transformer, "_infrequent_enabled", False)
+                and np.dtype(transformer.dtype) in (np.float32, np.float64)
+            ):
+                offsets = np.cumsum([0] + [len(c) for c in transformer.categories_[:-1]])
+                # Catégories manquantes (None puis NaN) en fin de liste: l'Index ne garde que les autres
+                indexes = [pd.Index([c for c in categories if not pd.isna(c)]) for categories in transformer.categories_]
+                lookups = [{c: i for i, c in enumerate(categories)} for categories in transformer.categories_]
+                missing = [
+                    next((i for i, c in enumerate(categories) if _is_nan(c)), -1) for categories in transformer.categories_
+                ]
+                luts = [
+                    (
+                        np.append(index.get_indexer(schema_dtypes[col].categories), code)
+                        if isinstance(schema_dtypes[col], pd.CategoricalDtype)
+                        else None
+                    )
+                    for col, index, code in zip(columns, indexes, missing)
+                ]
+                plan.append(("nom", np.dtype(transformer.dtype), columns, out, offsets, indexes, lookups, missing, luts))
+            else:
+                plan = []
+                break
+        self._frozen_plan = plan
+        return plan
+
+    def _transform_frozen(self, X, plan):
+        """Matrice de sortie calculée depuis le plan figé; None pour déléguer à ColumnTransformer."""
+        n_rows = len(X)
+        n_out = max((out.stop for out in self.output_indices_.values()), default=0)
+        dtype = np.result_type(*(block[1] for block in plan))  # Comme np.hstack / sparse.hstack
+        # Dense: chaque bloc est écrit dans la matrice finale; CSR: blocs empilés comme par ColumnTransformer
+        result = None if self.sparse_output_ else np.zeros((n_rows, n_out), dtype=dtype)
+        blocks = []
+        for block in plan:
+            if block[0] == "num":
+                _, num_dtype, columns, out, mean, scale = block
+                values = X[columns].to_numpy(dtype=num_dtype, na_value=np.nan, copy=True)
+                if np.isinf(values).any():  # Erreur de validation de scikit-learn
+                    return None
+                if mean is not None:
+                    values -= mean
+                if scale is not None:
+                    values /= scale
+                if result is not None:
+                    result[:, out] = values
+                else:
+                    blocks.append(_dense_to_csr(values))
+                del values  # Libéré avant l'empilement final
+                continue
+
+            _, nom_dtype, columns, out, offsets, indexes, lookups, missing, luts = block
+            codes = self._category_codes(X, columns, indexes, lookups, missing, luts)
+            valid = codes >= 0  # Catégories inconnues: ligne de zéros (handle_unknown="ignore")
+            codes += offsets  # Position dans le bloc
+            if result is not None:
+                for j in range(len(columns)):
+                    rows = np.flatnonzero(valid[:, j])
+                    result[rows, out.start + codes[rows, j]] = 1.0
+            else:
+                # Ordre ligne par ligne des codes valides: directement au format CSR canonique
+                indptr = np.zeros(n_rows + 1, dtype=np.int64)
+                np.cumsum(valid.sum(axis=1), out=indptr[1:])
+                indices = codes[valid]
+                data = np.ones(len(indices), dtype=nom_dtype)
+                blocks.append(sparse.csr_matrix((data, indices, indptr), shape=(n_rows, out.stop - out.start)))
+
+        if result is not None:
+            return result
+        return sparse.hstack(blocks, format="csr", dtype=dtype)
+
+    @staticmethod
+    def _category_codes(X, columns, indexes, lookups, missing, luts):
+        """Matrice (lignes x variables) des positions des catégories, -1 pour les inconnues."""
+        codes = np.empty((len(X), len(columns)), dtype=np.int32)
+        # Colonnes Categorical: une indexation de la table figée par les codes (-1 -> code de NaN, NA vu par scikit-learn)
+        encoded = [j for j, lut in enumerate(luts) if lut is not None]
+        for j in encoded:
+            codes[:, j] = luts[j][X[columns[j]].array.codes]
+        others = [j for j, lut in enumerate(luts) if lut is None]
+        if not others:
+            return codes
+        if len(X) <= _DICT_MAX_ROWS:
+            values = X[[columns[j] for j in others]].to_numpy(dtype=object)
+            for k, j in enumerate(others):
+                codes[:, j] = [_code(v, lookups[j], missing[j]) for v in values[:, k]]
+        else:
+            for j in others:
+                column = X[columns[j]].array
+                codes[:, j] = indexes[j].get_indexer(column)
+                if len(indexes[j]) < len(lookups[j]):
+                    # Catégories manquantes apprises: valeurs non trouvées résolues par leur marqueur exact
+                    rows = np.flatnonzero(codes[:, j] < 0)
+                    codes[rows, j] = [_code(v, lookups[j], missing[j]) for v in column[rows]]
+        return codes
+
+
+def _dense_to_csr(values):
+    """CSR d'un bloc dense sans ses zéros, sans passer par le format COO (indices int32)."""
+    mask = values != 0
+    indptr = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum(mask.sum(axis=1), out=indptr[1:])
+    indices = np.broadcast_to(np.arange(values.shape[1], dtype=np.int32), values.shape)[mask]
+    return sparse.csr_matrix((values[mask], indices, indptr), shape=values.shape)
+
+
+def _is_nan(value):
+    """NaN scalaire (float Python ou NumPy), comme sklearn.utils.is_scalar_nan: ni None, ni pd.NA, ni NaT."""
+    return isinstance(value, numbers.Real) and math.isnan(value)
+
+
+def _code(value, lookup, missing):
+    """Position de la catégorie (None: clé du dictionnaire; NaN: code de NaN), -1 si inconnue."""
+    code = lookup.get(value)
+    if code is None:
+        return missing if _is_nan(value) else -1
+    return code
@@ -2,7 +2,23 @@
 Package models pour la prédiction des prix des maisons.
 """
 
-from .predict_model import load_trained_model, predict
-from .train_model import evaluate_model, save_model, train_model
+from .compiled_model import CompiledPipeline, compile_pipeline
+from .onnx_model import OnnxPipeline, export_onnx
+from .predict_model import load_trained_model, predict, predict_file
+from .search import FoldCachedSearchCV
+from .train_model import evaluate_model, save_model, train_model, train_model_out_of_core
 
-__all__ = ["train_model", "evaluate_model", "save_model", "predict", "load_trained_model"]
+__all__ = [
+    "train_model",
+    "train_model_out_of_core",
+    "evaluate_model",
+    "save_model",
+    "predict",
+    "predict_file",
+    "load_trained_model",
+    "compile_pipeline",
+    "CompiledPipeline",
+    "export_onnx",
+    "OnnxPipeline",
+    "FoldCachedSearchCV",
+]
@@ -0,0 +1,548 @@
+"""
+Module d'inférence compilée pour le projet House Prices.
+
+Convertit un pipeline entraîné (create_full_pipeline + modèle linéaire) en un
+noyau NumPy plat: constantes d'imputation, tables ordinales, tables one-hot,
+masque log1p et paramètres du StandardScaler repliés dans les coefficients.
+"""
+
+import logging
+import math
+import operator
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+from ..data.features import FeatureExpressions
+from ..data.preprocessing import (
+    ORDINAL_MAPPINGS,
+    AnomalyCorrector,
+    CategoricalCaster,
+    DataQualityMonitor,
+    DebugTransformer,
+    FeatureEngineer,
+    FeatureSelector,
+    MissingValuesHandler,
+    NumericCaster,
+    OrdinalEncoderCustom,
+    SkewnessCorrector,
+    TargetFrequencyEncoder,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Au-delà de ce nombre de lignes, les recherches dans les tables passent par pd.factorize (hachage en C)
+_FACTORIZE_MIN_ROWS = 256
+
+
+def _lookup(table: Dict[Any, float], values: Any, default: float) -> np.ndarray:
+    """Recherche vectorisée dans une table (les valeurs manquantes sont indexées par None)."""
+    get = table.get
+    if len(values) <= _FACTORIZE_MIN_ROWS:
+        return np.fromiter((get(v, default) for v in values), dtype=np.float64, count=len(values))
+    codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+    lut = np.array([get(u, default) for u in uniques] + [get(None, default)], dtype=np.float64)
+    return lut[codes]
+
+
+def _log1p(x: float) -> float:
+    if x > -1:
+        return math.log1p(x)
+    return -math.inf if x == -1 else math.nan
+
+
+def _is_missing(value: Any) -> bool:
+    return value is None or (isinstance(value, float) and value != value)
+
+
+class CompiledPipeline:
+    """
+    Noyau d'inférence équivalent à un pipeline entraîné (prétraitement complet + modèle linéaire).
+
+    La prédiction se résume à quelques opérations vectorisées sur les colonnes numériques,
+    des recherches dans des tables pour les colonnes catégorielles et un produit scalaire.
+    Utiliser compile_pipeline() pour construire une instance.
+    """
+
+    def __init__(
+        self,
+        numeric_inputs: List[str],
+        numeric_fill: np.ndarray,
+        categorical_fill: Dict[str, Any],
+        neighborhoods: Optional[set],
+        lotfrontage_stats: Dict[str, float],
+        lotfrontage_global: Optional[float],
+        fix_garage_year: bool,
+        features: List[str],
+        log1p_features: List[str],
+        weights: np.ndarray,
+        intercept: float,
+        ordinal_tables: Dict[str, Dict[Any, float]],
+        nominal_tables: Dict[str, Dict[Any, float]],
+        ordinal_unknown: float = math.nan,
+        expressions: Optional[FeatureExpressions] = None,
+        derived_features: Optional[List[str]] = None,
+        derived_codes: Optional[Dict[str, np.ndarray]] = None,
+        monitor: Optional[DataQualityMonitor] = None,
+        monitor_steps: Optional[List[Any]] = None,
+    ):
+        self.numeric_inputs = numeric_inputs
+        self.numeric_fill = numeric_fill
+        self.categorical_fill = categorical_fill
+        self.neighborhoods = neighborhoods
+        self.lotfrontage_stats = lotfrontage_stats
+        self.lotfrontage_global = lotfrontage_global
+        self.fix_garage_year = fix_garage_year
+        self.features = features
+        self.log1p_features = log1p_features
+        self.weights = weights
+        self.intercept = intercept
+        self.ordinal_tables = ordinal_tables
+        self.nominal_tables = nominal_tables
+        self.ordinal_unknown = ordinal_unknown  # Code des catégories ordinales inconnues (OrdinalEncoderCustom)
+        self.expressions = expressions  # Formules de FeatureEngineer
+        self.derived_features = derived_features or []  # Features finales calculées par expressions
+        self.derived_codes = derived_codes or {}  # Feature catégorielle dérivée -> code ordinal par index de tranche
+        self.monitor = monitor  # DataQualityMonitor du pipeline, alimenté par les batches échantillonnés
+        self.monitor_steps = monitor_steps or []  # Étapes scikit-learn qui précèdent le moniteur
+
+        self._derived_categorical = sorted(
+            {col for f in self.derived_features for col in expressions.categorical_columns(f)} if expressions else set()
+        )
+        self.categorical_inputs = sorted(
+            set(ordinal_tables)
+            | set(nominal_tables)
+            | set(self._derived_categorical)
+            | ({"Neighborhood"} if neighborhoods is not None else set())
+        )
+        self._numeric_fill_mask = ~np.isnan(numeric_fill)
+        self._log1p_idx = np.array([features.index(f) for f in log1p_features], dtype=np.intp)
+        self._ordinal_idx = np.array([j for j, f in enumerate(features) if f in ORDINAL_MAPPINGS], dtype=np.intp)
+        if math.isnan(ordinal_unknown):
+            self._ordinal_idx = self._ordinal_idx[:0]  # NaN conservé: rejeté en fin de prédiction
+        self._numeric_fill_list = numeric_fill.tolist()
+        self._weights_list = weights.tolist()
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_pipeline(cls, pipeline: Pipeline) -> "CompiledPipeline":
+        """Construit le noyau à partir d'un pipeline entraîné (preprocessing + modèle linéaire)."""
+        steps = _flatten_steps(pipeline)
+        *transformers, model = steps
+        if not hasattr(model, "coef_") or not hasattr(model, "intercept_") or np.ndim(model.coef_) != 1:
+            raise TypeError(f"Modèle non compilable (régression linéaire attendue): {type(model).__name__}")
+        roles, monitor_steps = _step_roles(transformers)
+        missing, engineer, ordinal, skewness = (roles.get(role) for role in ("missing", "engineer", "ordinal", "skewness"))
+
+        features, weights, intercept, nominal_tables = _fold_column_transformer(roles["column_transformer"], model)
+        if "encoder" in roles:
+            features, weights, intercept = _fold_target_encoder(roles["encoder"], features, weights, intercept, nominal_tables)
+
+        # Features dérivées: mêmes formules que FeatureEngineer, évaluées en mode numérique
+        expressions = engineer.expressions if engineer is not None else None
+        derived_features = [f for f in features if expressions is not None and f in expressions.outputs]
+        ordinal_columns = [f for f in features if f in ORDINAL_MAPPINGS and f not in derived_features]
+        numeric_inputs, derived_categorical = _numeric_inputs(features, derived_features, ordinal_columns, expressions)
+        fix_garage_year = "anomaly" in roles and "GarageYrBlt" in numeric_inputs
+        if fix_garage_year and "YearBuilt" not in numeric_inputs:
+            numeric_inputs.append("YearBuilt")
+
+        ordinal_tables = {col: {k: float(v) for k, v in ORDINAL_MAPPINGS[col].items()} for col in ordinal_columns}
+        numeric_fill, categorical_fill = _imputation_constants(
+            missing, numeric_inputs, set(ordinal_tables) | set(nominal_tables) | derived_categorical
+        )
+        neighborhoods, lotfrontage_stats, lotfrontage_global = _lotfrontage_constants(missing)
+        log1p_features = [f for f in (skewness.skewed_features if skewness is not None else []) if f in features]
+
+        return cls(
+            numeric_inputs=numeric_inputs,
+            numeric_fill=numeric_fill,
+            categorical_fill=categorical_fill,
+            neighborhoods=neighborhoods,
+            lotfrontage_stats=lotfrontage_stats,
+            lotfrontage_global=lotfrontage_global,
+            fix_garage_year=fix_garage_year,
+            features=features,
+            log1p_features=log1p_features,
+            weights=weights,
+            intercept=intercept,
+            ordinal_tables=ordinal_tables,
+            nominal_tables=nominal_tables,
+            ordinal_unknown=float(ordinal.unknown_value) if ordinal is not None else math.nan,
+            expressions=expressions,
+            derived_features=derived_features,
+            derived_codes=_derived_codes(expressions, derived_features),
+            monitor=roles.get("monitor"),
+            monitor_steps=monitor_steps,
+        )
+
+    # ------------------------------------------------------------------
+    # Inférence
+    # ------------------------------------------------------------------
+
+    def predict(self, X: Union[pd.DataFrame, Mapping[str, Any]]) -> np.ndarray:
+        """
+        Prédit la cible (échelle log) comme pipeline.predict.
+
+        Args:
+            X: DataFrame de features brutes, ou un dictionnaire pour une seule observation
+
+        Returns:
+            Prédictions (n,)
+        """
+        self.observe(X)
+        if isinstance(X, Mapping):
+            return self._predict_record(X)
+
+        categorical = self._categorical_arrays(X)
+        c = self._numeric_arrays(X, categorical)
+
+        # 4. Features finales, log1p, produit scalaire et contributions one-hot
+        derived = self._derive(c, categorical)
+        Z = np.column_stack([derived[f] if f in derived else c[f] for f in self.features])
+        if len(self._ordinal_idx):
+            ordinal = Z[:, self._ordinal_idx]
+            Z[:, self._ordinal_idx] = np.where(np.isnan(ordinal), self.ordinal_unknown, ordinal)
+        if len(self._log1p_idx):
+            Z[:, self._log1p_idx] = np.log1p(Z[:, self._log1p_idx])
+        y = Z @ self.weights + self.intercept
+        for col, table in self.nominal_tables.items():
+            y += _lookup(table, categorical[col], 0.0)
+
+        if np.isnan(y).any():
+            raise ValueError("Input contains NaN (valeur manquante ou catégorie ordinale inconnue)")
+        return y
+
+    def _categorical_arrays(self, X: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Colonnes catégorielles imputées (quartiers rares regroupés en 'Autres')."""
+        frame = X.reindex(columns=self.categorical_inputs)
+        raw, gaps = frame.to_numpy(dtype=object), frame.isna().to_numpy()
+        categorical = {}
+        for j, col in enumerate(self.categorical_inputs):
+            values = raw[:, j]
+            values[gaps[:, j]] = self.categorical_fill.get(col)
+            categorical[col] = values
+        if self.neighborhoods is not None:
+            categorical["Neighborhood"] = [v if v in self.neighborhoods else "Autres" for v in categorical["Neighborhood"]]
+        return categorical
+
+    def _numeric_arrays(self, X: pd.DataFrame, categorical: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        """Colonnes numériques imputées, corrigées et encodées (étapes 1 à 3 du pipeline)."""
+        # 1. Imputation des colonnes numériques
+        numeric = X.reindex(columns=self.numeric_inputs).to_numpy(dtype=np.float64)
+        numeric = np.where(np.isnan(numeric) & self._numeric_fill_mask, self.numeric_fill, numeric)
+        c = dict(zip(self.numeric_inputs, numeric.T))
+        if self.neighborhoods is not None and "LotFrontage" in c:
+            stats = _lookup(self.lotfrontage_stats, categorical["Neighborhood"], np.nan)
+            lotfrontage = np.where(np.isnan(c["LotFrontage"]), stats, c["LotFrontage"])
+            if self.lotfrontage_global is not None:
+                lotfrontage = np.where(np.isnan(lotfrontage), self.lotfrontage_global, lotfrontage)
+            c["LotFrontage"] = lotfrontage
+
+        # 2. Correction d'anomalie GarageYrBlt > YearBuilt
+        if self.fix_garage_year:
+            garage, built = c["GarageYrBlt"], c["YearBuilt"]
+            c["GarageYrBlt"] = np.where(garage > built, built, garage)
+
+        # 3. Encodage ordinal
+        for col, table in self.ordinal_tables.items():
+            c[col] = _lookup(table, categorical[col], np.nan)
+        return c
+
+    def observe(self, X: Union[pd.DataFrame, Mapping[str, Any]]) -> None:
+        """
+        Alimente le moniteur de qualité sans prédire (batch échantillonné comme dans predict).
+
+        Utile quand la prédiction est servie par un autre moteur (OnnxPipeline).
+        """
+        if self.monitor is not None and self.monitor.should_sample():
+            self._observe(X)
+
+    def _observe(self, X: Union[pd.DataFrame, Mapping[str, Any]]) -> None:
+        """Batch échantillonné: prétraitement scikit-learn jusqu'au moniteur, puis comptage."""
+        try:
+            if isinstance(X, Mapping):
+                X = pd.DataFrame([X])
+                X = X.where(X.notna(), np.nan).infer_objects()
+            for step in self.monitor_steps:
+                X = step.transform(X)
+            self.monitor.observe(X)
+        except Exception as e:  # La surveillance ne doit jamais faire échouer une prédiction
+            logger.warning(f"DataQualityMonitor: batch non inspecté ({e})")
+
+    def _predict_record(self, record: Mapping[str, Any]) -> np.ndarray:
+        """Même calcul que predict() sur une observation, en arithmétique Python scalaire."""
+        categorical = self._record_categorical(record)
+        c = self._record_numeric(record, categorical)
+
+        derived = self._derive(c, categorical)
+        z = [derived[f] if f in derived else c[f] for f in self.features]
+        for j in self._ordinal_idx:
+            if z[j] != z[j]:
+                z[j] = self.ordinal_unknown
+        for j in self._log1p_idx:
+            z[j] = _log1p(z[j])
+        y = self.intercept + sum(map(operator.mul, self._weights_list, z))
+        for col, table in self.nominal_tables.items():
+            y += table.get(categorical[col], 0.0)
+
+        if y != y:
+            raise ValueError("Input contains NaN (valeur manquante ou catégorie ordinale inconnue)")
+        return np.array([y])
+
+    def _record_categorical(self, record: Mapping[str, Any]) -> Dict[str, Any]:
+        categorical = {}
+        for col in self.categorical_inputs:
+            value = record.get(col)
+            categorical[col] = self.categorical_fill.get(col) if value is None or value != value else value
+        if self.neighborhoods is not None and categorical["Neighborhood"] not in self.neighborhoods:
+            categorical["Neighborhood"] = "Autres"
+        return categorical
+
+    def _record_numeric(self, record: Mapping[str, Any], categorical: Dict[str, Any]) -> Dict[str, float]:
+        c = {}
+        for col, fill in zip(self.numeric_inputs, self._numeric_fill_list):
+            value = record.get(col)
+            c[col] = fill if value is None or value != value else float(value)
+        if self.neighborhoods is not None and "LotFrontage" in c and c["LotFrontage"] != c["LotFrontage"]:
+            c["LotFrontage"] = self.lotfrontage_stats.get(categorical["Neighborhood"], math.nan)
+            if c["LotFrontage"] != c["LotFrontage"] and self.lotfrontage_global is not None:
+                c["LotFrontage"] = self.lotfrontage_global
+
+        if self.fix_garage_year and c["GarageYrBlt"] > c["YearBuilt"]:
+            c["GarageYrBlt"] = c["YearBuilt"]
+
+        for col, table in self.ordinal_tables.items():
+            c[col] = table.get(categorical[col], math.nan)
+        return c
+
+    def _derive(self, c: Dict[str, Any], categorical: Dict[str, Any]) -> Dict[str, Any]:
+        """Features dérivées à partir des colonnes imputées (tableaux ou scalaires)."""
+        if not self.derived_features:
+            return {}
+        inputs = {**c, **{col: categorical[col] for col in self._derived_categorical}}
+        values = self.expressions.evaluate(inputs, self.derived_features, encoded=True)
+        for f, codes in self.derived_codes.items():
+            index = values[f]
+            if isinstance(index, np.ndarray):
+                valid = ~np.isnan(index)
+                decoded = np.full(len(index), np.nan)
+                decoded[valid] = codes[index[valid].astype(np.intp)]
+                values[f] = decoded
+            else:
+                values[f] = math.nan if index != index else float(codes[int(index)])
+        return values
+
+
+# Rôle des étapes compilées dans from_pipeline
+_STEP_ROLES = (
+    (MissingValuesHandler, "missing"),
+    (AnomalyCorrector, "anomaly"),
+    (FeatureEngineer, "engineer"),
+    (OrdinalEncoderCustom, "ordinal"),
+    (SkewnessCorrector, "skewness"),
+    (TargetFrequencyEncoder, "encoder"),
+    (ColumnTransformer, "column_transformer"),
+    (DataQualityMonitor, "monitor"),
+)
+# Étapes sans effet sur le calcul compilé (float64, valeurs des catégories; colonnes retirées absentes du ColumnTransformer)
+_NEUTRAL_STEPS = (DebugTransformer, NumericCaster, CategoricalCaster, FeatureSelector)
+
+
+def _step_roles(transformers: List[Any]) -> Tuple[Dict[str, Any], List[Any]]:
+    """Étapes de prétraitement par rôle, et étapes qui précèdent le DataQualityMonitor."""
+    roles: Dict[str, Any] = {}
+    monitor_steps: List[Any] = []
+    for i, step in enumerate(transformers):
+        role = next((role for kind, role in _STEP_ROLES if isinstance(step, kind)), None)
+        if role is None and not isinstance(step, _NEUTRAL_STEPS):
+            raise TypeError(f"Étape non compilable: {type(step).__name__}")
+        if role == "missing" and getattr(step, "knn_indexes_", None):
+            raise TypeError("MissingValuesHandler non compilable: imputation par plus proches voisins (knn)")
+        if role == "monitor":
+            monitor_steps = transformers[:i]
+        if role is not None:
+            roles[role] = step
+    if "column_transformer" not in roles or transformers[-1] is not roles["column_transformer"]:
+        raise TypeError("Le pipeline doit se terminer par le ColumnTransformer de create_full_pipeline()")
+    return roles, monitor_steps
+
+
+def _derived_codes(expressions: Optional[FeatureExpressions], derived_features: List[str]) -> Dict[str, np.ndarray]:
+    """Feature catégorielle dérivée -> code ordinal de chaque tranche."""
+    codes = {}
+    for f in derived_features:
+        labels = expressions.labels(f)
+        if labels is None:
+            continue
+        if f not in ORDINAL_MAPPINGS:
+            raise TypeError(f"Feature catégorielle dérivée non compilable (sans encodage ordinal): {f}")
+        codes[f] = np.array([ORDINAL_MAPPINGS[f].get(label, np.nan) for label in labels], dtype=np.float64)
+    return codes
+
+
+def _numeric_inputs(
+    features: List[str], derived_features: List[str], ordinal_columns: List[str], expressions: Optional[FeatureExpressions]
+) -> Tuple[List[str], set]:
+    """Colonnes brutes nécessaires au calcul des features numériques finales, et colonnes catégorielles des dérivées."""
+    numeric_inputs: List[str] = []
+    derived_categorical = set()
+    for f in features:
+        if f in derived_features:
+            derived_categorical.update(expressions.categorical_columns(f))
+            sources = [col for col in expressions.columns(f) if col not in derived_categorical]
+        else:
+            sources = () if f in ordinal_columns else (f,)
+        numeric_inputs.extend(src for src in sources if src not in numeric_inputs)
+    return numeric_inputs, derived_categorical
+
+
+def _lotfrontage_constants(missing: Optional[MissingValuesHandler]) -> Tuple[Optional[set], Dict[str, float], Optional[float]]:
+    """(quartiers conservés, LotFrontage par quartier, LotFrontage global) de MissingValuesHandler."""
+    if missing is None or missing.correct_neighborhoods_ is None:
+        return None, {}, None
+    stats = {k: float(v) for k, v in missing.stat_lotfrontage_per_neighborhood_.items()}
+    overall = float(missing.global_stat_lotfrontage_) if missing.global_stat_lotfrontage_ is not None else None
+    return set(missing.correct_neighborhoods_), stats, overall
+
+
+def _fold_column_transformer(
+    column_transformer: ColumnTransformer, model: Any
+) -> Tuple[List[str], np.ndarray, float, Dict[str, Dict[Any, float]]]:
+    """
+    Replie le ColumnTransformer final dans les coefficients du modèle linéaire.
+
+    Returns:
+        Tuple (features numériques, poids repliés, intercept replié, tables one-hot colonne -> catégorie -> poids)
+    """
+    coef = np.asarray(model.coef_, dtype=np.float64)
+    features: List[str] = []
+    feature_weights: List[float] = []
+    intercept = float(np.ravel(model.intercept_)[0])  # SGDRegressor: intercept_ de forme (1,)
+    nominal_tables: Dict[str, Dict[Any, float]] = {}
+
+    for name, transformer, columns in column_transformer.transformers_:
+        if transformer == "drop" or len(columns) == 0:
+            continue
+        columns = [column_transformer.feature_names_in_[c] if isinstance(c, (int, np.integer)) else c for c in columns]
+        block = coef[column_transformer.output_indices_[name]]
+        if isinstance(transformer, Pipeline):
+            if len(transformer.steps) != 1:
+                raise TypeError(f"Bloc '{name}' non compilable: {transformer}")
+            transformer = transformer.steps[0][1]
+
+        if isinstance(transformer, OneHotEncoder):
+            if transformer.drop_idx_ is not None or transformer.handle_unknown != "ignore":
+                raise TypeError("OneHotEncoder compilable uniquement avec drop=None et handle_unknown='ignore'")
+            offset = 0
+            for col, categories in zip(columns, transformer.categories_):
+                weights = block[offset : offset + len(categories)]
+                nominal_tables[col] = {None if _is_missing(c) else c: float(w) for c, w in zip(categories, weights)}
+                offset += len(categories)
+            continue
+
+        if transformer == "passthrough":
+            mean, scale = 0.0, 1.0
+        elif isinstance(transformer, StandardScaler):
+            mean = transformer.mean_ if transformer.mean_ is not None and transformer.with_mean else 0.0
+            scale = transformer.scale_ if transformer.scale_ is not None else 1.0
+        else:
+            raise TypeError(f"Bloc '{name}' non compilable: {type(transformer).__name__}")
+
+        # Repli du StandardScaler: w * (x - mean) / scale = (w / scale) * x - w * mean / scale
+        folded = block / scale
+        intercept -= float(np.dot(folded, np.broadcast_to(mean, len(columns))))
+        features.extend(columns)
+        feature_weights.extend(folded.tolist())
+
+    return features, np.array(feature_weights, dtype=np.float64), intercept, nominal_tables
+
+
+def _fold_target_encoder(
+    encoder: TargetFrequencyEncoder,
+    features: List[str],
+    weights: np.ndarray,
+    intercept: float,
+    nominal_tables: Dict[str, Dict[Any, float]],
+) -> Tuple[List[str], np.ndarray, float]:
+    """
+    Replie les colonnes <col>_target et <col>_freq de TargetFrequencyEncoder dans des tables
+    modalité -> contribution (comme un bloc one-hot). La contribution des modalités inconnues
+    (moyenne globale, fréquence 0) passe dans l'intercept: les tables valent 0 par défaut.
+
+    Returns:
+        Tuple (features numériques restantes, poids, intercept); nominal_tables est complété en place
+    """
+    index = {f: j for j, f in enumerate(features)}
+    folded = set()
+    for col, categories in encoder.categories_.items():
+        outputs = [f for f in encoder.output_columns(col) if f in index]  # Colonnes retirées par FeatureSelector absentes
+        if not outputs:
+            continue
+        w_target, w_freq = (weights[index[f]] if f in index else 0.0 for f in encoder.output_columns(col))
+        unknown = w_target * encoder.prior_
+        intercept += float(unknown)
+        contributions = w_target * encoder.target_[col] + w_freq * encoder.frequency_[col] - unknown
+        nominal_tables[col] = {None if _is_missing(c) else c: float(v) for c, v in zip(categories, contributions)}
+        folded.update(outputs)
+    keep = [j for j, f in enumerate(features) if f not in folded]
+    return [features[j] for j in keep], weights[keep], intercept
+
+
+def _imputation_constants(
+    missing: Optional[MissingValuesHandler], numeric_inputs: List[str], categorical_inputs: set
+) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """Constantes d'imputation, avec la même priorité que MissingValuesHandler: None, 0, puis mode."""
+    numeric_fill = np.full(len(numeric_inputs), np.nan)
+    categorical_fill: Dict[str, Any] = {}
+    if missing is None:
+        return numeric_fill, categorical_fill
+
+    none_features, zero_features = missing.none_features or [], missing.zero_features or []
+    modes = missing.mode_for_mode_features_ or {}
+    for col in categorical_inputs:
+        if col in none_features:
+            categorical_fill[col] = "None"
+        elif col in modes:
+            categorical_fill[col] = modes[col]
+    for j, col in enumerate(numeric_inputs):
+        if col in zero_features:
+            numeric_fill[j] = 0.0
+        elif col in modes and col != "LotFrontage":
+            numeric_fill[j] = float(modes[col])
+    return numeric_fill, categorical_fill
+
+
+def _flatten_steps(pipeline: Pipeline) -> List[Any]:
+    steps = []
+    for _, step in pipeline.steps:
+        if isinstance(step, Pipeline):
+            steps.extend(_flatten_steps(step))
+        elif step is not None and step != "passthrough":
+            steps.append(step)
+    return steps
+
+
+def compile_pipeline(pipeline: Pipeline) -> CompiledPipeline:
+    """
+    Compile un pipeline entraîné en noyau NumPy.
+
+    Args:
+        pipeline: Pipeline complet (create_full_pipeline + modèle linéaire type HuberRegressor)
+
+    Returns:
+        CompiledPipeline utilisable à la place du pipeline dans predict_model.predict
+    """
+    compiled = CompiledPipeline.from_pipeline(pipeline)
+    logger.info(
+        f"Pipeline compilé: {len(compiled.features)} features numériques, " f"{len(compiled.nominal_tables)} colonnes one-hot"
+    )
+    return compiled
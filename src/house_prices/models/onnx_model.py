@@ -0,0 +1,407 @@
+"""
+Export ONNX du pipeline complet et inférence par onnxruntime.
+
+Le pipeline entraîné est d'abord compilé (CompiledPipeline): imputation, quartiers,
+tables ordinales, formules de FeatureEngineer, masque log1p et ColumnTransformer replié
+dans les coefficients du modèle linéaire. Chaque élément est ensuite converti en nœuds
+d'un seul graphe ONNX en float64:
+
+    - MissingValuesHandler: Where(IsNaN) sur les constantes d'imputation; les colonnes
+      catégorielles (imputation, regroupement en 'Autres') sont repliées dans les tables
+    - AnomalyCorrector: Where(GarageYrBlt > YearBuilt)
+    - FeatureEngineer: graphe de FeatureExpressions traduit nœud par nœud
+    - OrdinalEncoderCustom, lookup(), one-hot: LabelEncoder (ai.onnx.ml) chaîne -> float64
+    - SkewnessCorrector: Log(1 + x)
+
+Le graphe prend deux entrées, `numeric` (float64, NaN pour les NA) et `categorical`
+(chaînes, "" pour les NA), dont l'ordre des colonnes est enregistré dans les métadonnées.
+L'inférence (OnnxPipeline) ne dépend que de NumPy, pandas et onnxruntime.
+
+Usage:
+    export_onnx(pipeline, "models/house_prices_model.onnx")
+    OnnxPipeline("models/house_prices_model.onnx").predict(X)
+"""
+
+import json
+import logging
+import math
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Union
+
+import numpy as np
+import pandas as pd
+from sklearn.pipeline import Pipeline
+
+from ..data.preprocessing import ORDINAL_MAPPINGS
+from .compiled_model import CompiledPipeline
+
+try:
+    import onnx
+    from onnx import TensorProto, helper, numpy_helper
+except ImportError:  # Dépendance optionnelle (export)
+    onnx = None
+
+try:
+    import onnxruntime
+except ImportError:  # Dépendance optionnelle (inférence)
+    onnxruntime = None
+
+logger = logging.getLogger(__name__)
+
+# Versions compatibles avec onnxruntime >= 1.17 (LabelEncoder à tables float64)
+ONNX_OPSET = 18
+ONNX_ML_OPSET = 4
+ONNX_IR_VERSION = 9
+
+# NA des colonnes catégorielles dans l'entrée `categorical`: marqueur absent des données
+# (la chaîne vide est une modalité comme une autre), enregistré dans les métadonnées du modèle
+_MISSING = "\x00__NA__"
+_UNSEEN = object()  # Modalité absente de toutes les tables
+
+
+class _GraphBuilder:
+    """Accumule les nœuds et les constantes d'un graphe ONNX (noms générés)."""
+
+    def __init__(self):
+        self.nodes: List[Any] = []
+        self.initializers: List[Any] = []
+        self._count = 0
+
+    def _name(self, prefix: str) -> str:
+        self._count += 1
+        return f"{prefix}_{self._count}"
+
+    def const(self, value: Any, dtype: Any = np.float64) -> str:
+        name = self._name("const")
+        self.initializers.append(numpy_helper.from_array(np.asarray(value, dtype=dtype), name))
+        return name
+
+    def op(self, op_type: str, *inputs: str, domain: str = "", **attributes: Any) -> str:
+        output = self._name(op_type.lower())
+        self.nodes.append(helper.make_node(op_type, list(inputs), [output], domain=domain, **attributes))
+        return output
+
+
+class _OnnxConverter:
+    """Conversion d'un CompiledPipeline en graphe ONNX, étape par étape."""
+
+    def __init__(self, compiled: CompiledPipeline):
+        self.compiled = compiled
+        self.graph = _GraphBuilder()
+        self.nan = self.graph.const(np.nan)
+        self.columns: Dict[str, str] = {}  # Colonne numérique -> tenseur [N]
+        self.strings: Dict[str, str] = {}  # Colonne catégorielle -> tenseur de chaînes [N]
+
+    # ------------------------------------------------------------------
+    # Entrées et tables
+    # ------------------------------------------------------------------
+
+    def _gather(self, matrix: str, j: int) -> str:
+        return self.graph.op("Gather", matrix, self.graph.const(j, np.int64), axis=1)
+
+    def _canonical(self, col: str, value: Any) -> Any:
+        """Modalité après MissingValuesHandler: imputation des NA puis regroupement des quartiers."""
+        if value is None:
+            value = self.compiled.categorical_fill.get(col)
+        if col == "Neighborhood" and self.compiled.neighborhoods is not None:
+            value = value if value in self.compiled.neighborhoods else "Autres"
+        return value
+
+    def lookup(self, col: str, table: Mapping[Any, float], default: float) -> str:
+        """
+        Table modalité brute -> valeur, imputation et regroupement compris: un seul
+        LabelEncoder par colonne et par table (NA et modalités inconnues comprises).
+        """
+        categories = {k for k in table if k is not None}
+        if col == "Neighborhood" and self.compiled.neighborhoods is not None:
+            categories |= set(self.compiled.neighborhoods)
+        categories = sorted(categories, key=str)
+        keys = [str(k) for k in categories] + [_MISSING]
+        values = [table.get(self._canonical(col, k), default) for k in categories]
+        values.append(table.get(self._canonical(col, None), default))
+        unseen = table.get(self._canonical(col, _UNSEEN), default)
+        return self.graph.op(
+            "LabelEncoder",
+            self.strings[col],
+            domain="ai.onnx.ml",
+            keys_strings=keys,
+            values_tensor=numpy_helper.from_array(np.asarray(values, dtype=np.float64)),
+            default_tensor=numpy_helper.from_array(np.asarray([unseen], dtype=np.float64)),
+        )
+
+    # ------------------------------------------------------------------
+    # Étapes
+    # ------------------------------------------------------------------
+
+    def missing_values(self, numeric: str, categorical: str) -> None:
+        """MissingValuesHandler: constantes d'imputation, puis LotFrontage par quartier."""
+        compiled = self.compiled
+        filled = self.graph.op("Where", self.graph.op("IsNaN", numeric), self.graph.const(compiled.numeric_fill), numeric)
+        for j, col in enumerate(compiled.numeric_inputs):
+            self.columns[col] = self._gather(filled, j)
+        for j, col in enumerate(compiled.categorical_inputs):
+            self.strings[col] = self._gather(categorical, j)
+
+        if compiled.neighborhoods is not None and "LotFrontage" in self.columns:
+            lotfrontage = self.columns["LotFrontage"]
+            stats = self.lookup("Neighborhood", compiled.lotfrontage_stats, math.nan)
+            lotfrontage = self.graph.op("Where", self.graph.op("IsNaN", lotfrontage), stats, lotfrontage)
+            if compiled.lotfrontage_global is not None:
+                fallback = self.graph.const(compiled.lotfrontage_global)
+                lotfrontage = self.graph.op("Where", self.graph.op("IsNaN", lotfrontage), fallback, lotfrontage)
+            self.columns["LotFrontage"] = lotfrontage
+
+    def anomaly(self) -> None:
+        """AnomalyCorrector: GarageYrBlt ramené à YearBuilt s'il lui est postérieur."""
+        if self.compiled.fix_garage_year:
+            garage, built = self.columns["GarageYrBlt"], self.columns["YearBuilt"]
+            self.columns["GarageYrBlt"] = self.graph.op("Where", self.graph.op("Greater", garage, built), built, garage)
+
+    def ordinal(self) -> None:
+        """OrdinalEncoderCustom: une table par colonne (NaN pour les inconnues, remplacé en fin de calcul)."""
+        for col, table in self.compiled.ordinal_tables.items():
+            self.columns[col] = self.lookup(col, table, math.nan)
+
+    def features(self) -> Dict[str, str]:
+        """FeatureEngineer: features dérivées finales, en mode numérique (comme CompiledPipeline._derive)."""
+        compiled = self.compiled
+        if not compiled.derived_features:
+            return {}
+        translator = _ExpressionTranslator(self, compiled.expressions)
+        derived = {}
+        for f in compiled.derived_features:
+            value = translator.node(compiled.expressions.outputs[f])
+            if f in compiled.derived_codes:
+                # Index de tranche -> code ordinal (NaN hors bornes)
+                valid = self.graph.op("Not", self.graph.op("IsNaN", value))
+                index = self.graph.op(
+                    "Cast", self.graph.op("Where", valid, value, self.graph.const(0.0)), to=TensorProto.INT64
+                )
+                codes = self.graph.op("Gather", self.graph.const(compiled.derived_codes[f]), index, axis=0)
+                value = self.graph.op("Where", valid, codes, self.nan)
+            derived[f] = value
+        return derived
+
+    def linear(self, derived: Dict[str, str]) -> str:
+        """SkewnessCorrector (log1p), puis ColumnTransformer et modèle repliés: produit scalaire et tables one-hot."""
+        compiled = self.compiled
+        one, axis = self.graph.const(1.0), self.graph.const([1], np.int64)
+        log1p = set(compiled.log1p_features)
+        unknown = None if math.isnan(compiled.ordinal_unknown) else self.graph.const(compiled.ordinal_unknown)
+        columns = []
+        for f in compiled.features:
+            value = derived.get(f, self.columns.get(f))
+            if f in ORDINAL_MAPPINGS and unknown is not None:
+                value = self.graph.op("Where", self.graph.op("IsNaN", value), unknown, value)
+            if f in log1p:
+                value = self.graph.op("Log", self.graph.op("Add", value, one))
+            columns.append(self.graph.op("Unsqueeze", value, axis))
+        Z = self.graph.op("Concat", *columns, axis=1)
+        y = self.graph.op("MatMul", Z, self.graph.const(compiled.weights))
+        terms = [y, self.graph.const(compiled.intercept)]
+        for col, table in compiled.nominal_tables.items():
+            terms.append(self.lookup(col, table, 0.0))
+        return self.graph.op("Sum", *terms)
+
+    # ------------------------------------------------------------------
+    # Graphe
+    # ------------------------------------------------------------------
+
+    def convert(self) -> "onnx.ModelProto":
+        compiled = self.compiled
+        inputs = [
+            helper.make_tensor_value_info("numeric", TensorProto.DOUBLE, [None, len(compiled.numeric_inputs)]),
+            helper.make_tensor_value_info("categorical", TensorProto.STRING, [None, len(compiled.categorical_inputs)]),
+        ]
+        self.missing_values("numeric", "categorical")
+        self.anomaly()
+        self.ordinal()
+        y = self.linear(self.features())
+        self.graph.nodes.append(helper.make_node("Identity", [y], ["variable"]))
+        outputs = [helper.make_tensor_value_info("variable", TensorProto.DOUBLE, [None])]
+
+        graph = helper.make_graph(self.graph.nodes, "house_prices", inputs, outputs, initializer=self.graph.initializers)
+        model = helper.make_model(
+            graph,
+            opset_imports=[helper.make_opsetid("", ONNX_OPSET), helper.make_opsetid("ai.onnx.ml", ONNX_ML_OPSET)],
+            ir_version=ONNX_IR_VERSION,
+            producer_name="house_prices",
+        )
+        helper.set_model_props(
+            model,
+            {
+                "numeric_inputs": json.dumps(compiled.numeric_inputs),
+                "categorical_inputs": json.dumps(compiled.categorical_inputs),
+                "missing_marker": _MISSING,
+            },
+        )
+        onnx.checker.check_model(model)
+        return model
+
+
+class _ExpressionTranslator:
+    """
+    Nœuds d'un graphe FeatureExpressions -> nœuds ONNX, avec la sémantique de
+    FeatureExpressions.evaluate(encoded=True): comparaisons en 0/1, max/min NaN si un
+    opérande est NaN, lookup par table, cut -> index de tranche (NaN hors bornes).
+    """
+
+    def __init__(self, converter: _OnnxConverter, expressions: Any):
+        self.converter = converter
+        self.graph = converter.graph
+        self.expressions = expressions
+        self.cache: Dict[int, str] = {}
+
+    def constant(self, index: int) -> Any:
+        op, *arguments = self.expressions.nodes[index]
+        if op == "const":
+            return arguments[0]
+        if op == "constant":
+            return self.expressions.constants[arguments[0]]
+        if op == "neg":
+            return -self.constant(arguments[0])
+        raise TypeError(f"Formule non exportable en ONNX: argument non constant ({op})")
+
+    def node(self, index: int) -> str:
+        if index not in self.cache:
+            self.cache[index] = self._translate(index)
+        return self.cache[index]
+
+    def _translate(self, index: int) -> str:
+        op, *arguments = self.expressions.nodes[index]
+        graph = self.graph
+        if op == "column":
+            return self.converter.columns[arguments[0]]
+        if op in ("const", "constant"):
+            return graph.const(float(self.constant(index)))
+        if op == "lookup":
+            return self._lookup(*arguments)
+        if op == "cut":
+            return self._cut(self.node(arguments[0]), [float(b) for b in self.constant(arguments[1])])
+        return self._operator(op, [self.node(argument) for argument in arguments])
+
+    def _lookup(self, values: int, table: int, default: Optional[int] = None) -> str:
+        """Table de correspondance, sur une colonne brute uniquement (encodée par le convertisseur)."""
+        column = self.expressions.nodes[values]
+        if column[0] != "column":
+            raise TypeError("Formule non exportable en ONNX: lookup() sur une expression")
+        table = {k: float(v) for k, v in self.constant(table).items()}
+        default = float(self.constant(default)) if default is not None else 0.0
+        return self.converter.lookup(column[1], table, default)
+
+    def _operator(self, op: str, operands: List[str]) -> str:
+        """Opérateurs unaires et binaires; les comparaisons renvoient 0.0/1.0 comme en mode numérique."""
+        graph = self.graph
+        unary = {"neg": "Neg", "abs": "Abs"}
+        binary = {"add": "Add", "sub": "Sub", "mul": "Mul", "div": "Div"}
+        if op in unary or op in binary:
+            return graph.op(unary.get(op) or binary[op], *operands)
+        if op in ("max", "min"):
+            a, b = operands
+            either_nan = graph.op("Or", graph.op("IsNaN", a), graph.op("IsNaN", b))
+            return graph.op("Where", either_nan, self.converter.nan, graph.op(op.capitalize(), a, b))
+        comparisons = {"eq": "Equal", "gt": "Greater", "ge": "GreaterOrEqual", "lt": "Less", "le": "LessOrEqual"}
+        if op in comparisons:
+            flag = graph.op(comparisons[op], *operands)
+        elif op == "ne":
+            flag = graph.op("Not", graph.op("Equal", *operands))
+        else:
+            raise TypeError(f"Formule non exportable en ONNX: opération {op}")
+        return graph.op("Cast", flag, to=TensorProto.DOUBLE)
+
+    def _cut(self, values: str, bins: List[float]) -> str:
+        """Index de tranche comme _cut_codes: nombre de bornes intérieures dépassées, NaN hors [bins[0], bins[-1]]."""
+        graph = self.graph
+        index = graph.op("Cast", graph.op("Greater", values, graph.const(bins[1])), to=TensorProto.DOUBLE)
+        for bound in bins[2:-1]:
+            index = graph.op(
+                "Add", index, graph.op("Cast", graph.op("Greater", values, graph.const(bound)), to=TensorProto.DOUBLE)
+            )
+        inside = graph.op(
+            "And",
+            graph.op("GreaterOrEqual", values, graph.const(bins[0])),
+            graph.op("LessOrEqual", values, graph.const(bins[-1])),
+        )
+        return graph.op("Where", inside, index, self.converter.nan)
+
+
+def export_onnx(pipeline: Pipeline, output_path: Optional[Union[str, Path]] = None) -> "onnx.ModelProto":
+    """
+    Convertit un pipeline entraîné (create_full_pipeline + modèle linéaire) en graphe ONNX.
+
+    Args:
+        pipeline: Pipeline complet, compilable par compile_pipeline
+        output_path: Fichier .onnx à écrire (optionnel)
+
+    Returns:
+        Modèle ONNX: entrées `numeric` et `categorical`, sortie `variable` (log1p(SalePrice))
+    """
+    if onnx is None:
+        raise ImportError("L'export ONNX nécessite le paquet optionnel onnx (pip install onnx)")
+    model = _OnnxConverter(CompiledPipeline.from_pipeline(pipeline)).convert()
+    if output_path is not None:
+        output_file = Path(output_path)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        output_file.write_bytes(model.SerializeToString())
+        logger.info(f"Modèle ONNX sauvegardé dans {output_path} ({len(model.graph.node)} nœuds)")
+    return model
+
+
+class OnnxPipeline:
+    """
+    Inférence d'un modèle exporté par export_onnx dans une session onnxruntime locale.
+
+    S'utilise comme le pipeline ou le CompiledPipeline dans predict_model.predict.
+
+    Args:
+        model: Chemin du fichier .onnx, ou modèle sérialisé (bytes)
+        threads: Threads intra-opération de la session (1: adapté aux workers d'API)
+    """
+
+    def __init__(self, model: Union[str, Path, bytes], threads: int = 1):
+        if onnxruntime is None:
+            raise ImportError("L'inférence ONNX nécessite le paquet optionnel onnxruntime (pip install onnxruntime)")
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = threads
+        source = model if isinstance(model, bytes) else str(model)
+        self.session = onnxruntime.InferenceSession(source, options, providers=["CPUExecutionProvider"])
+        metadata = self.session.get_modelmeta().custom_metadata_map
+        self.numeric_inputs: List[str] = json.loads(metadata["numeric_inputs"])
+        self.categorical_inputs: List[str] = json.loads(metadata["categorical_inputs"])
+        if metadata.get("missing_marker") != _MISSING:
+            # Exports antérieurs: NA codés par la chaîne vide, confondus avec la modalité ""
+            raise ValueError("Export ONNX obsolète (marqueur de valeur manquante), relancer scripts/export_onnx.py")
+
+    def _inputs(self, X: Union[pd.DataFrame, Mapping[str, Any]]) -> Dict[str, np.ndarray]:
+        if isinstance(X, Mapping):
+            numeric = [[_float(X.get(col)) for col in self.numeric_inputs]]
+            categorical = [[_string(X.get(col)) for col in self.categorical_inputs]]
+            return {"numeric": np.array(numeric, dtype=np.float64), "categorical": np.array(categorical, dtype=object)}
+        numeric = X.reindex(columns=self.numeric_inputs).to_numpy(dtype=np.float64, na_value=np.nan)
+        frame = X.reindex(columns=self.categorical_inputs)
+        categorical = frame.to_numpy(dtype=object)
+        categorical[frame.isna().to_numpy()] = _MISSING
+        return {"numeric": numeric, "categorical": categorical.astype(str).astype(object)}
+
+    def predict(self, X: Union[pd.DataFrame, Mapping[str, Any]]) -> np.ndarray:
+        """
+        Prédit la cible (échelle log) comme pipeline.predict.
+
+        Args:
+            X: DataFrame de features brutes, ou un dictionnaire pour une seule observation
+
+        Returns:
+            Prédictions (n,)
+        """
+        (y,) = self.session.run(None, self._inputs(X))
+        if np.isnan(y).any():
+            raise ValueError("Input contains NaN (valeur manquante ou catégorie ordinale inconnue)")
+        return y
+
+
+def _float(value: Any) -> float:
+    return math.nan if value is None else float(value)
+
+
+def _string(value: Any) -> str:
+    return _MISSING if value is None or value != value else str(value)
@@ -4,14 +4,17 @@ Updated to work with unified pipeline from grp_06_ml.py
 """
 
 import logging
+import os
 from pathlib import Path
-from typing import Any, Union
+from typing import Any, Sequence, Union
 
 import joblib
 import numpy as np
 import pandas as pd
 from sklearn.pipeline import Pipeline
 
+from ..data.load_data import iter_data
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -41,8 +44,8 @@ def predict(pipeline: Pipeline, X: pd.DataFrame, use_log: bool = True) -> np.nda
     Effectue des prédictions sur de nouvelles données.
 
     Args:
-        pipeline: Pipeline complet
-        X: Features pour la prédiction
+        pipeline: Pipeline complet, ou sa version compilée (voir compiled_model.compile_pipeline)
+        X: Features pour la prédiction (un dictionnaire suffit pour une observation avec un pipeline compilé)
         use_log: Si True, applique la transformation inverse de log
 
     Returns:
@@ -61,6 +64,54 @@ def predict(pipeline: Pipeline, X: pd.DataFrame, use_log: bool = True) -> np.nda
     return predictions
 
 
+def predict_file(
+    pipeline: Pipeline,
+    source: Union[str, Path, Sequence[Union[str, Path]]],
+    output_path: Union[str, Path],
+    chunksize: int = 100_000,
+    id_column: str = "Id",
+    target: str = "SalePrice",
+    use_log: bool = True,
+) -> int:
+    """
+    Prédit un ou plusieurs CSV par morceaux (iter_data), à mémoire bornée, vers un CSV (id_column, target).
+
+    Le fichier de sortie est écrit à côté sous un nom temporaire puis renommé: il n'existe
+    que complet.
+
+    Args:
+        pipeline: Pipeline complet, ou sa version compilée
+        source: CSV, dossier ou liste de CSV à prédire
+        output_path: CSV de sortie
+        chunksize: Nombre de lignes par morceau
+        id_column: Colonne d'identifiant recopiée dans la sortie (ignorée si absente)
+        target: Nom de la colonne des prédictions
+        use_log: Si True, applique la transformation inverse de log
+
+    Returns:
+        Nombre de lignes prédites
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output_path.with_name(f".{output_path.name}.{os.getpid()}.tmp")
+    rows = 0
+    try:
+        with open(tmp, "w", newline="") as f:
+            for chunk in iter_data(source, chunksize=chunksize):
+                y_pred = pipeline.predict(chunk.drop(columns=[id_column, target], errors="ignore"))
+                result = pd.DataFrame({target: np.expm1(y_pred) if use_log else y_pred})
+                if id_column in chunk.columns:
+                    result.insert(0, id_column, chunk[id_column].to_numpy())
+                result.to_csv(f, index=False, header=rows == 0)
+                rows += len(result)
+        os.replace(tmp, output_path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    logger.info(f"Prédictions effectuées pour {rows} observations: {output_path}")
+    return rows
+
+
 if __name__ == "__main__":
     # Test du module
     logger.info("Test du module de prédiction...")
@@ -0,0 +1,165 @@
+"""
+Recherche d'hyperparamètres par validation croisée avec prétraitement mis en cache par fold.
+
+RandomizedSearchCV sur Pipeline([preprocessing, model]) réentraîne le prétraitement pour
+chaque couple (candidat, fold): n_iter * cv fois le même calcul. FoldCachedSearchCV
+entraîne le prétraitement une fois par fold, enregistre les matrices transformées dans un
+FeatureStore (fichiers .npy relus en mémoire partagée par tous les workers joblib), puis
+évalue en parallèle chaque candidat du modèle final sur ces matrices.
+
+Usage:
+    search = FoldCachedSearchCV(create_full_pipeline(), Ridge(), {"alpha": loguniform(1e-2, 1e3)}, n_iter=50, cv=5)
+    search.fit(X, np.log1p(y))
+    search.best_params_, search.best_estimator_.predict(X_new)
+"""
+
+import logging
+import tempfile
+import time
+import warnings
+from typing import Any, Dict, List, Mapping, Optional, Union
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.base import BaseEstimator, clone
+from sklearn.metrics import check_scoring
+from sklearn.model_selection import ParameterSampler, check_cv
+from sklearn.pipeline import Pipeline
+
+from ..data.feature_store import FeatureStore
+
+logger = logging.getLogger(__name__)
+
+
+def _fit_and_score(model: Any, params: Dict[str, Any], fold: Any, y_train: np.ndarray, y_test: np.ndarray, scorer: Any):
+    """Entraîne une copie du modèle sur les matrices d'un fold; (score, durée d'entraînement)."""
+    start = time.perf_counter()
+    try:
+        estimator = clone(model).set_params(**params)
+        estimator.fit(fold.train, y_train)
+        fit_time = time.perf_counter() - start
+        return scorer(estimator, fold.test, y_test), fit_time
+    except Exception as e:  # Comme error_score=np.nan dans scikit-learn
+        warnings.warn(f"Candidat {params} en échec: {e}")
+        return np.nan, time.perf_counter() - start
+
+
+class FoldCachedSearchCV(BaseEstimator):
+    """
+    Recherche aléatoire des hyperparamètres du modèle final, prétraitement entraîné une fois par fold.
+
+    Args:
+        preprocessing: Pipeline de prétraitement non entraîné (ex: create_full_pipeline())
+        model: Modèle final
+        param_distributions: Distributions des paramètres du modèle (ParameterSampler);
+            le préfixe "model__" de RandomizedSearchCV sur Pipeline est accepté
+        n_iter: Nombre de candidats
+        cv: Découpage (entier ou générateur scikit-learn)
+        scoring: Score à maximiser (check_scoring)
+        n_jobs: Workers joblib des couples (candidat, fold)
+        random_state: Graine de l'échantillonnage des candidats
+        refit: Réentraîne le meilleur candidat sur tout le jeu (best_estimator_)
+        store: FeatureStore des matrices de fold (défaut: répertoire temporaire supprimé après fit);
+            un store persistant réutilise les folds d'une recherche à l'autre
+    """
+
+    def __init__(
+        self,
+        preprocessing: Any,
+        model: Any,
+        param_distributions: Union[Mapping[str, Any], List[Mapping[str, Any]]],
+        n_iter: int = 10,
+        cv: Any = 5,
+        scoring: Optional[str] = "neg_root_mean_squared_error",
+        n_jobs: Optional[int] = None,
+        random_state: Any = None,
+        refit: bool = True,
+        store: Optional[FeatureStore] = None,
+    ):
+        self.preprocessing = preprocessing
+        self.model = model
+        self.param_distributions = param_distributions
+        self.n_iter = n_iter
+        self.cv = cv
+        self.scoring = scoring
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+        self.refit = refit
+        self.store = store
+
+    @staticmethod
+    def _strip_prefix(distributions: Mapping[str, Any]) -> Dict[str, Any]:
+        return {key[len("model__") :] if key.startswith("model__") else key: value for key, value in distributions.items()}
+
+    def fit(self, X: pd.DataFrame, y: Any) -> "FoldCachedSearchCV":
+        """
+        Prétraitement par fold (une fois), puis n_iter * n_splits entraînements du modèle seul.
+
+        Args:
+            X: Features brutes
+            y: Cible (passée au prétraitement pour les étapes supervisées)
+        """
+        y = np.asarray(y)
+        distributions = self.param_distributions
+        if isinstance(distributions, Mapping):
+            distributions = self._strip_prefix(distributions)
+        else:
+            distributions = [self._strip_prefix(d) for d in distributions]
+        candidates = list(ParameterSampler(distributions, self.n_iter, random_state=self.random_state))
+        splits = list(check_cv(self.cv).split(X, y))
+        scorer = check_scoring(self.model, scoring=self.scoring)
+
+        with tempfile.TemporaryDirectory(prefix="fold_cache_") as tmp:
+            store = self.store if self.store is not None else FeatureStore(tmp, max_size_mb=None, max_age_days=None)
+
+            start = time.perf_counter()
+            folds = [store.fit_transform(self.preprocessing, X.iloc[train], y[train], X.iloc[test]) for train, test in splits]
+            self.preprocessing_time_ = time.perf_counter() - start
+            logger.info(f"FoldCachedSearchCV: {len(folds)} prétraitements de fold en {self.preprocessing_time_:.2f}s")
+
+            start = time.perf_counter()
+            results = Parallel(n_jobs=self.n_jobs)(
+                delayed(_fit_and_score)(self.model, params, fold, y[train], y[test], scorer)
+                for params in candidates
+                for fold, (train, test) in zip(folds, splits)
+            )
+            self.search_time_ = time.perf_counter() - start
+            logger.info(
+                f"FoldCachedSearchCV: {len(results)} entraînements du modèle en {self.search_time_:.2f}s "
+                f"({len(candidates)} candidats x {len(splits)} folds)"
+            )
+            del folds  # Libère les fichiers projetés en mémoire avant la suppression du répertoire
+
+        scores = np.array([score for score, _ in results], dtype=np.float64).reshape(len(candidates), len(splits))
+        fit_times = np.array([fit_time for _, fit_time in results]).reshape(len(candidates), len(splits))
+        self._store_results(candidates, scores, fit_times)
+
+        if self.refit:
+            preprocessing = clone(self.preprocessing)
+            features = preprocessing.fit_transform(X, y)
+            model = clone(self.model).set_params(**self.best_params_).fit(features, y)
+            self.best_estimator_ = Pipeline([("preprocessing", preprocessing), ("model", model)])
+        return self
+
+    def _store_results(self, candidates: List[Dict[str, Any]], scores: np.ndarray, fit_times: np.ndarray) -> None:
+        """cv_results_ au format de RandomizedSearchCV (params, scores par fold, moyenne, écart-type, rang)."""
+        mean = np.nanmean(scores, axis=1) if not np.isnan(scores).all() else np.full(len(candidates), np.nan)
+        ranking = pd.Series(mean).rank(ascending=False, method="min", na_option="bottom").astype(int).to_numpy()
+        self.cv_results_ = {
+            "params": candidates,
+            "mean_fit_time": fit_times.mean(axis=1),
+            "mean_test_score": mean,
+            "std_test_score": np.nanstd(scores, axis=1),
+            "rank_test_score": ranking,
+            **{f"split{i}_test_score": scores[:, i] for i in range(scores.shape[1])},
+        }
+        self.best_index_ = int(np.argmin(ranking))
+        self.best_params_ = candidates[self.best_index_]
+        self.best_score_ = float(mean[self.best_index_])
+
+    def predict(self, X: pd.DataFrame) -> np.ndarray:
+        return self.best_estimator_.predict(X)
+
+    def score(self, X: pd.DataFrame, y: Any) -> float:
+        return check_scoring(self.model, scoring=self.scoring)(self.best_estimator_, X, y)
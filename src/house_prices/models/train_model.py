@@ -1,22 +1,34 @@
 import logging
 from pathlib import Path
-from typing import Any, Dict, Tuple
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple, Union
 
 import joblib
 import numpy as np
 import pandas as pd
-from sklearn.linear_model import HuberRegressor
+from sklearn.linear_model import HuberRegressor, SGDRegressor
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 from sklearn.model_selection import train_test_split
 from sklearn.pipeline import Pipeline
 
+from ..data.feature_store import FeatureStore
+from ..data.incremental import fit_out_of_core
+from ..data.load_data import iter_data
 from ..data.preprocessing import create_full_pipeline
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def train_model(X: pd.DataFrame, y: pd.Series, params: Dict[str, Any] = None) -> Tuple[Pipeline, Any]:
+def train_model(
+    X: pd.DataFrame,
+    y: pd.Series,
+    params: Dict[str, Any] = None,
+    sparse: bool = False,
+    dtype: str = "float64",
+    categorical: bool = False,
+    store: Optional[FeatureStore] = None,
+    nominal_encoding: str = "onehot",
+) -> Tuple[Pipeline, Any]:
     """
     Entraîne le modèle HuberRegressor avec le pipeline de prétraitement complet.
 
@@ -24,6 +36,16 @@ def train_model(X: pd.DataFrame, y: pd.Series, params: Dict[str, Any] = None) ->
         X: Features d'entraînement
         y: Variable cible (SalePrice)
         params: Paramètres optionnels pour HuberRegressor
+        sparse: Matrice de features CSR (voir create_full_pipeline), consommée
+            directement par HuberRegressor sans densification
+        dtype: Politique de précision ("float64" ou "float32"). En float32, la matrice de
+            features et les coefficients du modèle sont en float32 (prédiction en float32)
+        categorical: Variables nominales portées en pandas Categorical de vocabulaire figé
+            (voir create_full_pipeline); X peut déjà les contenir (load_data(categorical=True))
+        store: Feature store: le prétraitement entraîné et la matrice de features sont relus
+            s'ils ont déjà été calculés pour les mêmes données et paramètres
+        nominal_encoding: "onehot" ou "target" (encodage cible hors fold et fréquence des
+            variables nominales à forte cardinalité, voir create_full_pipeline)
 
     Returns:
         Tuple (pipeline complet, y_log)
@@ -39,20 +61,98 @@ def train_model(X: pd.DataFrame, y: pd.Series, params: Dict[str, Any] = None) ->
 
     # Création du pipeline de prétraitement complet
     logger.info("Création du pipeline de prétraitement...")
-    preprocessing_pipeline = create_full_pipeline()
+    preprocessing_pipeline = create_full_pipeline(
+        sparse=sparse, dtype=dtype, categorical=categorical, nominal_encoding=nominal_encoding
+    )
 
     # Création du pipeline complet (preprocessing + model)
     logger.info(f"Entraînement du modèle HuberRegressor avec les paramètres: {default_params}")
     full_pipeline = Pipeline([("preprocessing", preprocessing_pipeline), ("model", HuberRegressor(**default_params))])
 
     # Entraînement
-    full_pipeline.fit(X, y_log)
+    if store is not None:
+        features = store.fit_transform(preprocessing_pipeline, X, y_log)
+        full_pipeline.steps[0] = ("preprocessing", features.pipeline)
+        full_pipeline.named_steps["model"].fit(features.train, y_log)
+    else:
+        full_pipeline.fit(X, y_log)
+    if np.dtype(dtype) != np.float64:
+        # L'optimiseur de HuberRegressor (L-BFGS) travaille en float64: coefficients ramenés au dtype
+        _cast_coefficients(full_pipeline.named_steps["model"], dtype)
     logger.info("Entraînement terminé avec succès")
 
     return full_pipeline, y_log
 
 
-def evaluate_model(pipeline: Pipeline, X_test: pd.DataFrame, y_test: pd.Series, use_log: bool = True) -> Dict[str, float]:
+def _cast_coefficients(model: Any, dtype: str) -> None:
+    """Convertit coef_ et intercept_ d'un modèle linéaire dans le dtype donné."""
+    dtype = np.dtype(dtype)
+    model.coef_ = np.asarray(model.coef_, dtype=dtype)
+    intercept = np.asarray(model.intercept_, dtype=dtype)
+    model.intercept_ = intercept if intercept.ndim else dtype.type(intercept)
+
+
+def train_model_out_of_core(
+    source: Union[str, Path, Sequence[Union[str, Path]], Callable[[], Iterable[pd.DataFrame]]],
+    target: str = "SalePrice",
+    params: Dict[str, Any] = None,
+    epochs: int = 5,
+    chunksize: int = 100_000,
+) -> Pipeline:
+    """
+    Entraîne le pipeline complet par morceaux, à mémoire bornée, sur un CSV de taille arbitraire.
+
+    HuberRegressor n'ayant pas de partial_fit, le modèle final est un SGDRegressor
+    avec la même perte de Huber, entraîné sur log1p(SalePrice) pendant `epochs` passes.
+    La cible est centrée sur sa moyenne (calculée par une passe préalable), rajoutée
+    ensuite à l'intercept: SGD n'a ainsi pas à apprendre un intercept d'environ 12.
+
+    Args:
+        source: CSV, dossier ou liste de CSV (lus par iter_data), ou fonction renvoyant un nouvel
+            itérateur de DataFrames à chaque appel
+        target: Colonne cible
+        params: Paramètres optionnels pour SGDRegressor
+        epochs: Nombre de passes sur les données pour le modèle final
+        chunksize: Nombre de lignes par morceau lu dans le CSV
+
+    Returns:
+        Pipeline complet (preprocessing + model)
+    """
+    default_params = {"loss": "huber", "epsilon": 0.1, "alpha": 1e-3, "random_state": 42}
+    if params:
+        default_params.update(params)
+
+    if callable(source):
+        read_chunks = source
+    else:
+
+        def read_chunks():
+            return iter_data(source, chunksize=chunksize)
+
+    def make_chunks():
+        for chunk in read_chunks():
+            yield chunk.drop(columns=["Id"], errors="ignore")
+
+    # Moyenne de log1p(cible), en streaming
+    total, count = 0.0, 0
+    chunks = iter_data(source, chunksize=chunksize, columns=[target]) if not callable(source) else read_chunks()
+    for chunk in chunks:
+        y_log = np.log1p(chunk[target].to_numpy(dtype=np.float64))
+        total, count = total + y_log.sum(), count + len(y_log)
+    offset = total / count
+
+    logger.info(f"Entraînement par morceaux du modèle SGDRegressor avec les paramètres: {default_params}")
+    full_pipeline = Pipeline([("preprocessing", create_full_pipeline()), ("model", SGDRegressor(**default_params))])
+    fit_out_of_core(full_pipeline, make_chunks, target=target, target_transform=lambda y: np.log1p(y) - offset, epochs=epochs)
+    full_pipeline.named_steps["model"].intercept_ += offset  # Retour à l'échelle log1p(SalePrice)
+    logger.info("Entraînement terminé avec succès")
+
+    return full_pipeline
+
+
+def evaluate_model(
+    pipeline: Pipeline, X_test: pd.DataFrame, y_test: pd.Series, use_log: bool = True, features: Any = None
+) -> Dict[str, float]:
     """
     Évalue les performances du modèle.
 
@@ -61,19 +161,19 @@ def evaluate_model(pipeline: Pipeline, X_test: pd.DataFrame, y_test: pd.Series,
         X_test: Features de test
         y_test: Variable cible de test
         use_log: Si True, applique la transformation inverse de log
+        features: Matrice de features de X_test déjà calculée (FeatureSet.test): seul le modèle prédit
 
     Returns:
         Dictionnaire des métriques
     """
     # Prédiction
-    if use_log:
-        y_test_log = np.log1p(y_test)
-        y_pred_log = pipeline.predict(X_test)
-        y_pred = np.expm1(y_pred_log)
-        y_test_eval = y_test
+    if features is not None:
+        y_pred = pipeline.named_steps["model"].predict(features)
     else:
         y_pred = pipeline.predict(X_test)
-        y_test_eval = y_test
+    if use_log:
+        y_pred = np.expm1(y_pred)
+    y_test_eval = y_test
 
     metrics = {
         "rmse": np.sqrt(mean_squared_error(y_test_eval, y_pred)),
@@ -85,6 +185,68 @@ def evaluate_model(pipeline: Pipeline, X_test: pd.DataFrame, y_test: pd.Series,
     return metrics
 
 
+def precision_report(
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+    X_test: pd.DataFrame,
+    y_test: pd.Series,
+    dtypes: Iterable[str] = ("float64", "float32"),
+    params: Dict[str, Any] = None,
+    sparse: bool = False,
+    rmse_tolerance: float = 0.01,
+    r2_tolerance: float = 0.005,
+) -> pd.DataFrame:
+    """
+    Rapport de précision des politiques de dtype.
+
+    Pour chaque dtype, entraîne le pipeline (train_model) et l'évalue sur le jeu de test
+    (evaluate_model). Le premier dtype sert de référence: écart relatif de RMSE, écart
+    de R², écart maximal des prédictions en échelle log, et taille de la matrice de features.
+
+    Args:
+        X_train, y_train: Jeu d'entraînement
+        X_test, y_test: Jeu de test
+        dtypes: Politiques comparées, la première étant la référence
+        params: Paramètres optionnels pour HuberRegressor
+        sparse: Matrice de features CSR
+        rmse_tolerance: Hausse relative de RMSE tolérée par rapport à la référence
+        r2_tolerance: Baisse de R² tolérée par rapport à la référence
+
+    Returns:
+        DataFrame indexé par dtype (rmse, mae, r2, rmse_delta, r2_delta, max_log_delta,
+        features_mb, within_tolerance)
+    """
+    rows = {}
+    reference = None
+    for dtype in dtypes:
+        pipeline, _ = train_model(X_train, y_train, params=params, sparse=sparse, dtype=dtype)
+        metrics = evaluate_model(pipeline, X_test, y_test, use_log=True)
+        features = pipeline.named_steps["preprocessing"].transform(X_test)
+        y_pred_log = np.asarray(pipeline.named_steps["model"].predict(features), dtype=np.float64)
+        nbytes = features.data.nbytes + features.indices.nbytes + features.indptr.nbytes if sparse else features.nbytes
+        if reference is None:
+            reference = metrics, y_pred_log
+
+        rmse_delta = metrics["rmse"] / reference[0]["rmse"] - 1
+        r2_delta = metrics["r2"] - reference[0]["r2"]
+        rows[dtype] = {
+            **metrics,
+            "rmse_delta": rmse_delta,
+            "r2_delta": r2_delta,
+            "max_log_delta": float(np.max(np.abs(y_pred_log - reference[1]))),
+            "features_mb": nbytes / 1024**2,
+            "within_tolerance": rmse_delta <= rmse_tolerance and r2_delta >= -r2_tolerance,
+        }
+        logger.info(
+            f"Précision {dtype}: RMSE={metrics['rmse']:,.2f} ({rmse_delta:+.3%}), "
+            f"R²={metrics['r2']:.4f} ({r2_delta:+.4f}), features={nbytes / 1024**2:.2f} Mo"
+        )
+
+    report = pd.DataFrame.from_dict(rows, orient="index")
+    report.index.name = "dtype"
+    return report
+
+
 def save_model(pipeline: Pipeline, output_path: str):
     """
     Sauvegarde le pipeline complet dans un fichier pkl.
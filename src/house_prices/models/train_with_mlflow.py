@@ -5,7 +5,7 @@ Script d'entraînement avec tracking MLflow pour comparer plusieurs modèles.
 import json
 import logging
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import mlflow
 import mlflow.sklearn
@@ -16,6 +16,7 @@ from sklearn.linear_model import BayesianRidge
 from sklearn.model_selection import train_test_split
 from sklearn.pipeline import Pipeline
 
+from ..data.feature_store import FeatureSet, FeatureStore
 from ..data.load_data import load_data
 from ..data.preprocessing import create_full_pipeline
 from .train_model import evaluate_model
@@ -32,9 +33,13 @@ def train_and_log_model(
     X_test: pd.DataFrame,
     y_test: pd.Series,
     run_params: Dict[str, Any] = None,
+    features: Optional[FeatureSet] = None,
 ):
     """
     Entraîne un modèle spécifique et le log dans MLflow.
+
+    Avec `features` (FeatureStore.fit_transform), le prétraitement entraîné et les matrices
+    train/test sont réutilisés: seul le modèle est entraîné.
     """
     with mlflow.start_run(run_name=f"Train_{model_name}", nested=True):
         logger.info(f"--- Entraînement du modèle : {model_name} ---")
@@ -46,17 +51,21 @@ def train_and_log_model(
                 mlflow.log_param(k, v)
 
         # Création du pipeline
-        preprocessing = create_full_pipeline()
+        preprocessing = create_full_pipeline() if features is None else features.pipeline
         pipeline = Pipeline([("preprocessing", preprocessing), ("model", model_instance)])
 
         # Transformation log de la cible
         y_train_log = np.log1p(y_train)
 
         # Entraînement
-        pipeline.fit(X_train, y_train_log)
+        if features is None:
+            pipeline.fit(X_train, y_train_log)
+        else:
+            model_instance.fit(features.train, y_train_log)
 
         # Évaluation (avec inversion du log gérée par evaluate_model si use_log=True)
-        metrics = evaluate_model(pipeline, X_test, y_test, use_log=True)
+        test_features = features.test if features is not None else None
+        metrics = evaluate_model(pipeline, X_test, y_test, use_log=True, features=test_features)
 
         # Log des métriques
         mlflow.log_metric("rmse", metrics["rmse"])
@@ -90,6 +99,9 @@ def run_comparison(experiment_name: str = "Compare Models"):
 
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
 
+    # Un seul prétraitement pour tous les modèles (relu du feature store s'il existe déjà)
+    features = FeatureStore.from_config().fit_transform(create_full_pipeline(), X_train, np.log1p(y_train), X_test)
+
     from sklearn.linear_model import HuberRegressor, Ridge
 
     models_to_test = [
@@ -110,7 +122,7 @@ def run_comparison(experiment_name: str = "Compare Models"):
 
         results = []
         for name, model, params in models_to_test:
-            metrics = train_and_log_model(name, model, X_train, y_train, X_test, y_test, params)
+            metrics = train_and_log_model(name, model, X_train, y_train, X_test, y_test, params, features=features)
             results.append({"model": name, **metrics})
 
     # Afficher le résumé
@@ -4,6 +4,8 @@ from pathlib import Path
 import numpy as np
 import pandas as pd
 
+from ..data.load_data import read_csv_cached
+
 
 def generate_stats():
     raw_data_path = Path("data/raw/train.csv")
@@ -13,7 +15,7 @@ def generate_stats():
         print(f"Error: {raw_data_path} not found.")
         return
 
-    df = pd.read_csv(raw_data_path)
+    df = read_csv_cached(raw_data_path, columns=["Neighborhood", "SalePrice"])
 
     # Overview stats
     stats = {
@@ -2,25 +2,48 @@
 Tests unitaires pour le module de chargement des données.
 """
 
+import os
 import sys
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
 import pytest
+from sklearn.base import clone
+from sklearn.compose import ColumnTransformer
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
 
 # Ajoute le chemin src au sys.path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from house_prices.data.load_data import display_data_info, get_target_distribution, load_data
+from house_prices.data.feature_store import FeatureStore
+from house_prices.data.features import FeatureExpressionError, FeatureExpressions
+from house_prices.data.ingest import ingest_partitions
+from house_prices.data.load_data import (
+    display_data_info,
+    get_target_distribution,
+    iter_data,
+    load_config,
+    load_data,
+    save_data,
+)
 from house_prices.data.preprocessing import (
     AnomalyCorrector,
+    CategoricalCaster,
+    DataQualityMonitor,
     FeatureEngineer,
+    FeatureSelector,
+    MedianSketch,
     MissingValuesHandler,
+    ModeSketch,
+    NeighborIndex,
     OrdinalEncoderCustom,
     SkewnessCorrector,
+    TargetFrequencyEncoder,
     create_full_pipeline,
 )
+from house_prices.data.profiling import profile_data
+from house_prices.data.schema import ColumnSchema, FrozenColumnTransformer, SchemaDriftError
 
 
 class TestDataLoading:
@@ -49,6 +72,110 @@ class TestDataLoading:
 
         shutil.rmtree(test_dir)
 
+    def test_load_data_parquet_cache(self, tmp_path):
+        """Cache Parquet à côté du CSV: colonnes et schéma demandés, invalidé quand le contenu change."""
+        pytest.importorskip("pyarrow")
+        csv = tmp_path / "train.csv"
+        pd.DataFrame({"Id": [1, 2, 3], "LotArea": [10, 20, 30], "Street": ["Pave", "Grvl", None]}).to_csv(csv, index=False)
+        expected = pd.read_csv(csv, usecols=["Street", "LotArea"], dtype={"LotArea": "float64"})[["Street", "LotArea"]]
+
+        for hit in (False, True):
+            df, _ = load_data(str(tmp_path), columns=["Street", "LotArea", "SalePrice"], dtypes={"LotArea": "float64"})
+            pd.testing.assert_frame_equal(df, expected)
+            assert (tmp_path / "train.csv.parquet").exists()
+        df, _ = load_data(str(tmp_path), columns=["Street"], categorical=True)
+        assert isinstance(df["Street"].dtype, pd.CategoricalDtype)
+
+        # CSV touché sans modification: cache conservé; contenu modifié: cache réécrit
+        cache_mtime = (tmp_path / "train.csv.parquet").stat().st_mtime_ns
+        os.utime(csv, ns=(cache_mtime + 10**9, cache_mtime + 10**9))
+        load_data(str(tmp_path))
+        assert (tmp_path / "train.csv.parquet").stat().st_mtime_ns == cache_mtime
+        pd.DataFrame({"Id": [4], "LotArea": [40], "Street": ["Pave"]}).to_csv(csv, index=False)
+        df, _ = load_data(str(tmp_path))
+        pd.testing.assert_frame_equal(df, pd.read_csv(csv))
+
+    def test_load_data_cache_text_dtypes(self, tmp_path):
+        """dtypes texte appliqués à l'analyse du CSV, avec ou sans cache: zéros et décimales conservés."""
+        pytest.importorskip("pyarrow")
+        csv = tmp_path / "train.csv"
+        csv.write_text("Id,Zip,Code\n1,00501,1.50\n2,10001,2.00\n")
+        dtypes = {"Zip": str, "Code": str}
+        expected = pd.read_csv(csv, dtype=dtypes)
+
+        load_data(str(tmp_path))  # Cache écrit avec les dtypes inférés
+        for cache in (True, True, False):
+            df, _ = load_data(str(tmp_path), dtypes=dtypes, cache=cache)
+            pd.testing.assert_frame_equal(df, expected)
+            assert df["Zip"].tolist() == ["00501", "10001"] and df["Code"].tolist() == ["1.50", "2.00"]
+        for chunk in iter_data(csv, dtypes=dtypes):
+            pd.testing.assert_frame_equal(chunk, expected)
+
+    def test_load_data_cache_skips_replaced_csv(self, tmp_path, monkeypatch):
+        """CSV remplacé pendant son analyse: pas de cache écrit sous l'état du nouveau fichier."""
+        pytest.importorskip("pyarrow")
+        csv = tmp_path / "train.csv"
+        pd.DataFrame({"Id": [1], "LotArea": [10]}).to_csv(csv, index=False)
+        read_csv = pd.read_csv
+
+        def read_then_replace(path, *args, **kwargs):
+            df = read_csv(path, *args, **kwargs)
+            if kwargs.get("nrows") != 0:
+                pd.DataFrame({"Id": [2, 3], "LotArea": [20, 30]}).to_csv(csv, index=False)
+            return df
+
+        monkeypatch.setattr(pd, "read_csv", read_then_replace)
+        df, _ = load_data(str(tmp_path))
+        monkeypatch.setattr(pd, "read_csv", read_csv)
+        assert df["Id"].tolist() == [1]
+        assert not (tmp_path / "train.csv.parquet").exists()
+        assert load_data(str(tmp_path))[0]["Id"].tolist() == [2, 3]
+
+    def test_iter_data_chunks(self, tmp_path):
+        """Morceaux typés de plusieurs CSV, avec projection et filtre de lignes par morceau."""
+        df = pd.DataFrame({"Id": range(10), "Street": ["Pave"] + [None] * 9, "LotArea": np.arange(10.0)})
+        df.iloc[:6].to_csv(tmp_path / "part1.csv", index=False)
+        df.iloc[6:].to_csv(tmp_path / "part2.csv", index=False)
+
+        chunks = list(iter_data(tmp_path, chunksize=4))
+        assert [len(chunk) for chunk in chunks] == [4, 2, 4]
+        assert len({tuple(chunk.dtypes) for chunk in chunks}) == 1  # Street reste une colonne de chaînes
+        expected = df.astype({"Street": chunks[0]["Street"].dtype})
+        pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected)
+
+        chunks = list(
+            iter_data(
+                [tmp_path / "part1.csv", tmp_path / "part2.csv"],
+                chunksize=3,
+                columns=["LotArea"],
+                row_filter=lambda chunk: chunk["Id"] % 2 == 0,
+                filter_columns=["Id"],
+            )
+        )
+        assert [list(chunk.columns) for chunk in chunks] == [["LotArea"]] * len(chunks)
+        assert pd.concat(chunks)["LotArea"].tolist() == [0.0, 2.0, 4.0, 6.0, 8.0]
+
+    def test_ingest_partitions(self, tmp_path):
+        """Partitions imbriquées analysées en parallèle: schémas unifiés, doublons d'Id retirés (plus récent gardé)."""
+        (tmp_path / "2024" / "02").mkdir(parents=True)
+        pd.DataFrame({"Id": [1, 2], "MSSubClass": [60, 20], "SalePrice": [100, 200]}).to_csv(
+            tmp_path / "2024" / "01.csv", index=False
+        )
+        pd.DataFrame({"Id": [2, 3], "MSSubClass": ["20", "C"], "LotArea": [8450.0, None], "SalePrice": [210, 300]}).to_csv(
+            tmp_path / "2024" / "02" / "sales.csv", index=False
+        )
+
+        report = ingest_partitions(tmp_path, tmp_path / "out" / "sales.parquet", n_jobs=2)
+        assert [path.name for path in report.partitions] == ["01.csv", "sales.csv"]
+        assert (report.rows_read, report.rows, report.duplicates) == (4, 3, 1)
+
+        sales = pd.read_parquet(report.path)
+        assert list(sales.columns) == ["Id", "MSSubClass", "SalePrice", "LotArea"]
+        assert sales["Id"].tolist() == [1, 2, 3]
+        assert sales["SalePrice"].tolist() == [100, 210, 300]  # Vente 2: version de la partition la plus récente
+        assert sales["MSSubClass"].tolist() == ["60", "20", "C"]  # Entiers d'une partition convertis en texte
+        assert sales["LotArea"].dtype == np.float64 and sales["LotArea"].isna().tolist() == [True, False, True]
+
     def test_display_data_info(self, capsys):
         """Test de l'affichage des informations du dataset."""
         df = pd.DataFrame(
@@ -72,6 +199,79 @@ class TestDataLoading:
         assert stats["min"] == 100000
         assert stats["max"] == 500000
 
+    def test_save_data_formats(self, tmp_path):
+        """Sauvegarde atomique en CSV compressé, Parquet, Feather et Parquet partitionné."""
+        df = pd.DataFrame({"Id": [1, 2, 3], "YrSold": [2008, 2009, 2008], "SalePrice": [208500.0, 181500.0, 223500.0]})
+
+        for filename, read in [
+            ("out.csv.gz", pd.read_csv),
+            ("out.parquet", pd.read_parquet),
+            ("out.feather", pd.read_feather),
+        ]:
+            path = save_data(df, tmp_path, filename)
+            pd.testing.assert_frame_equal(read(path), df)
+        assert save_data(df, tmp_path, "out.bin", format="parquet", compression="snappy").exists()
+        pd.testing.assert_frame_equal(pd.read_csv(save_data(df, tmp_path, "out")), df)  # Sans extension: CSV
+        with pytest.raises(ValueError):
+            save_data(df, tmp_path, "out.xlsx", format="xlsx")
+
+        path = save_data(df, tmp_path, "sales", format="parquet", partition_cols=["YrSold"])
+        save_data(df.iloc[:2], tmp_path, "sales", format="parquet", partition_cols=["YrSold"])  # Remplace le dossier
+        assert sorted(p.name for p in path.iterdir()) == ["YrSold=2008", "YrSold=2009"]
+        assert pd.read_parquet(path, filters=[("YrSold", "==", 2008)])["Id"].tolist() == [1]
+        hidden = [p.name for p in tmp_path.iterdir() if p.name.startswith(".")]
+        assert len(hidden) == 1 and hidden[0].startswith(".sales.v")  # Version publiée seulement
+
+    def test_save_data_partitions_failed_swap(self, tmp_path, monkeypatch):
+        """Échec de la publication d'un dossier partitionné: l'ancien jeu reste lisible sous le même chemin."""
+        df = pd.DataFrame({"Id": [1, 2], "YrSold": [2008, 2009]})
+        (tmp_path / "sales").mkdir()  # Dossier réel écrit par une version antérieure
+        df.to_parquet(tmp_path / "sales" / "part.parquet", index=False)
+        replace = os.replace
+
+        def failing_replace(src, dst):
+            if Path(dst) == tmp_path / "sales" and not Path(src).name.startswith(".old-"):
+                raise OSError("disque plein")
+            return replace(src, dst)
+
+        monkeypatch.setattr(os, "replace", failing_replace)
+        with pytest.raises(OSError):
+            save_data(df.iloc[:1], tmp_path, "sales", format="parquet", partition_cols=["YrSold"])
+        monkeypatch.setattr(os, "replace", replace)
+        assert [p.name for p in tmp_path.iterdir()] == ["sales"]
+        pd.testing.assert_frame_equal(pd.read_parquet(tmp_path / "sales"), df)
+
+        save_data(df.iloc[:1], tmp_path, "sales", format="parquet", partition_cols=["YrSold"])
+        save_data(df, tmp_path, "sales", format="parquet", partition_cols=["YrSold"])
+        assert (tmp_path / "sales").is_symlink()
+        assert sorted(pd.read_parquet(tmp_path / "sales")["Id"].tolist()) == [1, 2]
+
+    def test_dataset_profile(self):
+        """Profil par morceaux et profils fusionnés identiques aux statistiques pandas."""
+        df = pd.DataFrame(
+            {
+                "LotArea": [8450.0, np.nan, 11250.0, 9550.0, 14260.0, 14115.0, 10084.0, np.nan],
+                "Street": ["Pave", "Grvl", None, "Pave", "Pave", None, "Grvl", "Pave"],
+                "SalePrice": [208500, 181500, 223500, 140000, 250000, 143000, 307000, 200000],
+            }
+        )
+        profile = profile_data(df, chunksize=3, target="SalePrice")
+        merged = profile_data(df.iloc[:5], target="SalePrice").merge(profile_data(df.iloc[5:], target="SalePrice"))
+
+        for summary in (profile.summary(), merged.summary()):
+            assert summary["missing"].tolist() == [2, 2, 0]
+            assert summary["distinct"].tolist() == [6, 2, 8]
+            assert summary.loc["Street", "top"] == "Pave" and summary.loc["Street", "top_freq"] == 4
+            for col in ("LotArea", "SalePrice"):
+                stats = summary.loc[col]
+                assert stats["mean"] == pytest.approx(df[col].mean())
+                assert stats["std"] == pytest.approx(df[col].std())
+                assert stats["skewness"] == pytest.approx(df[col].skew())
+                assert stats["kurtosis"] == pytest.approx(df[col].kurtosis())
+                assert stats["q25"] == pytest.approx(df[col].quantile(0.25))
+                assert (stats["min"], stats["max"]) == (df[col].min(), df[col].max())
+            assert summary.loc["LotArea", "target_corr"] == pytest.approx(df["LotArea"].corr(df["SalePrice"]))
+
     def test_get_target_distribution_missing_column(self):
         """Test avec une colonne cible manquante."""
         df = pd.DataFrame({"Feature1": [1, 2, 3]})
@@ -186,6 +386,182 @@ class TestCustomTransformers:
         assert df_transformed["GarageType"].notna().all()
         assert df_transformed["GarageArea"].notna().all()
 
+    def test_missing_values_handler_lotfrontage_by_neighborhood(self):
+        """Test de l'imputation de LotFrontage par médiane de quartier (quartiers rares regroupés en 'Autres')."""
+        df = pd.DataFrame(
+            {
+                "LotFrontage": [60, 80, np.nan, 100, 120, np.nan, 50, np.nan],
+                "Neighborhood": ["A", "A", "A", "B", "B", "B", "Rare", "Inconnu"],
+            }
+        )
+
+        handler = MissingValuesHandler(
+            none_features=[], zero_features=[], group_impute={}, mode_features=[], neighborhoods_threshold=0.2
+        )
+        handler.fit(df)
+        df_transformed = handler.transform(df)
+
+        assert handler.stat_lotfrontage_per_neighborhood_ == {"A": 70.0, "B": 110.0, "Autres": 50.0}
+        assert df_transformed["LotFrontage"].tolist() == [60, 80, 70, 100, 120, 110, 50, 50]
+        assert df_transformed["Neighborhood"].tolist()[-2:] == ["Autres", "Autres"]
+        # Le DataFrame d'entrée n'est pas modifié
+        assert df["LotFrontage"].isna().sum() == 3
+
+    def test_sketches_merge(self):
+        """Les résumés fusionnés par morceaux donnent le mode et la médiane exacts."""
+        rng = np.random.default_rng(0)
+        values = pd.Series(rng.integers(0, 50, 1001).astype(float))
+        values[::9] = np.nan
+        labels = pd.Series(rng.choice(["a", "b", "c", None], 1001, p=[0.3, 0.3, 0.3, 0.1]))
+
+        medians, modes = [MedianSketch(), MedianSketch()], [ModeSketch(), ModeSketch()]
+        for start in range(0, len(values), 100):
+            medians[start // 100 % 2].update(values[start : start + 100])
+            modes[start // 100 % 2].update(labels[start : start + 100])
+        median, mode = medians[0].merge(medians[1]), modes[0].merge(modes[1])
+
+        assert median.median() == values.median()
+        assert np.isclose(median.mean(), values.mean())
+        assert mode.mode() == labels.mode()[0]
+        assert mode.proportions() == pytest.approx(labels.value_counts(normalize=True).to_dict())
+
+        # Au-delà de max_size valeurs distinctes, la médiane devient approchée
+        approx = MedianSketch(max_size=64).update(rng.normal(size=5000))
+        assert len(approx.values) <= 64
+        assert abs(approx.median()) < 0.1
+
+    def test_missing_values_handler_partial_fit(self):
+        """partial_fit par morceaux apprend les mêmes paramètres qu'un fit complet."""
+        train_df, _ = load_data("data/raw")
+        df = train_df.drop(columns=["SalePrice", "Id"])
+        pipeline = create_full_pipeline()
+        params = pipeline.named_steps["missing"].get_params()
+
+        full = MissingValuesHandler(**params).fit(df)
+        streamed = MissingValuesHandler(**params)
+        for start in range(0, len(df), 200):
+            streamed.partial_fit(df.iloc[start : start + 200])
+
+        assert streamed.correct_neighborhoods_ == full.correct_neighborhoods_
+        assert streamed.mode_for_mode_features_ == full.mode_for_mode_features_
+        assert streamed.global_stat_lotfrontage_ == full.global_stat_lotfrontage_
+        assert streamed.stat_lotfrontage_per_neighborhood_ == full.stat_lotfrontage_per_neighborhood_
+        pd.testing.assert_frame_equal(streamed.transform(df), full.transform(df))
+
+    def test_missing_values_handler_knn(self):
+        """Imputation par plus proches voisins: index construit au fit, repli par quartier sans prédicteurs."""
+        rng = np.random.default_rng(0)
+        n = 400
+        lot_area = rng.uniform(5000, 20000, n)
+        df = pd.DataFrame(
+            {
+                "LotArea": lot_area,
+                "GrLivArea": rng.uniform(800, 3000, n),
+                "LotFrontage": lot_area / 100,  # Relation que la médiane du quartier ignore
+                "MasVnrArea": lot_area / 50,
+                "Neighborhood": rng.choice(["A", "B"], n),
+            }
+        )
+        df.loc[::10, ["LotFrontage", "MasVnrArea"]] = np.nan
+        df.loc[10, "GrLivArea"] = np.nan  # Prédicteurs incomplets
+
+        handler = MissingValuesHandler(
+            none_features=[],
+            zero_features=[],
+            group_impute={},
+            mode_features=[],
+            strategy_lotfrontage="knn",
+            knn_features=["LotFrontage", "MasVnrArea"],
+        )
+        out = handler.fit(df).transform(df)
+
+        assert len(handler.knn_indexes_["LotFrontage"]) == n - 40
+        imputed = out.loc[df.index[::10].drop(10)]
+        np.testing.assert_allclose(imputed["LotFrontage"], imputed["LotArea"] / 100, rtol=0.2)
+        np.testing.assert_allclose(imputed["MasVnrArea"], imputed["LotArea"] / 50, rtol=0.2)
+        assert out.loc[10, "LotFrontage"] == handler.stat_lotfrontage_per_neighborhood_[df.loc[10, "Neighborhood"]]
+        assert out.loc[10, "MasVnrArea"] == handler.knn_indexes_["MasVnrArea"].fallback
+
+        # Par morceaux: index construit une fois, au premier transform
+        streamed = clone(handler)
+        for start in range(0, n, 100):
+            streamed.partial_fit(df.iloc[start : start + 100])
+        assert streamed.finalize_pending_ and streamed.knn_indexes_["LotFrontage"].tree is None
+        pd.testing.assert_frame_equal(streamed.transform(df), out)
+        assert not streamed.finalize_pending_
+
+        # Échantillon borné et fusionnable par morceaux
+        chunks = [NeighborIndex(max_size=50).update(df[["LotArea"]], df["LotFrontage"]) for _ in range(2)]
+        assert len(chunks[0].merge(chunks[1])) == 50
+
+    def test_feature_selector(self):
+        """VIF par l'inverse de la matrice de corrélation, information mutuelle par blocs parallèles."""
+        rng = np.random.default_rng(0)
+        n = 500
+        df = pd.DataFrame({"a": rng.normal(size=n), "b": rng.normal(size=n), "noise": rng.normal(size=n)})
+        df["c"] = df["a"] + df["b"] + rng.normal(scale=0.01, size=n)  # Quasi colinéaire
+        df["constant"] = 1.0
+        df["label"] = rng.choice(["x", "y"], n)
+        y = df["a"] - df["b"] + rng.normal(scale=0.1, size=n)
+
+        # VIF identiques à ceux des régressions d'une colonne sur les autres (variance_inflation_factor)
+        selector = FeatureSelector(vif_threshold=None, mi_threshold=None).fit(df, y)
+        for col in ["a", "b", "noise", "c"]:
+            others = np.column_stack([np.ones(n), df[["a", "b", "noise", "c"]].drop(columns=col)])
+            residuals = df[col] - others @ np.linalg.lstsq(others, df[col], rcond=None)[0]
+            expected = ((df[col] - df[col].mean()) ** 2).sum() / (residuals**2).sum()
+            assert selector.vif_[col] == pytest.approx(expected, rel=1e-4)
+        assert selector.dropped_columns_ == ["constant"]
+
+        selector = FeatureSelector().fit(df, y)
+        assert selector.dropped_columns_ == ["noise", "c", "constant"]
+        assert list(selector.transform(df).columns) == ["a", "b", "label"]
+
+        # Morceaux et workers parallèles: même sélection et mêmes scores
+        streamed = FeatureSelector(n_jobs=2)
+        for start in range(0, n, 100):
+            streamed.partial_fit(df.iloc[start : start + 100], y.iloc[start : start + 100])
+        assert streamed.finalize_pending_ and streamed.dropped_columns_ == []  # Sélection différée
+        streamed.finalize()
+        np.testing.assert_allclose(streamed.vif_.dropna(), selector.vif_.dropna())
+        pd.testing.assert_series_equal(streamed.mutual_info_, selector.mutual_info_)
+        assert streamed.dropped_columns_ == selector.dropped_columns_
+
+        # Sans finalize explicite: sélection calculée au premier transform
+        lazy = FeatureSelector()
+        for start in range(0, n, 100):
+            lazy.partial_fit(df.iloc[start : start + 100], y.iloc[start : start + 100])
+        assert list(lazy.transform(df).columns) == ["a", "b", "label"] and not lazy.finalize_pending_
+
+    def test_target_frequency_encoder(self):
+        """Moyenne lissée et fréquence par modalité; encodage hors fold des lignes d'entraînement."""
+        df = pd.DataFrame({"Neighborhood": ["A", "A", "A", "B", "B", np.nan] * 20, "GrLivArea": range(120)})
+        y = np.tile([1.0, 2.0, 3.0, 10.0, 12.0, 5.0], 20)
+        encoder = TargetFrequencyEncoder(columns=["Neighborhood", "Absente"], smoothing=4.0)
+        encoder.fit(df, y)
+
+        prior = y.mean()
+        new = pd.DataFrame({"Neighborhood": ["A", "C", np.nan], "GrLivArea": [1, 2, 3]})
+        encoded = encoder.transform(new)
+        assert list(encoded.columns) == ["GrLivArea", "Neighborhood_target", "Neighborhood_freq"]
+        np.testing.assert_allclose(encoded["Neighborhood_target"], [(120 + 4 * prior) / (60 + 4), prior, prior])
+        np.testing.assert_allclose(encoded["Neighborhood_freq"], [0.5, 0.0, 0.0])
+        assert "Neighborhood" in new.columns
+
+        # fit_transform: chaque ligne est encodée sans les cibles de son pli
+        train = encoder.fit_transform(df, y)
+        assert not np.allclose(train["Neighborhood_target"], encoder.transform(df)["Neighborhood_target"])
+        assert train["Neighborhood_target"][df["Neighborhood"] == "B"].between(10.0, 12.0).all()
+        np.testing.assert_allclose(train["Neighborhood_freq"], encoder.transform(df)["Neighborhood_freq"])
+
+        # Morceaux: mêmes tables; la cible est obligatoire
+        streamed = TargetFrequencyEncoder(columns=["Neighborhood"], smoothing=4.0)
+        for start in range(0, len(df), 50):
+            streamed.partial_fit(df.iloc[start : start + 50], y[start : start + 50])
+        pd.testing.assert_frame_equal(streamed.transform(df), encoder.transform(df))
+        with pytest.raises(ValueError):
+            TargetFrequencyEncoder().fit(df)
+
     def test_anomaly_corrector(self):
         """Test de l'AnomalyCorrector."""
         df = pd.DataFrame(
@@ -228,6 +604,56 @@ class TestCustomTransformers:
         assert df_transformed.loc[0, "Has2ndFloor"] == 1
         assert df_transformed.loc[1, "Has2ndFloor"] == 0
 
+    def test_feature_expressions(self):
+        """Les formules partagent leurs sous-expressions et s'évaluent en tableaux ou en scalaires."""
+        expressions = FeatureExpressions(
+            {
+                "HouseAge": "YrSold - YearBuilt",
+                "IsOld": "YrSold - YearBuilt > 50",
+                "Surface": "2ndFlrSF + 1stFlrSF",
+                "Ratio": "(1stFlrSF + 2ndFlrSF) / max(HouseAge, 1)",
+                "Quality": "lookup(KitchenQual, QUALITY)",
+            },
+            constants={"QUALITY": {"TA": 3, "Gd": 4}},
+        )
+        inputs = {
+            "YrSold": np.array([2010, 2010]),
+            "YearBuilt": np.array([2010, 1900]),
+            "1stFlrSF": np.array([1000, 800]),
+            "2ndFlrSF": np.array([0, 400]),
+            "KitchenQual": np.array(["Gd", None], dtype=object),
+        }
+
+        values = expressions.evaluate(inputs)
+
+        assert expressions.n_operations == 6  # sub, gt, add, max, div, lookup
+        assert expressions.n_operations < expressions.n_operations_raw
+        assert expressions.columns("Ratio") == ["YrSold", "YearBuilt", "2ndFlrSF", "1stFlrSF"]
+        assert expressions.categorical_columns("Quality") == ["KitchenQual"]
+        assert values["IsOld"].tolist() == [0, 1] and values["IsOld"].dtype == np.int64
+        np.testing.assert_allclose(values["Ratio"], [1000.0, 1200.0 / 110])
+        assert values["Quality"].tolist() == [4.0, 0.0]
+        record = expressions.evaluate({k: v[1] for k, v in inputs.items()}, ["IsOld", "Ratio"], encoded=True)
+        assert record == {"IsOld": 1.0, "Ratio": 1200.0 / 110}
+
+        with pytest.raises(FeatureExpressionError):
+            FeatureExpressions({"Bad": "GrLivArea +"})
+
+    def test_feature_engineer_from_config(self):
+        """Une feature ajoutée dans la configuration est créée par le pipeline."""
+        config = load_config("config.yaml")["feature_engineering"]
+        config = {**config, "create_features": config["create_features"] + ["OverallScore"]}
+        config["OverallScore"] = {"formula": "OverallQual * OverallCond"}
+        train_df, _ = load_data("data/raw")
+        df = train_df.drop(columns=["SalePrice", "Id"]).head(50)
+
+        pipeline = create_full_pipeline(feature_config=config)
+        engineered = pipeline.named_steps["features"].transform(df)
+
+        assert engineered["OverallScore"].tolist() == (df["OverallQual"] * df["OverallCond"]).tolist()
+        assert "YearBuilt" not in engineered.columns
+        assert pipeline.fit_transform(df).shape[1] == create_full_pipeline().fit_transform(df).shape[1] + 1
+
     def test_ordinal_encoder(self):
         """Test de l'OrdinalEncoderCustom."""
         df = pd.DataFrame(
@@ -245,6 +671,39 @@ class TestCustomTransformers:
         assert df_transformed.loc[1, "ExterQual"] == 4  # Gd = 4
         assert df_transformed.loc[2, "BsmtQual"] == 0  # None = 0
 
+    def test_ordinal_encoder_unknown_category(self):
+        """Les catégories inconnues et les NA reçoivent le code explicite unknown_value."""
+        df = pd.DataFrame({"ExterQual": ["Ex", "Gd", "TA"], "LandSlope": ["Gtl", "Sev", "Mod"]})
+        encoder = OrdinalEncoderCustom().fit(df)
+
+        test_df = pd.DataFrame({"ExterQual": ["Gd", "Inconnu", None], "LandSlope": ["Gd", "Mod", "Gtl"]})
+        df_transformed = encoder.transform(test_df)
+
+        assert encoder.columns_ == ["ExterQual", "LandSlope"]
+        assert df_transformed["ExterQual"].tolist() == [4, -1, -1]
+        assert df_transformed["LandSlope"].tolist() == [-1, 1, 2]  # "Gd" n'est pas un code de LandSlope
+        assert not df_transformed.isnull().any().any()
+
+    def test_ordinal_encoder_categorical_input(self):
+        """Les colonnes catégorielles sont encodées via leurs codes, avec le même résultat."""
+        df = pd.DataFrame({"HouseAgeBin": ["New", "Old", "VeryOld", "New"], "KitchenQual": ["Gd", "TA", "Ex", "Fa"]})
+        encoder = OrdinalEncoderCustom().fit(df)
+
+        expected = encoder.transform(df)
+        df_transformed = encoder.transform(df.astype("category"))
+
+        pd.testing.assert_frame_equal(df_transformed, expected)
+        assert df_transformed["HouseAgeBin"].tolist() == [0, 3, 4, 0]
+
+    def test_ordinal_encoder_legacy_pickle(self):
+        """Un encodeur sérialisé avant les tables compilées garde son comportement (inconnue -> NaN)."""
+        legacy = OrdinalEncoderCustom.__new__(OrdinalEncoderCustom)
+        legacy.__setstate__({"_sklearn_version": "1.7.2"})  # État d'un ancien modèle: aucun paramètre
+
+        df_transformed = legacy.transform(pd.DataFrame({"ExterQual": ["Gd", "Inconnu"]}))
+        assert df_transformed["ExterQual"].iloc[0] == 4
+        assert np.isnan(df_transformed["ExterQual"].iloc[1])
+
     def test_skewness_corrector(self):
         """Test du SkewnessCorrector."""
         # Créer des données avec skewness forte
@@ -276,6 +735,42 @@ class TestCustomTransformers:
         assert "BinaryFeature" not in corrector.skewed_features
         np.testing.assert_array_equal(df["BinaryFeature"], df_transformed["BinaryFeature"])
 
+    def test_skewness_corrector_partial_fit(self):
+        """partial_fit par morceaux détecte les mêmes features et les mêmes moments qu'un fit complet."""
+        from scipy.stats import skew
+
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame(
+            {
+                "Skewed": rng.lognormal(0, 1, 500),
+                "Negative": rng.normal(0, 1, 500) ** 3,  # asymétrique mais avec des valeurs négatives
+                "Discrete": rng.integers(0, 5, 500).astype(float),  # asymétrie possible mais <= 10 valeurs
+                "WithNaN": np.where(rng.random(500) < 0.1, np.nan, rng.exponential(1, 500)),
+            }
+        )
+        df.loc[df.index[:300], "Discrete"] = 0
+
+        full = SkewnessCorrector().fit(df)
+        streamed = SkewnessCorrector()
+        for start in range(0, len(df), 70):
+            streamed.partial_fit(df.iloc[start : start + 70])
+
+        assert full.skewed_features == ["Skewed", "WithNaN"]
+        assert streamed.skewed_features == full.skewed_features
+        np.testing.assert_allclose(streamed.skewness_, full.skewness_, rtol=1e-10)
+        np.testing.assert_allclose(full.skewness_[3], skew(df["WithNaN"].dropna()), rtol=1e-10)
+
+    def test_skewness_corrector_refit(self):
+        """Un second fit remplace la liste des features asymétriques au lieu de la compléter."""
+        df = pd.DataFrame({"Skewed": np.exp(np.linspace(0, 5, 100))})
+        corrector = SkewnessCorrector()
+
+        corrector.fit(df)
+        corrector.fit(df)
+
+        assert corrector.skewed_features == ["Skewed"]
+        np.testing.assert_allclose(corrector.transform(df)["Skewed"], np.log1p(df["Skewed"]))
+
     def test_full_pipeline_creation(self):
         """Test de la création du pipeline complet."""
         pipeline = create_full_pipeline()
@@ -285,6 +780,305 @@ class TestCustomTransformers:
         assert hasattr(pipeline, "fit")
         assert hasattr(pipeline, "transform")
 
+    def test_full_pipeline_inplace_mode(self):
+        """Le mode propriétaire produit le même résultat sans modifier le DataFrame de l'appelant."""
+        train_df, _ = load_data("data/raw")
+        df = train_df.drop(columns=["SalePrice", "Id"]).head(300)
+        snapshot = df.copy()
+
+        expected = create_full_pipeline().fit_transform(df)
+        pipeline = create_full_pipeline(inplace=True)
+        result = pipeline.fit_transform(df)
+
+        np.testing.assert_allclose(result, expected)
+        pd.testing.assert_frame_equal(df, snapshot)
+        assert pipeline.named_steps["missing"].copy
+        assert not pipeline.named_steps["features"].copy
+
+    def test_full_pipeline_sparse_mode(self):
+        """Le mode creux produit une matrice CSR équivalente à la sortie dense, à un centrage près."""
+        train_df, _ = load_data("data/raw")
+        df = train_df.drop(columns=["SalePrice", "Id"]).head(300)
+
+        dense = create_full_pipeline().fit_transform(df)
+        pipeline = create_full_pipeline(sparse=True)
+        result = pipeline.fit_transform(df)
+
+        assert result.format == "csr"
+        assert result.shape == dense.shape
+        assert result.nnz < 0.5 * np.prod(result.shape)
+
+        # Bloc numérique: même mise à l'échelle, sans centrage; blocs one-hot identiques
+        ct = pipeline.named_steps["preprocess"]
+        num = ct.output_indices_["num"]
+        scaler = ct.named_transformers_["num"].named_steps["scaler"]
+        expected = dense.copy()
+        expected[:, num] += scaler.mean_ / scaler.scale_
+        np.testing.assert_allclose(result.toarray(), expected, atol=1e-10)
+
+    def test_frozen_schema_fast_path(self):
+        """Avec le schéma d'entraînement, le ColumnTransformer figé produit la sortie de scikit-learn."""
+        train_df, _ = load_data("data/raw")
+        df = train_df.drop(columns=["SalePrice", "Id"])
+        pipeline = create_full_pipeline().fit(df.head(1000))
+        new = df.iloc[1000:].copy()
+        new.loc[new.index[:5], "Neighborhood"] = "Atlantis"  # Catégorie inconnue
+        for _, step in pipeline.steps[:-1]:
+            new = step.transform(new)
+
+        ct = pipeline.named_steps["preprocess"]
+        assert ct.schema_in_.matches(new)
+        for rows in (new.head(3), new):  # Encodage par dictionnaire puis par Index
+            np.testing.assert_array_equal(ct.transform(rows), ColumnTransformer.transform(ct, rows))
+        assert pipeline.named_steps["features"].resolved_[0] == list(pipeline.named_steps["features"].expressions.outputs)
+
+    def test_frozen_schema_missing_markers(self):
+        """None et NaN restent des marqueurs distincts: un NA de l'autre marqueur est une modalité inconnue."""
+        rng = np.random.default_rng(0)
+        base = rng.choice(["A", "B", "C"], size=600).astype(object)
+
+        def frame(markers):
+            values = base.copy()
+            values[::3] = [markers[i % len(markers)] for i in range(len(values[::3]))]
+            return pd.DataFrame({"cat": pd.Series(values, dtype=object), "x": rng.normal(size=len(values))})
+
+        for fitted in ([np.nan], [None], [None, np.nan]):
+            ct = FrozenColumnTransformer(
+                [
+                    ("num", StandardScaler(), ["x"]),
+                    ("nom", OneHotEncoder(handle_unknown="ignore", sparse_output=False), ["cat"]),
+                ]
+            ).fit(frame(fitted))
+            new = frame([None, np.nan, float("nan"), pd.NA])
+            for rows in (new.head(20), new):  # Encodage par dictionnaire puis par Index
+                np.testing.assert_array_equal(ct.transform(rows), ColumnTransformer.transform(ct, rows))
+
+    def test_full_pipeline_float32(self):
+        """En float32, la matrice de features est produite en float32, par le chemin rapide comme par scikit-learn."""
+        train_df, _ = load_data("data/raw")
+        df = train_df.drop(columns=["SalePrice", "Id"]).head(300)
+
+        pipeline = create_full_pipeline(dtype="float32")
+        result = pipeline.fit_transform(df)
+        expected = create_full_pipeline().fit_transform(df)
+
+        assert result.dtype == np.float32
+        np.testing.assert_allclose(result, expected, rtol=1e-5, atol=1e-5)
+        Xt = df
+        for _, step in pipeline.steps[:-1]:
+            Xt = step.transform(Xt)
+        ct = pipeline.named_steps["preprocess"]
+        np.testing.assert_array_equal(ct.transform(Xt), ColumnTransformer.transform(ct, Xt))
+
+    def test_full_pipeline_categorical(self):
+        """Le mode catégoriel produit la même matrice que le mode objet, y compris sur des modalités inconnues."""
+        train_df, _ = load_data("data/raw", categorical=True)
+        df = train_df.drop(columns=["SalePrice", "Id"])
+        obj_df = load_data("data/raw")[0].drop(columns=["SalePrice", "Id"])
+        assert isinstance(df["Neighborhood"].dtype, pd.CategoricalDtype)
+
+        pipeline = create_full_pipeline(categorical=True).fit(df.head(1000))
+        reference = create_full_pipeline().fit(obj_df.head(1000))
+
+        new = obj_df.iloc[1000:].copy()
+        new.loc[new.index[:3], "Exterior1st"] = "Adobe"  # Modalité inconnue
+        new.loc[new.index[3:6], "MSZoning"] = np.nan
+        new.loc[new.index[6:9], "Neighborhood"] = "Atlantis"
+        expected = reference.transform(new)
+        np.testing.assert_allclose(pipeline.transform(new), expected, atol=1e-10)
+        np.testing.assert_allclose(pipeline.transform(new.astype({"Neighborhood": "category"})), expected, atol=1e-10)
+        np.testing.assert_allclose(pipeline.transform(new.head(1)), expected[:1], atol=1e-10)
+
+        caster = pipeline.named_steps["categorical"]
+        assert isinstance(caster, CategoricalCaster)
+        cast = caster.transform(new)
+        assert isinstance(cast["Exterior1st"].dtype, pd.CategoricalDtype)
+        assert cast["Exterior1st"].iloc[0] == "__unknown__"
+        assert cast["MSZoning"].iloc[3:6].isna().all()
+        assert cast.memory_usage(deep=True).sum() < new.memory_usage(deep=True).sum()
+
+        Xt = new
+        for _, step in pipeline.steps[:-1]:
+            Xt = step.transform(Xt)
+        ct = pipeline.named_steps["preprocess"]
+        np.testing.assert_array_equal(ct.transform(Xt), ColumnTransformer.transform(ct, Xt))
+
+    def test_polars_backend_parity(self):
+        """Le backend Polars reproduit les étapes pandas, avec les mêmes paramètres entraînés."""
+        pytest.importorskip("polars")
+        from house_prices.data.polars_backend import PolarsPipeline
+
+        train_df, _ = load_data("data/raw")
+        df = train_df.drop(columns=["SalePrice", "Id"])
+        new = df.iloc[1000:].copy()
+        new.loc[new.index[:3], "Neighborhood"] = "Atlantis"
+        new.loc[new.index[3:6], "LotFrontage"] = np.nan
+        new.loc[new.index[6:9], "KitchenQual"] = np.nan
+
+        for options in ({}, {"categorical": True}, {"dtype": "float32"}):
+            pipeline = create_full_pipeline(**options).fit(df.head(1000))
+            backend = PolarsPipeline(pipeline)
+            expected = new
+            for step in backend.head:
+                expected = step.transform(expected)
+            # Mêmes colonnes, dtypes et index; log1p à un ulp près
+            pd.testing.assert_frame_equal(backend.transform_frame(new), expected, check_exact=False, rtol=1e-12)
+            np.testing.assert_allclose(backend.transform(new), pipeline.transform(new), rtol=1e-12, atol=1e-12)
+
+            # Entraînement par le backend: mêmes paramètres que le fit pandas
+            refit = create_full_pipeline(**options)
+            PolarsPipeline(refit).fit(df.head(1000))
+            assert refit.named_steps["missing"].stat_lotfrontage_per_neighborhood_ == pytest.approx(
+                pipeline.named_steps["missing"].stat_lotfrontage_per_neighborhood_
+            )
+            assert refit.named_steps["skewness"].skewed_features == pipeline.named_steps["skewness"].skewed_features
+            assert refit.named_steps["preprocess"].schema_in_ == pipeline.named_steps["preprocess"].schema_in_
+            np.testing.assert_allclose(refit.transform(new), pipeline.transform(new), rtol=1e-12, atol=1e-12)
+
+        # Lecture paresseuse du CSV, typée par le schéma d'entraînement
+        scanned = backend.scan_csv("data/raw/train.csv").drop("SalePrice", "Id")
+        np.testing.assert_allclose(backend.transform(scanned), pipeline.transform(df), rtol=1e-12, atol=1e-12)
+
+    def test_polars_feature_expressions(self):
+        """Formules traduites en Polars: mêmes valeurs que l'évaluation NumPy, NA compris."""
+        pl = pytest.importorskip("polars")
+        from house_prices.data.polars_backend import _FeatureTranslator
+
+        expressions = FeatureExpressions(
+            {
+                "Ratio": "a / b",
+                "Positive": "a > 0",
+                "Different": "a != b",
+                "Capped": "max(a - b, 0)",
+                "Score": "b * lookup(q, QUALITY, -1)",
+                "Bin": "cut(a, BINS, LABELS)",
+            },
+            {"QUALITY": {"Gd": 4, "TA": 3}, "BINS": [0, 5, 20], "LABELS": ["Low", "High"]},
+        )
+        a = np.array([0.0, 3.0, np.nan, 25.0, 5.0])
+        b = np.array([0.0, 1.0, 2.0, np.nan, 10.0])
+        q = pd.array(["Gd", "Po", None, "TA", "TA"], dtype=object)
+        expected = expressions.evaluate({"a": a, "b": b, "q": q})
+
+        frame = pl.DataFrame({"a": a, "b": b, "q": list(q)}, nan_to_null=True)
+        translator = _FeatureTranslator(expressions)
+        result = frame.select([translator.output(name).alias(name) for name in expressions.names])
+        for name in ("Ratio", "Positive", "Different", "Capped", "Score"):
+            np.testing.assert_array_equal(result[name].to_numpy(), np.asarray(expected[name], dtype=float), err_msg=name)
+        assert result["Bin"].to_list() == [None if pd.isna(v) else v for v in expected["Bin"]]
+
+    def test_schema_drift(self, caplog):
+        """Une dérive du schéma est décrite, signalée, et traitée par le chemin général."""
+        train_df, _ = load_data("data/raw")
+        df = train_df.drop(columns=["SalePrice", "Id"]).head(300)
+        pipeline = create_full_pipeline().fit(df)
+        expected = pipeline.transform(df.head(20))
+
+        drifted = df.head(20).drop(columns=["Alley"])
+        drifted["LotArea"] = drifted["LotArea"].astype(np.float64)
+        schema = ColumnSchema.from_frame(df)
+        assert schema.drift(drifted) == ["colonnes manquantes: ['Alley']", "dtypes modifiés: {'LotArea': 'int64 -> float64'}"]
+        with pytest.raises(SchemaDriftError):
+            schema.validate(drifted)
+        schema.validate(df)
+
+        # Dtype modifié: chemin général, même résultat
+        drifted = df.head(20).astype({"LotArea": np.float64})
+        with caplog.at_level("WARNING"):
+            result = pipeline.transform(drifted)
+        assert "MissingValuesHandler: dérive du schéma" in caplog.text
+        assert "FeatureEngineer" not in caplog.text  # Dérive signalée une fois, par la première étape
+        np.testing.assert_allclose(result, expected)
+
+    def test_data_quality_monitor(self):
+        """Batches échantillonnés: NaN, hors bornes et modalités inconnues comptés par colonne."""
+        train = pd.DataFrame({"LotArea": [1000.0, 5000.0, 9000.0, 3000.0], "MSZoning": ["RL", "RM", "RL", "FV"]})
+        batch = pd.DataFrame({"LotArea": [np.nan, 20000.0, 4000.0], "MSZoning": ["RL", "C (all)", None]})
+
+        monitor = DataQualityMonitor(sample_rate=1.0)
+        assert monitor.fit_transform(train) is train
+        assert monitor.summary()["batches_seen"] == 0  # Données d'entraînement non comptées
+        assert monitor.transform(batch) is batch
+
+        report = monitor.report()
+        assert report.loc["LotArea", ["nan", "out_of_range", "unseen"]].tolist() == [1, 1, 0]
+        assert report.loc["MSZoning", ["nan", "out_of_range", "unseen"]].tolist() == [1, 0, 1]
+        assert report.loc["LotArea", "nan_rate"] == pytest.approx(1 / 3)
+        assert monitor.summary()["rows_observed"] == 3
+
+        # Bornes et modalités fusionnées par partial_fit: identiques au fit sur le tout
+        merged = DataQualityMonitor().partial_fit(train[:2]).partial_fit(train[2:])
+        np.testing.assert_array_equal(merged.lower_, monitor.lower_)
+        np.testing.assert_array_equal(merged.upper_, monitor.upper_)
+        assert set(merged.categories_["MSZoning"]) == set(monitor.categories_["MSZoning"])
+
+        # sample_rate=0: les batches sont comptés mais jamais inspectés
+        monitor.set_params(sample_rate=0.0).reset_counters()
+        for _ in range(5):
+            monitor.transform(batch)
+        assert monitor.summary()["batches_seen"] == 5
+        assert monitor.summary()["batches_sampled"] == 0
+        assert monitor.report()[["nan", "out_of_range", "unseen"]].to_numpy().sum() == 0
+
+        pipeline = create_full_pipeline(monitor_sample_rate=0.05)
+        assert DataQualityMonitor.find(pipeline) is pipeline.named_steps["monitor"]
+        assert pipeline.named_steps["monitor"].sample_rate == 0.05
+
+    def test_transformer_copy_false_mutates_input(self):
+        """Avec copy=False, le transformer travaille directement sur le DataFrame reçu."""
+        df = pd.DataFrame({"YearBuilt": [2000, 1990], "GarageYrBlt": [2010, 1990]})
+
+        result = AnomalyCorrector(copy=False).fit_transform(df)
+
+        assert result is df
+        assert df.loc[0, "GarageYrBlt"] == 2000
+
+
+class TestFeatureStore:
+    """Tests pour le feature store local."""
+
+    def test_feature_store_reuses_entry(self, tmp_path):
+        """Une seconde demande relit l'entrée (mémoire partagée); données ou paramètres modifiés: nouvelle entrée."""
+        train_df, _ = load_data("data/raw")
+        X, y = train_df.drop(columns=["SalePrice", "Id"]).head(300), np.log1p(train_df["SalePrice"].head(300))
+        store = FeatureStore(tmp_path)
+
+        first = store.fit_transform(create_full_pipeline(), X[:200], y[:200], X[200:])
+        second = store.fit_transform(create_full_pipeline(), X[:200], y[:200], X[200:])
+        assert not first.hit and second.hit
+        assert isinstance(second.train, np.memmap)
+        expected = create_full_pipeline().fit(X[:200], y[:200]).transform(X[200:])
+        np.testing.assert_array_equal(second.test, expected)
+        np.testing.assert_array_equal(second.pipeline.transform(X[200:]), expected)
+        assert len(second.feature_names) == expected.shape[1]
+
+        modified = X[:200].copy()
+        modified.iloc[0, 0] += 1
+        assert not store.fit_transform(create_full_pipeline(), modified, y[:200]).hit
+        sparse_features = store.fit_transform(create_full_pipeline(sparse=True), X[:200], y[:200], X[200:])
+        assert not sparse_features.hit
+        np.testing.assert_allclose(store.get(sparse_features.key).train.toarray(), sparse_features.train.toarray())
+        assert len(store.entries()) == 3
+
+    def test_feature_store_eviction(self, tmp_path):
+        """Éviction par âge de dernière lecture, puis par taille (moins récemment lues d'abord)."""
+        import os
+        import time
+
+        X = pd.DataFrame({"a": np.arange(1000.0)})
+        store = FeatureStore(tmp_path, max_size_mb=None, max_age_days=None)
+        keys = [store.fit_transform(StandardScaler(), X + i).key for i in range(3)]
+        now = time.time()
+        for key, age in zip(keys, (10 * 86400, 60, 120)):  # Horodatages explicites (résolution du système de fichiers)
+            os.utime(tmp_path / key / "meta.json", (now - age, now - age))
+        store.get(keys[1])  # Lecture: entrée la plus récente
+
+        store.max_age_days = 5
+        assert store.evict() == [keys[0]]
+        store.max_size_mb = store.entries()["bytes"].max() / 1024**2
+        assert store.evict() == [keys[2]]
+        assert store.entries()["key"].tolist() == [keys[1]]
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -11,16 +11,26 @@ from pathlib import Path
 import numpy as np
 import pandas as pd
 import pytest
-from sklearn.linear_model import BayesianRidge
+from sklearn.linear_model import BayesianRidge, Ridge
 from sklearn.metrics import mean_squared_error, r2_score
 from sklearn.pipeline import Pipeline
 
 # Ajoute le chemin src au sys.path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+from house_prices.data.incremental import fit_out_of_core
+from house_prices.data.instrumentation import profile_pipeline
 from house_prices.data.load_data import load_data
+from house_prices.data.preprocessing import DataQualityMonitor, create_full_pipeline
+from house_prices.models.compiled_model import CompiledPipeline, compile_pipeline
 from house_prices.models.predict_model import load_trained_model, predict
-from house_prices.models.train_model import evaluate_model, save_model, train_model
+from house_prices.models.train_model import (
+    evaluate_model,
+    precision_report,
+    save_model,
+    train_model,
+    train_model_out_of_core,
+)
 
 
 class TestNewPipelineWithRealData:
@@ -91,6 +101,50 @@ class TestNewPipelineWithRealData:
         assert metrics["rmse"] > 0
         assert metrics["mae"] > 0
 
+    def test_train_model_with_feature_store(self, real_data, tmp_path):
+        """Avec un feature store, le modèle est entraîné sur la matrice relue: mêmes prédictions."""
+        from house_prices.data.feature_store import FeatureStore
+
+        X, y = real_data
+        store = FeatureStore(tmp_path)
+        expected = predict(train_model(X, y)[0], X, use_log=True)
+
+        for _ in range(2):  # Calcul puis lecture de l'entrée
+            pipeline, _ = train_model(X, y, store=store)
+            np.testing.assert_allclose(predict(pipeline, X, use_log=True), expected, rtol=1e-9)
+        assert len(store.entries()) == 1
+
+        features = store.fit_transform(create_full_pipeline(), X[:80], np.log1p(y[:80]), X[80:])
+        pipeline = Pipeline([("preprocessing", features.pipeline), ("model", Ridge().fit(features.train, np.log1p(y[:80])))])
+        metrics = evaluate_model(pipeline, X[80:], y[80:], features=features.test)
+        assert metrics == evaluate_model(pipeline, X[80:], y[80:])
+
+    def test_fold_cached_search_matches_randomized_search(self, real_data):
+        """Prétraitement mis en cache par fold: mêmes scores et même meilleur candidat que RandomizedSearchCV."""
+        from scipy.stats import loguniform
+        from sklearn.model_selection import KFold, RandomizedSearchCV
+
+        from house_prices.models.search import FoldCachedSearchCV
+
+        X, y = real_data
+        y = np.log1p(y)
+        distributions = {"model__alpha": loguniform(1e-2, 1e3)}
+        cv = KFold(3, shuffle=True, random_state=0)
+        reference = RandomizedSearchCV(
+            Pipeline([("preprocessing", create_full_pipeline()), ("model", Ridge())]),
+            distributions,
+            n_iter=4,
+            cv=cv,
+            scoring="neg_root_mean_squared_error",
+            random_state=0,
+        ).fit(X, y)
+        search = FoldCachedSearchCV(create_full_pipeline(), Ridge(), distributions, n_iter=4, cv=cv, random_state=0, n_jobs=2)
+        search.fit(X, y)
+
+        np.testing.assert_allclose(search.cv_results_["mean_test_score"], reference.cv_results_["mean_test_score"], rtol=1e-9)
+        assert search.best_params_ == {"alpha": reference.best_params_["model__alpha"]}
+        np.testing.assert_allclose(search.predict(X), reference.predict(X), rtol=1e-9)
+
 
 class TestModelSaveLoad:
     """Tests pour la sauvegarde et le chargement du modèle."""
@@ -164,6 +218,36 @@ class TestHuberRegressor:
         assert model.epsilon == 1.35
         assert model.alpha == 10.0
 
+    def test_sparse_matrix_heads(self, real_data):
+        """Les modèles linéaires consomment la matrice CSR sans densification, avec les mêmes prédictions."""
+        X, y = real_data
+        y_log = np.log1p(y)
+
+        dense = create_full_pipeline().fit_transform(X)
+        csr = create_full_pipeline(sparse=True).fit_transform(X)
+        expected = Ridge(alpha=10.0).fit(dense, y_log).predict(dense)
+        np.testing.assert_allclose(Ridge(alpha=10.0, tol=1e-10).fit(csr, y_log).predict(csr), expected, atol=1e-6)
+
+        pipeline, _ = train_model(X, y, sparse=True)
+        assert pipeline.named_steps["preprocessing"].transform(X).format == "csr"
+        assert np.isfinite(pipeline.predict(X)).all()
+
+    def test_float32_precision_report(self):
+        """En float32, features et coefficients sont en float32, avec RMSE et R² inchangés."""
+        train_df, _ = load_data("data/raw")
+        X = train_df.drop(columns=["SalePrice", "Id"])
+        y = train_df["SalePrice"]
+
+        report = precision_report(X.iloc[300:], y.iloc[300:], X.iloc[:300], y.iloc[:300], params={"max_iter": 1000})
+
+        assert report.loc["float32", "features_mb"] == pytest.approx(report.loc["float64", "features_mb"] / 2)
+        assert report["within_tolerance"].all()
+        assert report.loc["float32", "max_log_delta"] < 1e-2
+
+        pipeline, _ = train_model(X.head(50), y.head(50), dtype="float32")
+        assert pipeline.named_steps["model"].coef_.dtype == np.float32
+        assert pipeline.predict(X.head(5)).dtype == np.float32
+
 
 class TestModelPerformance:
     """Tests de performance des modèles."""
@@ -230,5 +314,307 @@ class TestPredictionBounds:
         assert np.all(predictions < 1000000)  # Prix raisonnables
 
 
+class TestCompiledPipeline:
+    """Tests pour le noyau d'inférence compilé."""
+
+    @pytest.fixture
+    def real_data(self):
+        """Charge les données réelles pour les tests."""
+        try:
+            train_df, _ = load_data("data/raw")
+            if "Id" in train_df.columns:
+                train_df = train_df.drop(columns=["Id"])
+            X = train_df.drop(columns=["SalePrice"]).head(200)
+            y = train_df["SalePrice"].head(200)
+            return X, y
+        except FileNotFoundError:
+            pytest.skip("Données réelles non disponibles")
+
+    def test_compiled_matches_pipeline(self, real_data):
+        """Test que le pipeline compilé reproduit les prédictions du pipeline scikit-learn."""
+        X, y = real_data
+        pipeline, _ = train_model(X[:160], y[:160])
+
+        X_test = X[160:].copy()
+        X_test.loc[X_test.index[0], "Neighborhood"] = "Inconnu"  # quartier non vu -> 'Autres'
+        X_test.loc[X_test.index[1], "Exterior1st"] = "Inconnu"  # catégorie one-hot ignorée
+        X_test.loc[X_test.index[2], "LotFrontage"] = np.nan
+
+        compiled = compile_pipeline(pipeline)
+        expected = predict(pipeline, X_test, use_log=True)
+
+        np.testing.assert_allclose(predict(compiled, X_test, use_log=True), expected, rtol=1e-9)
+        for i, record in enumerate(X_test.to_dict(orient="records")):
+            np.testing.assert_allclose(predict(compiled, record, use_log=True), expected[i : i + 1], rtol=1e-9)
+
+    def test_compiled_feeds_monitor(self, real_data):
+        """Le noyau compilé alimente le DataQualityMonitor du pipeline sur les batches échantillonnés."""
+        X, y = real_data
+        pipeline, _ = train_model(X[:160], y[:160])
+        monitor = DataQualityMonitor.find(pipeline)
+        monitor.set_params(sample_rate=1.0).reset_counters()
+        compiled = compile_pipeline(pipeline)
+
+        X_test = X[160:170].copy()
+        X_test.loc[X_test.index[0], "MSZoning"] = "Inconnu"
+        X_test.loc[X_test.index[1], "LotArea"] = 10**8
+        compiled.predict(X_test)
+        compiled.predict(X_test.iloc[2].to_dict())
+
+        summary = monitor.summary()
+        assert summary["batches_sampled"] == 2
+        assert summary["rows_observed"] == 11
+        report = monitor.report()
+        assert report.loc["MSZoning", "unseen"] == 1
+        assert report.loc["LotArea", "out_of_range"] == 1
+
+    def test_compiled_unknown_ordinal(self, real_data):
+        """Une catégorie ordinale inconnue reçoit le code inconnu comme dans le pipeline scikit-learn."""
+        X, y = real_data
+        pipeline, _ = train_model(X, y)
+        X_test = X.head(3).copy()
+        X_test["KitchenQual"] = "Inconnu"
+        record = X_test.iloc[0].to_dict()
+
+        compiled = compile_pipeline(pipeline)
+        expected = pipeline.predict(X_test)
+        np.testing.assert_allclose(compiled.predict(X_test), expected, rtol=1e-9)
+        np.testing.assert_allclose(compiled.predict(record), expected[:1], rtol=1e-9)
+
+        # Sans code inconnu (modèles antérieurs), la catégorie inconnue reste une erreur
+        pipeline.set_params(preprocessing__ordinal__unknown_value=np.nan)
+        pipeline.fit(X, np.log1p(y))
+        with pytest.raises(ValueError):
+            compile_pipeline(pipeline).predict(record)
+
+    def test_compiled_config_features(self, real_data):
+        """Les features ajoutées par configuration sont compilées avec les mêmes formules."""
+        from house_prices.data.load_data import load_config
+        from house_prices.data.preprocessing import create_full_pipeline
+
+        X, y = real_data
+        config = dict(load_config("config.yaml")["feature_engineering"])
+        extra = {
+            "TotalBathrooms": "FullBath + 0.5 * HalfBath + BsmtFullBath + 0.5 * BsmtHalfBath",
+            "KitchenScore": "lookup(KitchenQual, QUALITY_MAPPING) * max(TotalBathrooms, 1)",
+        }
+        config["create_features"] = config["create_features"] + list(extra)
+        config.update({name: {"formula": formula} for name, formula in extra.items()})
+        pipeline = Pipeline(
+            [("preprocessing", create_full_pipeline(feature_config=config)), ("model", HuberRegressor(alpha=10.0))]
+        )
+        pipeline.fit(X, np.log1p(y))
+
+        compiled = compile_pipeline(pipeline)
+        assert "KitchenScore" in compiled.derived_features
+        np.testing.assert_allclose(compiled.predict(X), pipeline.predict(X), rtol=1e-9)
+        np.testing.assert_allclose(compiled.predict(X.iloc[0].to_dict()), pipeline.predict(X.head(1)), rtol=1e-9)
+
+    def test_compiled_feature_selection(self, real_data):
+        """Les colonnes retirées par FeatureSelector sont absentes du noyau compilé."""
+        X, y = real_data
+        pipeline = Pipeline(
+            [("preprocessing", create_full_pipeline(feature_selection=True)), ("model", HuberRegressor(alpha=10.0))]
+        )
+        pipeline.fit(X, np.log1p(y))
+        selector = pipeline.named_steps["preprocessing"].named_steps["selector"]
+        assert selector.dropped_columns_
+
+        compiled = compile_pipeline(pipeline)
+        assert not set(selector.dropped_columns_) & set(compiled.features)
+        np.testing.assert_allclose(compiled.predict(X), pipeline.predict(X), rtol=1e-9)
+
+    def test_compiled_target_encoding(self, real_data):
+        """Les colonnes de TargetFrequencyEncoder sont repliées en tables modalité -> contribution."""
+        X, y = real_data
+        pipeline = Pipeline(
+            [("preprocessing", create_full_pipeline(nominal_encoding="target")), ("model", HuberRegressor(alpha=10.0))]
+        )
+        pipeline.fit(X, np.log1p(y))
+
+        compiled = compile_pipeline(pipeline)
+        assert "Neighborhood" in compiled.nominal_tables
+        assert not [f for f in compiled.features if f.endswith(("_target", "_freq"))]
+        X_unknown = X.copy()
+        X_unknown.loc[X.index[:5], "Neighborhood"] = "Inconnu"
+        X_unknown.loc[X.index[5:10], "Exterior1st"] = np.nan
+        np.testing.assert_allclose(compiled.predict(X_unknown), pipeline.predict(X_unknown), rtol=1e-9)
+        np.testing.assert_allclose(compiled.predict(X.iloc[0].to_dict()), pipeline.predict(X.head(1)), rtol=1e-9)
+
+    def test_onnx_matches_pipeline(self, real_data, tmp_path):
+        """L'export ONNX servi par onnxruntime reproduit les prédictions du pipeline scikit-learn."""
+        pytest.importorskip("onnx")
+        pytest.importorskip("onnxruntime")
+        from house_prices.data.load_data import load_config
+        from house_prices.models.onnx_model import OnnxPipeline, export_onnx
+
+        X, y = real_data
+        config = dict(load_config("config.yaml")["feature_engineering"])
+        extra = {"KitchenScore": "lookup(KitchenQual, QUALITY_MAPPING) * max(FullBath + HalfBath, 1)"}
+        config["create_features"] = config["create_features"] + list(extra)
+        config.update({name: {"formula": formula} for name, formula in extra.items()})
+        pipeline = Pipeline(
+            [("preprocessing", create_full_pipeline(feature_config=config)), ("model", HuberRegressor(alpha=10.0))]
+        )
+        pipeline.fit(X[:160], np.log1p(y[:160]))
+
+        X_test = X[160:].copy()
+        X_test.loc[X_test.index[0], "Neighborhood"] = "Inconnu"
+        X_test.loc[X_test.index[1], "Exterior1st"] = "Inconnu"
+        X_test.loc[X_test.index[2], ["LotFrontage", "GarageType", "KitchenQual"]] = [np.nan, np.nan, np.nan]
+        X_test.loc[X_test.index[3], "KitchenQual"] = "Inconnu"
+        for i, col in enumerate(["Exterior1st", "GarageType", "MSZoning"], start=4):
+            X_test.loc[X_test.index[i], col] = ""  # Modalité vide: inconnue, pas une valeur manquante
+
+        export_onnx(pipeline, tmp_path / "model.onnx")
+        session = OnnxPipeline(tmp_path / "model.onnx")
+        expected = pipeline.predict(X_test)
+        np.testing.assert_allclose(session.predict(X_test), expected, rtol=1e-9)
+        np.testing.assert_allclose(session.predict(X_test), compile_pipeline(pipeline).predict(X_test), rtol=1e-12)
+        np.testing.assert_allclose(session.predict(X_test.iloc[2].to_dict()), expected[2:3], rtol=1e-9)
+        np.testing.assert_allclose(session.predict(X_test.iloc[4].to_dict()), expected[4:5], rtol=1e-9)
+
+    def test_non_linear_model_not_compilable(self):
+        """Seuls les modèles linéaires peuvent être compilés."""
+        from sklearn.ensemble import ExtraTreesRegressor
+
+        from house_prices.data.preprocessing import create_full_pipeline
+
+        pipeline = Pipeline([("preprocessing", create_full_pipeline()), ("model", ExtraTreesRegressor())])
+        with pytest.raises(TypeError):
+            CompiledPipeline.from_pipeline(pipeline)
+
+
+class TestPipelineProfiling:
+    """Tests pour l'instrumentation par étape du pipeline."""
+
+    @pytest.fixture
+    def real_data(self):
+        """Charge les données réelles pour les tests."""
+        try:
+            train_df, _ = load_data("data/raw")
+            if "Id" in train_df.columns:
+                train_df = train_df.drop(columns=["Id"])
+            X = train_df.drop(columns=["SalePrice"]).head(100)
+            y = train_df["SalePrice"].head(100)
+            return X, y
+        except FileNotFoundError:
+            pytest.skip("Données réelles non disponibles")
+
+    def test_profile_records_each_step(self, real_data):
+        """Chaque étape est mesurée une fois par appel, y compris dans le sous-pipeline."""
+        X, y = real_data
+        pipeline, _ = train_model(X, y)
+
+        with profile_pipeline(pipeline) as profile:
+            pipeline.predict(X)
+
+        summary = profile.summary().set_index("step")
+        assert list(summary.index) == [
+            "preprocessing.missing",
+            "preprocessing.anomaly",
+            "preprocessing.features",
+            "preprocessing.ordinal",
+            "preprocessing.skewness",
+            "preprocessing.monitor",
+            "preprocessing.preprocess",
+            "preprocessing",
+            "model",
+            "pipeline",
+        ]
+        assert (summary["calls"] == 1).all()
+        assert summary.loc["pipeline", "share"] == 1.0
+        assert summary.loc["preprocessing.features", "rows"] == len(X)
+        assert summary.loc["preprocessing.preprocess", "columns"] > X.shape[1]
+        assert "preprocessing" not in set(profile.slowest(10)["step"])
+
+        # Les méthodes d'origine sont restaurées à la sortie du bloc
+        assert "predict" not in vars(pipeline)
+        assert "transform" not in vars(pipeline.named_steps["preprocessing"].named_steps["missing"])
+
+    def test_profile_fit_with_memory_and_json(self, real_data, tmp_path):
+        """fit_transform est mesuré sans double comptage et le rapport s'exporte en JSON."""
+        import json
+
+        from house_prices.data.preprocessing import create_full_pipeline
+
+        X, _ = real_data
+        pipeline = create_full_pipeline()
+
+        with profile_pipeline(pipeline, track_memory=True) as profile:
+            pipeline.fit_transform(X)
+
+        assert len(profile) == 8  # 7 étapes + la racine, pas de fit/transform internes
+        assert {record.method for record in profile.records} == {"fit_transform"}
+        assert all(record.allocated_bytes > 0 for record in profile.records)
+
+        payload = json.loads(profile.to_json(tmp_path / "profile.json"))
+        assert payload == json.loads((tmp_path / "profile.json").read_text())
+        assert payload["records"][0]["step"] == "missing"
+        assert payload["records"][0]["dtypes"]
+
+
+class TestOutOfCoreTraining:
+    """Tests pour l'entraînement par morceaux (out-of-core)."""
+
+    @pytest.fixture
+    def real_data(self):
+        """Charge les données réelles pour les tests."""
+        try:
+            train_df, _ = load_data("data/raw")
+            if "Id" in train_df.columns:
+                train_df = train_df.drop(columns=["Id"])
+            return train_df
+        except FileNotFoundError:
+            pytest.skip("Données réelles non disponibles")
+
+    def test_fit_out_of_core_matches_in_memory(self, real_data):
+        """Le prétraitement entraîné par morceaux produit la même sortie qu'un fit en mémoire."""
+        from house_prices.data.preprocessing import create_full_pipeline
+
+        X = real_data.drop(columns=["SalePrice"])
+        expected = create_full_pipeline().fit(X)
+        pipeline = create_full_pipeline()
+
+        fit_out_of_core(
+            pipeline, lambda: (real_data.iloc[i : i + 300] for i in range(0, len(real_data), 300)), target="SalePrice"
+        )
+
+        assert pipeline.named_steps["skewness"].skewed_features == expected.named_steps["skewness"].skewed_features
+        monitor, expected_monitor = pipeline.named_steps["monitor"], expected.named_steps["monitor"]
+        assert monitor.summary()["batches_seen"] == 0  # Morceaux d'entraînement non comptés
+        np.testing.assert_array_equal(monitor.upper_, expected_monitor.upper_)
+        np.testing.assert_allclose(pipeline.transform(X), expected.transform(X), atol=1e-10)
+
+    def test_train_model_out_of_core(self, real_data, tmp_path):
+        """Entraînement par morceaux depuis un CSV: prédictions réalistes et pipeline compilable."""
+        train, test = real_data.iloc[300:], real_data.iloc[:300]
+        train.to_csv(tmp_path / "train.csv", index=False)
+        X_test = test.drop(columns=["SalePrice"])
+
+        pipeline = train_model_out_of_core(tmp_path / "train.csv", chunksize=250, epochs=3)
+        metrics = evaluate_model(pipeline, X_test, test["SalePrice"])
+
+        assert metrics["r2"] > 0.8
+        np.testing.assert_allclose(compile_pipeline(pipeline).predict(X_test), pipeline.predict(X_test), atol=1e-8)
+
+    def test_predict_file_by_chunks(self, real_data, tmp_path):
+        """Prédiction par morceaux de plusieurs CSV: mêmes prédictions que sur le DataFrame complet."""
+        from house_prices.models.predict_model import predict_file
+
+        data = real_data.assign(Id=np.arange(len(real_data)) + 1)
+        X = data.drop(columns=["SalePrice"])
+        pipeline = Pipeline([("preprocessing", create_full_pipeline()), ("model", Ridge())])
+        pipeline.fit(X.drop(columns=["Id"]), np.log1p(data["SalePrice"]))
+        data.iloc[:700].to_csv(tmp_path / "a.csv", index=False)
+        X.iloc[700:].to_csv(tmp_path / "b.csv", index=False)  # Sans la cible
+
+        rows = predict_file(pipeline, tmp_path, tmp_path / "out" / "predictions.csv", chunksize=300)
+        result = pd.read_csv(tmp_path / "out" / "predictions.csv")
+        assert rows == len(X) and list(result.columns) == ["Id", "SalePrice"]
+        np.testing.assert_array_equal(result["Id"], X["Id"])
+        np.testing.assert_allclose(result["SalePrice"], predict(pipeline, X.drop(columns=["Id"])), rtol=1e-9)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])